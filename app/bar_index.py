@@ -0,0 +1,141 @@
+import numpy as np
+
+BAR_FILLS = ('nan', 'ffill')
+
+_NAT = np.iinfo(np.int64).min
+
+
+class BarIndex:
+    """
+    Regularity of the bars of a series: expected cadence, gaps, duplicated and out-of-order
+    timestamps, built in one vectorized pass over the int64 timestamps.
+
+    Plugins query it instead of checking the data themselves (e.g. is_sorted to skip a sort),
+    and regularize() uses it to rebuild a gapless, duplicate-free series.
+    """
+
+    def __init__(self, timestamps, unit='ns'):
+        """
+        Args:
+            timestamps (np.ndarray): int64 timestamps, NaT as the minimum int64 (PriceSeries layout).
+            unit (str): Resolution of the timestamps.
+        """
+        timestamps = np.asarray(timestamps).view(np.int64)
+        self.unit = unit
+        self.rows = len(timestamps)
+        valid = timestamps != _NAT
+        positions = np.flatnonzero(valid)
+        self.invalid_rows = self.rows - len(positions)
+
+        steps = np.diff(timestamps[positions])
+        following = positions[1:]  # Row of the second timestamp of every step
+        forward = steps[steps > 0]
+        if len(forward):
+            values, counts = np.unique(forward, return_counts=True)
+            self.cadence = int(values[np.argmax(counts)])  # Most common step between bars
+        else:
+            self.cadence = None
+
+        self.duplicate_rows = following[steps == 0]
+        self.out_of_order_rows = following[steps < 0]
+        if self.cadence is None:
+            self.gap_rows = np.empty(0, dtype=np.intp)
+            self.missing_bars = np.empty(0, dtype=np.int64)
+        else:
+            is_gap = steps > self.cadence
+            self.gap_rows = following[is_gap]
+            self.missing_bars = -(-steps[is_gap] // self.cadence) - 1
+
+    @property
+    def is_sorted(self):
+        """True if the valid timestamps never decrease."""
+        return len(self.out_of_order_rows) == 0
+
+    @property
+    def is_unique(self):
+        """True if no timestamp is repeated by the next row."""
+        return len(self.duplicate_rows) == 0
+
+    @property
+    def is_regular(self):
+        """True if the bars are sorted, unique and one cadence apart (so positional shifts are time offsets)."""
+        return self.is_sorted and self.is_unique and len(self.gap_rows) == 0
+
+    def summary(self, max_rows=10):
+        """
+        Return the index as a JSON-serializable report.
+
+        Args:
+            max_rows (int): Maximum number of row positions listed per kind of irregularity.
+
+        Returns:
+            dict: Cadence in seconds, counts and the first row positions of each irregularity.
+        """
+        cadence = None
+        if self.cadence is not None:
+            cadence = float(np.timedelta64(self.cadence, self.unit) / np.timedelta64(1, 's'))
+        return {
+            'rows': self.rows,
+            'cadence_seconds': cadence,
+            'is_regular': self.is_regular,
+            'invalid_rows': self.invalid_rows,
+            'gaps': len(self.gap_rows),
+            'missing_bars': int(self.missing_bars.sum()),
+            'gap_rows': self.gap_rows[:max_rows].tolist(),
+            'duplicates': len(self.duplicate_rows),
+            'duplicate_rows': self.duplicate_rows[:max_rows].tolist(),
+            'out_of_order': len(self.out_of_order_rows),
+            'out_of_order_rows': self.out_of_order_rows[:max_rows].tolist()
+        }
+
+
+def regularize(series, fill='nan'):
+    """
+    Rebuild a series on its bar cadence: sorted, with one row per timestamp and every missing
+    bar inserted.
+
+    Duplicated timestamps keep their last row and rows without a timestamp are dropped.
+    Timestamps off the cadence grid are kept. Inserted bars are NaN, or repeat the previous bar
+    with fill='ffill'. A regular series is returned unchanged.
+
+    Args:
+        series (PriceSeries): Series to rebuild.
+        fill (str): 'nan' or 'ffill'.
+
+    Returns:
+        PriceSeries: The regularized series.
+    """
+    if fill not in BAR_FILLS:
+        raise ValueError(f"Unsupported bar fill '{fill}', expected one of {BAR_FILLS}.")
+    index = series.bar_index
+    if index.is_regular and index.invalid_rows == 0:
+        return series
+
+    timestamps = series.timestamps
+    rows = np.flatnonzero(timestamps != _NAT)
+    if not index.is_sorted:
+        rows = rows[np.argsort(timestamps[rows], kind='stable')]
+    stamps = timestamps[rows]
+    last = np.ones(len(stamps), dtype=bool)  # Last row of every distinct timestamp
+    last[:-1] = stamps[1:] != stamps[:-1]
+    rows, stamps = rows[last], stamps[last]
+
+    if index.cadence is not None and len(stamps):
+        grid = np.arange(stamps[0], stamps[-1] + 1, index.cadence, dtype=np.int64)
+        grid = np.union1d(grid, stamps)
+    else:
+        grid = stamps
+    present = np.searchsorted(grid, stamps)
+    if fill == 'ffill':
+        is_present = np.zeros(len(grid), dtype=bool)
+        is_present[present] = True
+        last_present = np.maximum.accumulate(np.where(is_present, np.arange(len(grid)), 0))
+        source = np.searchsorted(present, last_present)  # Position in rows of the last present bar
+        columns = {name: values[rows][source] for name, values in series.arrays.items()}
+    else:
+        columns = {}
+        for name, values in series.arrays.items():
+            column = np.full(len(grid), np.nan, dtype=values.dtype)
+            column[present] = values[rows]
+            columns[name] = column
+    return type(series)(grid, columns, unit=series.unit, tz=series.tz)
@@ -0,0 +1,160 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from app.data_processor import input_source, run_processing_pipeline
+from app.plugin_loader import load_plugin
+from app.remote import get_client
+
+logger = logging.getLogger(__name__)
+
+def _init_worker(plugin_names):
+    """Resolve every plugin used by the manifest once per worker process (load_plugin caches them)."""
+    for plugin_name in plugin_names:
+        try:
+            load_plugin('trading_signal.plugins', plugin_name)
+        except ImportError:
+            pass  # Reported as a failure by the jobs using this plugin
+
+
+def load_manifest(path):
+    """
+    Load a batch manifest.
+
+    The manifest is a JSON file with an optional "defaults" object applied to every job and a
+    "jobs" list. Each job may set any configuration key (input_file, plugin,
+    hourly_output_file, daily_output_file, ...) plus a "params" object with plugin parameters.
+    A plain JSON list is accepted as a list of jobs without defaults.
+
+    Args:
+        path (str): Path to the manifest file.
+
+    Returns:
+        tuple: (defaults dict, list of job dicts)
+    """
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        return {}, manifest
+    return manifest.get('defaults', {}), manifest.get('jobs', [])
+
+
+def build_job_configs(base_config, defaults, jobs):
+    """
+    Merge the base configuration, the manifest defaults and every job into one config per job.
+
+    Args:
+        base_config (dict): Configuration of the batch run (already merged with the CLI).
+        defaults (dict): Manifest defaults.
+        jobs (list): Manifest jobs.
+
+    Returns:
+        list: One configuration dict per job.
+    """
+    shared = {k: v for k, v in base_config.items() if not k.startswith('batch_')}
+    shared.update(defaults)
+    job_configs = []
+    for job in jobs:
+        job_config = shared.copy()
+        job_config.update({k: v for k, v in job.items() if k != 'params'})
+        job_config.update(job.get('params', {}))
+        job_configs.append(job_config)
+    return job_configs
+
+
+def run_job(job_id, job_config):
+    """
+    Run one batch job: load its input, process it with its plugin and write its outputs.
+
+    Args:
+        job_id (int): Position of the job in the manifest.
+        job_config (dict): Merged configuration of the job.
+
+    Returns:
+        dict: Job report with status, wall time and input/output row counts.
+    """
+    report = {
+        'job': job_id,
+        'input_file': job_config.get('input_file'),
+        'plugin': job_config.get('plugin'),
+        'hourly_output_file': job_config.get('hourly_output_file'),
+        'daily_output_file': job_config.get('daily_output_file')
+    }
+    start = time.perf_counter()
+    try:
+        plugin_class, _ = load_plugin('trading_signal.plugins', job_config['plugin'])
+        plugin = plugin_class()
+        plugin.set_params(**job_config)
+        source = input_source(job_config)
+        result = run_processing_pipeline(job_config, plugin, source)
+        report['status'] = 'ok'
+        report['rows_in'] = source.stats()['rows']
+        report['rows_out'] = result['rows_out']
+    except Exception as e:
+        report['status'] = 'failed'
+        report['error'] = f"{type(e).__name__}: {e}"
+    report['wall_seconds'] = round(time.perf_counter() - start, 6)
+    return report
+
+
+def run_batch(config):
+    """
+    Run every job of config['batch_manifest'] on a process pool and write a summary file.
+
+    Args:
+        config (dict): Batch configuration (batch_manifest, batch_workers, batch_summary_file and
+            the shared defaults of every job).
+
+    Returns:
+        dict: Batch summary with one report per job.
+    """
+    defaults, jobs = load_manifest(config['batch_manifest'])
+    job_configs = build_job_configs(config, defaults, jobs)
+    workers = int(config.get('batch_workers') or os.cpu_count() or 1)
+    workers = max(1, min(workers, len(job_configs) or 1))
+    plugin_names = sorted({job_config['plugin'] for job_config in job_configs})
+
+    logger.info("Running %d batch jobs on %d worker(s)...", len(job_configs), workers)
+
+    # Job reports are posted to the remote log in the background while the next jobs run
+    remote_client = None
+    if config.get('remote_log'):
+        remote_client = get_client(config, config.get('remote_username'), config.get('remote_password'))
+
+    def log_report(report):
+        if remote_client is not None:
+            job_config = {k: v for k, v in job_configs[report['job']].items()
+                          if k not in ('remote_username', 'remote_password')}
+            remote_client.submit(config['remote_log'], {
+                'json_config': json.dumps(job_config, default=str),
+                'json_result': json.dumps(report)
+            })
+        return report
+
+    start = time.perf_counter()
+    if workers == 1:
+        _init_worker(plugin_names)
+        reports = [log_report(run_job(i, job_config)) for i, job_config in enumerate(job_configs)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(plugin_names,)) as executor:
+            futures = [executor.submit(run_job, i, job_config) for i, job_config in enumerate(job_configs)]
+            for future in futures:
+                future.add_done_callback(lambda done: log_report(done.result()))
+            reports = [future.result() for future in futures]
+    if remote_client is not None:
+        remote_client.flush()
+
+    summary = {
+        'manifest': config['batch_manifest'],
+        'workers': workers,
+        'total_wall_seconds': round(time.perf_counter() - start, 6),
+        'jobs_ok': sum(1 for report in reports if report['status'] == 'ok'),
+        'jobs_failed': sum(1 for report in reports if report['status'] != 'ok'),
+        'jobs': reports
+    }
+    if config.get('batch_summary_file'):
+        with open(config['batch_summary_file'], 'w') as f:
+            json.dump(summary, f, indent=4)
+        logger.info("Batch summary written to %s", config['batch_summary_file'])
+    return summary
@@ -0,0 +1,333 @@
+import argparse
+import contextlib
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Repository root, put on PYTHONPATH of the measured interpreters like trading-signal.sh does
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start scenarios: each one runs in a fresh interpreter
+STARTUP_COMMANDS = {
+    'plugin_discovery': "from app.plugin_loader import _entry_points; "
+                        "_entry_points('trading_signal.plugins')['default_plugin']",
+    'legacy_pkg_resources_discovery': "import pkg_resources; "
+                                      "pkg_resources.get_entry_map('trading_signal', 'trading_signal.plugins')"
+                                      "['default_plugin']",
+    'plugin_load': "from app.plugin_loader import load_plugin; "
+                   "load_plugin('trading_signal.plugins', 'default_plugin')",
+    'cli_import': "import app.main"
+}
+
+# Plugins and output formats measured by the pipeline suite
+BENCHMARK_PLUGINS = ('default_plugin', 'ls')
+BENCHMARK_FORMATS = ('csv', 'npz', 'parquet', 'feather')
+
+
+def _run_python(code):
+    """Run code in a fresh interpreter and return its wall time in seconds, or None if it fails."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = ROOT_DIR + os.pathsep + env.get('PYTHONPATH', '')
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - start
+    return elapsed if result.returncode == 0 else None
+
+
+def measure_startup(repeats=5, commands=None):
+    """
+    Measure cold-start wall time of each startup scenario over several fresh interpreters.
+
+    The legacy pkg_resources scenario reproduces the plugin discovery used before the
+    importlib.metadata registry, so one run shows the before/after comparison; it is reported
+    as unavailable when pkg_resources is not installed.
+
+    Args:
+        repeats (int): Interpreter launches per scenario.
+        commands (dict, optional): Scenario name to Python code (defaults to STARTUP_COMMANDS).
+
+    Returns:
+        dict: Per scenario, the min/median/max wall time in seconds (None if it failed).
+    """
+    results = {}
+    for name, code in (commands or STARTUP_COMMANDS).items():
+        times = [_run_python(code) for _ in range(repeats)]
+        if any(t is None for t in times):
+            results[name] = None
+            continue
+        results[name] = {
+            'min_seconds': round(min(times), 4),
+            'median_seconds': round(statistics.median(times), 4),
+            'max_seconds': round(max(times), 4)
+        }
+    return results
+
+
+def synthetic_ohlc(rows, freq='1min', seed=0, start='2010-01-04'):
+    """
+    Generate a synthetic OHLC price series with the layout of the input files.
+
+    CLOSE follows a geometric random walk around 1.3 with a volatility scaled to the bar size;
+    OPEN is the previous CLOSE and HIGH/LOW extend beyond both by a random range.
+
+    Args:
+        rows (int): Number of bars.
+        freq (str): Bar size as a pandas frequency (e.g. '1min', '5min', '1h', '1D').
+        seed (int): Random seed.
+        start (str): Timestamp of the first bar.
+
+    Returns:
+        pd.DataFrame: DATE_TIME, OPEN, LOW, HIGH and CLOSE columns.
+    """
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(start, periods=rows, freq=freq)
+    bar_days = pd.Timedelta(freq) / pd.Timedelta('1D')
+    volatility = 0.006 * np.sqrt(bar_days)  # About 0.6% daily volatility
+    close = 1.3 * np.exp(np.cumsum(rng.normal(0, volatility, rows)))
+    open_ = np.concatenate([[1.3], close[:-1]])
+    spread = np.abs(rng.normal(0, volatility / 2, (2, rows))) * close
+    return pd.DataFrame({
+        'DATE_TIME': dates,
+        'OPEN': open_.round(5),
+        'LOW': (np.minimum(open_, close) - spread[0]).round(5),
+        'HIGH': (np.maximum(open_, close) + spread[1]).round(5),
+        'CLOSE': close.round(5)
+    })
+
+
+def _measure(function, repeats=1, trace_memory=True):
+    """
+    Run function and measure it.
+
+    The wall and CPU times are the best of `repeats` untraced runs; the peak of the memory
+    allocated by Python and NumPy comes from one extra run under tracemalloc, which slows the
+    code down and is therefore not timed.
+
+    Returns:
+        tuple: (result of the last run, dict of wall_seconds, cpu_seconds and peak_traced_mb)
+    """
+    walls = []
+    cpus = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(max(1, repeats)):
+            wall_start = time.perf_counter()
+            cpu_start = time.process_time()
+            result = function()
+            cpus.append(time.process_time() - cpu_start)
+            walls.append(time.perf_counter() - wall_start)
+        peak = None
+        if trace_memory:
+            tracemalloc.start()
+            try:
+                result = function()
+                peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+            finally:
+                tracemalloc.stop()
+    return result, {
+        'wall_seconds': round(min(walls), 6),
+        'cpu_seconds': round(min(cpus), 6),
+        'peak_traced_mb': None if peak is None else round(peak, 3)
+    }
+
+
+def _throughput(rows, metrics):
+    """Add the rows/s throughput to the metrics of a stage."""
+    metrics['rows'] = rows
+    metrics['rows_per_second'] = round(rows / metrics['wall_seconds'], 1) if metrics['wall_seconds'] else None
+    return metrics
+
+
+def _ticks_per_day(freq):
+    """Number of bars per day for a bar size."""
+    import pandas as pd
+    return max(1, int(pd.Timedelta('1D') / pd.Timedelta(freq)))
+
+
+def measure_pipeline(rows, freq='1h', plugins=BENCHMARK_PLUGINS, formats=BENCHMARK_FORMATS, repeats=1,
+                     trace_memory=True, work_dir=None):
+    """
+    Measure the load, process and write stages on a synthetic input.
+
+    The synthetic series is written once as the input CSV (not timed); then load_csv, the
+    process() method of each plugin and the pipeline output writer for each format are
+    measured separately.
+
+    Args:
+        rows (int): Number of synthetic bars.
+        freq (str): Bar size as a pandas frequency.
+        plugins (iterable of str): Plugin names to measure.
+        formats (iterable of str): Output formats to measure; Parquet and Feather are reported
+            as skipped when pyarrow is not installed.
+        repeats (int): Timed runs per stage (the best one is reported).
+        trace_memory (bool): Also measure the peak traced memory of each stage.
+        work_dir (str, optional): Directory for the input and output files (a temporary one
+            by default).
+
+    Returns:
+        dict: Per-stage wall time, CPU time, rows/s and peak traced memory.
+    """
+    from app.config import DEFAULT_VALUES
+    from app.data_handler import load_csv, write_csv
+    from app.data_processor import _write_outputs
+    from app.plugin_loader import load_plugin
+
+    with contextlib.ExitStack() as stack:
+        if work_dir is None:
+            work_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix='trading_signal_bench_'))
+        input_file = os.path.join(work_dir, 'input.csv')
+        write_csv(input_file, synthetic_ohlc(rows, freq), include_date=False)
+
+        results = {'rows': rows, 'freq': freq, 'input_mb': round(os.path.getsize(input_file) / (1024 * 1024), 3)}
+        data, metrics = _measure(lambda: load_csv(input_file), repeats, trace_memory)
+        results['load'] = _throughput(rows, metrics)
+
+        results['plugins'] = {}
+        for plugin_name in plugins:
+            plugin_class, _ = load_plugin('trading_signal.plugins', plugin_name)
+            plugin = plugin_class()
+            plugin.set_params(ticks_per_day=_ticks_per_day(freq))
+            plugin_results = {}
+            processed_data, metrics = _measure(lambda: plugin.process(data.copy()), repeats, trace_memory)
+            plugin_results['process'] = _throughput(rows, metrics)
+            plugin_results['rows_out'] = len(processed_data)
+
+            plugin_results['write'] = {}
+            for fmt in formats:
+                config = dict(DEFAULT_VALUES, quiet_mode=True, output_format=fmt,
+                              hourly_output_file=os.path.join(work_dir, f'{plugin_name}_hourly.{fmt}'),
+                              daily_output_file=os.path.join(work_dir, f'{plugin_name}_daily.{fmt}'))
+                try:
+                    _, metrics = _measure(lambda: _write_outputs(config, processed_data), repeats, trace_memory)
+                except ImportError as e:
+                    plugin_results['write'][fmt] = {'skipped': str(e)}
+                    continue
+                metrics['output_mb'] = round(sum(os.path.getsize(config[key]) for key in
+                                                 ('hourly_output_file', 'daily_output_file')) / (1024 * 1024), 3)
+                plugin_results['write'][fmt] = _throughput(len(processed_data), metrics)
+            results['plugins'][plugin_name] = plugin_results
+    return results
+
+
+def _environment():
+    """Versions and commit the results were measured with."""
+    import numpy as np
+    import pandas as pd
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT_DIR, capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def _wall_times(results, prefix=''):
+    """Flatten the wall times of a result tree into {'path/to/stage': seconds}."""
+    times = {}
+    for key, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        if 'wall_seconds' in value:
+            times[prefix + key] = value['wall_seconds']
+        elif 'median_seconds' in value:
+            times[prefix + key] = value['median_seconds']
+        else:
+            times.update(_wall_times(value, f"{prefix}{key}/"))
+    return times
+
+
+def compare_results(baseline, current, threshold=1.1):
+    """
+    Compare the stage wall times of two benchmark results.
+
+    Args:
+        baseline (dict): Earlier results (e.g. loaded from the JSON of another commit).
+        current (dict): New results.
+        threshold (float): Ratio current / baseline above which a stage is a regression.
+
+    Returns:
+        dict: Per stage present in both, the baseline and current seconds, their ratio and
+            whether it is a regression.
+    """
+    baseline_times = _wall_times(baseline)
+    current_times = _wall_times(current)
+    comparison = {}
+    for stage in sorted(baseline_times.keys() & current_times.keys()):
+        before, after = baseline_times[stage], current_times[stage]
+        ratio = after / before if before else None
+        comparison[stage] = {
+            'baseline_seconds': before,
+            'current_seconds': after,
+            'ratio': None if ratio is None else round(ratio, 3),
+            'regression': ratio is not None and ratio > threshold
+        }
+    return comparison
+
+
+def _csv_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Trading-signal performance benchmarks.')
+    parser.add_argument('--suites', type=_csv_list, default=['startup', 'pipeline'],
+                        help='Comma-separated suites to run: startup, pipeline')
+    parser.add_argument('--repeats', type=int, default=5, help='Interpreter launches per startup scenario')
+    parser.add_argument('--rows', type=_csv_list, default=['100000'],
+                        help='Comma-separated synthetic input sizes in rows, e.g. 10000,1000000')
+    parser.add_argument('--freq', type=_csv_list, default=['1h'],
+                        help="Comma-separated bar sizes as pandas frequencies, e.g. 1min,1h,1D")
+    parser.add_argument('--plugins', type=_csv_list, default=list(BENCHMARK_PLUGINS), help='Comma-separated plugins to measure')
+    parser.add_argument('--formats', type=_csv_list, default=list(BENCHMARK_FORMATS), help='Comma-separated output formats to measure')
+    parser.add_argument('--stage_repeats', type=int, default=1, help='Timed runs per pipeline stage (the best one is reported)')
+    parser.add_argument('--no_memory', action='store_true', help='Skip the traced peak-memory run of each stage')
+    parser.add_argument('--work_dir', help='Directory for the synthetic input and the outputs (temporary by default)')
+    parser.add_argument('--output', help='Path to save the benchmark results as JSON')
+    parser.add_argument('--compare', help='JSON results of an earlier run to compare the stage wall times with')
+    parser.add_argument('--threshold', type=float, default=1.1, help='Slowdown ratio reported as a regression by --compare')
+    args = parser.parse_args(argv)
+
+    results = {'environment': _environment()}
+    if 'startup' in args.suites:
+        results['startup'] = measure_startup(args.repeats)
+    if 'pipeline' in args.suites:
+        results['pipeline'] = {}
+        for freq in args.freq:
+            for rows in args.rows:
+                results['pipeline'][f"{int(rows)}x{freq}"] = measure_pipeline(
+                    int(rows), freq, args.plugins, args.formats, args.stage_repeats, not args.no_memory,
+                    args.work_dir)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            results['comparison'] = compare_results(json.load(f), results, args.threshold)
+
+    print(json.dumps(results, indent=4))
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=4)
+    if args.compare:
+        regressions = [stage for stage, entry in results['comparison'].items() if entry['regression']]
+        if regressions:
+            print(f"Regressions over {args.threshold}x: {', '.join(regressions)}", file=sys.stderr)
+    return results
+
+
+if __name__ == '__main__':
+    main()
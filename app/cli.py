@@ -10,6 +10,9 @@ def parse_args():
     parser.add_argument('--remote_log', help='URL for remote logging')
     parser.add_argument('--remote_username', help='Username for remote logging')
     parser.add_argument('--remote_password', help='Password for remote logging')
+    parser.add_argument('--remote_timeout', type=float, help='Timeout of each remote request in seconds')
+    parser.add_argument('--remote_retries', type=int, help='Retries of a failed remote request')
+    parser.add_argument('--remote_backoff', type=float, help='Delay before the first retry of a remote request in seconds')
     parser.add_argument('--plugin', help='Encoder plugin to use')
     parser.add_argument('--output_file', help='Path to save the output data')
     parser.add_argument('--headers', action='store_true', help='Indicate if the CSV file has headers')
@@ -18,6 +21,37 @@ def parse_args():
     # quiet mode
     parser.add_argument('--quiet_mode', action='store_true', help='Suppress all output except for errors')
     parser.add_argument('--only_low_CV', action='store_true', help='Suppress all output except for errors')
+    parser.add_argument('--chunk_size', type=int, help='Process the input in chunks of this many rows to bound memory usage')
+    parser.add_argument('--cache_dir', help='Directory used to cache parsed input files')
+    parser.add_argument('--cache_max_size', type=float, help='Maximum total size of the input cache in MB')
+    parser.add_argument('--date_format', help="strptime format of the DATE_TIME column, e.g. '%%Y-%%m-%%d %%H:%%M:%%S'")
+    parser.add_argument('--column_dtypes', help='Input column dtypes as a JSON object, or a single dtype for all numeric columns')
+    parser.add_argument('--required_columns', help='Comma-separated list of columns that must be present in the input')
+    parser.add_argument('--batch_manifest', help='JSON manifest of (input file, plugin, params, outputs) jobs to run in batch mode')
+    parser.add_argument('--batch_workers', type=int, help='Number of worker processes for batch mode')
+    parser.add_argument('--batch_summary_file', help='Path to save the batch summary with per-job timings and failures')
+    parser.add_argument('--sweep_grid', help='Plugin parameter grid as a JSON object (or JSON file) of lists to sweep over')
+    parser.add_argument('--sweep_workers', type=int, help='Number of worker processes for sweep mode')
+    parser.add_argument('--sweep_output_template', help='Output path template for sweep mode, e.g. ./sweep/{plugin}_{params}_{kind}.csv')
+    parser.add_argument('--sweep_summary_file', help='Path to save the sweep summary')
+    parser.add_argument('--incremental_state_file', help='State file for incremental mode: only rows appended since the last run are processed')
+    parser.add_argument('--precision', choices=['float64', 'float32', 'pips'], help='Numeric precision of the computation and outputs (pips stores prices as scaled int32)')
+    parser.add_argument('--pip_scale', type=int, help='Price units per int32 step in pips precision, e.g. 100000 for 5-decimal quotes')
+    parser.add_argument('--precision_check', action='store_true', help='Report the max deviation of the compact precision output from a float64 run')
+    parser.add_argument('--output_format', choices=['csv', 'parquet', 'feather', 'npz'], help='Format of the output files (default: selected by file extension)')
+    parser.add_argument('--output_compression', help="Compression codec of binary outputs, e.g. 'snappy', 'zstd', 'lz4' or 'none'")
+    parser.add_argument('--output_row_group_size', type=int, help='Number of rows per Parquet row group')
+    parser.add_argument('--parallel_writes', type=int, choices=[0, 1], help='Write the hourly and daily outputs concurrently (1, default) or one after the other (0)')
+    parser.add_argument('--trace_file', help='Path to save a Chrome trace JSON of the per-stage timings (chrome://tracing, Perfetto)')
+    parser.add_argument('--log_level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'], help='Logging level (default: WARNING in quiet mode, INFO otherwise)')
+    parser.add_argument('--log_format', choices=['text', 'json'], help='Log record format: text (default) or json, one object per line')
+    parser.add_argument('--log_file', help='Path of the log file (default: stdout)')
+    parser.add_argument('--plugins', help='Plugins to run over one input: comma-separated names, or a JSON list (or file) of {"plugin": ..., "params": {...}}')
+    parser.add_argument('--plugins_mode', choices=['fanout', 'chain'], help='Run the plugins independently (fanout) or each on the previous output (chain)')
+    parser.add_argument('--plugins_workers', type=int, help='Number of worker processes for the fanout mode')
+    parser.add_argument('--plugins_output_template', help='Output path template of each plugin, e.g. ./out/{plugin}_{kind}.csv')
+    parser.add_argument('--plugins_summary_file', help='Path to save the per-plugin summary')
+    parser.add_argument('--bar_fill', choices=['nan', 'ffill'], help='Sort and deduplicate the input bars and insert the missing ones, as NaN or repeating the previous bar')
 
     
     args, unknown = parser.parse_known_args()
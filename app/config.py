@@ -11,11 +11,45 @@ DEFAULT_VALUES = {
     'remote_log': None,  # URL for remote logging
     'remote_username': None,  # Username for remote logging/authentication
     'remote_password': None,  # Password for remote logging/authentication
+    'remote_timeout': 10.0,  # Connect and read timeout of each remote request in seconds
+    'remote_retries': 3,  # Retries of a remote request on connection errors, timeouts and 429/5xx responses
+    'remote_backoff': 0.5,  # Delay before the first retry in seconds, doubled for each following one
     'plugin': 'default_plugin',  # Default plugin to use for feature extraction
     'headers': True,  # Whether the CSV file has headers (True by default)
     'force_date': False,  # Force inclusion of date column in the output
     'debug_file': './debug_out.json',  # Path to save debug information
     'quiet_mode': False,  # Suppress all output except for errors
-    'only_low_CV': False  # Process only low CV columns (False by default)
+    'only_low_CV': False,  # Process only low CV columns (False by default)
+    'chunk_size': None,  # Rows per chunk for bounded-memory streaming (None processes the whole file in memory)
+    'cache_dir': None,  # Directory of the parsed-input cache (None disables caching)
+    'cache_max_size': 1024,  # Maximum total size of the parsed-input cache in MB
+    'date_format': None,  # strptime format of the DATE_TIME column (None infers it, day first)
+    'column_dtypes': None,  # Dtype per input column, or a single dtype for all numeric columns (None infers them)
+    'required_columns': ['CLOSE'],  # Columns that must be present in the input
+    'batch_manifest': None,  # JSON manifest of batch jobs (None runs a single job)
+    'batch_workers': None,  # Worker processes for batch mode (None uses the CPU count)
+    'batch_summary_file': './batch_summary.json',  # Per-job report written by batch mode
+    'sweep_grid': None,  # Plugin parameter grid (JSON object or file) for sweep mode (None disables it)
+    'sweep_workers': None,  # Worker processes for sweep mode (None uses the CPU count)
+    'sweep_output_template': './sweep_{plugin}_{params}_{kind}.csv',  # Output path template for sweep mode
+    'sweep_summary_file': './sweep_summary.json',  # Per-combination report written by sweep mode
+    'incremental_state_file': None,  # State file of incremental mode, which only processes appended rows (None disables it)
+    'precision': 'float64',  # Numeric precision: float64, float32 (computed and stored) or pips (float32, stored as int32)
+    'pip_scale': 100000,  # Price units per int32 step in pips precision (100000 for 5-decimal quotes)
+    'precision_check': False,  # Re-run in float64 and report the max deviation of the compact precision output
+    'output_format': None,  # Output format: csv, parquet, feather or npz (None selects it by file extension)
+    'output_compression': None,  # Codec of binary outputs, e.g. snappy, zstd, lz4 or none (None: snappy for Parquet, uncompressed Feather and NPZ)
+    'output_row_group_size': None,  # Rows per Parquet row group (None uses the writer default)
+    'parallel_writes': True,  # Write the hourly and daily outputs concurrently
+    'trace_file': None,  # Path of a Chrome trace JSON of the run's timing spans (None disables it)
+    'log_level': None,  # DEBUG, INFO, WARNING or ERROR (None uses WARNING in quiet mode, INFO otherwise)
+    'log_format': 'text',  # Log record format: text or json (one JSON object per line)
+    'log_file': None,  # File the log is written to (None writes it to stdout)
+    'plugins': None,  # Plugins to run over one input: comma-separated names or JSON list (None runs the single plugin)
+    'plugins_mode': 'fanout',  # fanout (each plugin processes the input) or chain (each processes the previous output)
+    'plugins_workers': None,  # Worker processes of the fanout mode (None uses the CPU count)
+    'plugins_output_template': './{plugin}_{kind}.csv',  # Output path template of each plugin ({plugin}, {index}, {kind})
+    'plugins_summary_file': './plugins_summary.json',  # Per-plugin report written by the multi-plugin mode
+    'bar_fill': None  # Regularize the input bars before processing: nan or ffill for the missing bars (None disables it)
 }
 
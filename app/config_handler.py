@@ -1,10 +1,15 @@
 # config_handler.py
 
 import json
-import sys
+import logging
+from collections.abc import Mapping
+from types import MappingProxyType
 import requests
 from app.config import DEFAULT_VALUES
-from app.plugin_loader import load_plugin
+from app.plugin_loader import plugin_defaults
+from app.remote import get_client
+
+logger = logging.getLogger(__name__)
 
 def load_config(file_path):
     with open(file_path, 'r') as f:
@@ -12,11 +17,19 @@ def load_config(file_path):
     return config
 
 def get_plugin_default_params(plugin_name):
-    plugin_class, _ = load_plugin('trading_signal.plugins', plugin_name)
-    plugin_instance = plugin_class()
-    return plugin_instance.plugin_params
+    return plugin_defaults(plugin_name)
 
 def compose_config(config):
+    if isinstance(config, ResolvedConfig):
+        return dict(config.to_save)
+    return _compose(config)
+
+def _json_config(config):
+    if isinstance(config, ResolvedConfig):
+        return config.json_config
+    return json.dumps(compose_config(config))
+
+def _compose(config):
     plugin_name = config.get('plugin', DEFAULT_VALUES.get('plugin'))
     
     plugin_default_params = get_plugin_default_params(plugin_name)
@@ -27,10 +40,50 @@ def compose_config(config):
             if k not in plugin_default_params or v != plugin_default_params[k]:
                 config_to_save[k] = v
     
-    # prints config_to_save
-    print(f"Actual config_to_save: {config_to_save}")
+    logger.debug("Actual config_to_save: %s", config_to_save)
     return config_to_save
 
+class ResolvedConfig(Mapping):
+    """
+    Read-only configuration of a run, with the part that differs from the defaults composed once.
+
+    Built with resolve_config() after the configuration is merged, then passed to every sink
+    (save_config, remote_save_config, remote_log) instead of the dict, so the composition and
+    its JSON serialization are not repeated per sink.
+    """
+
+    def __init__(self, config):
+        """
+        Args:
+            config (Mapping): Merged configuration (copied).
+        """
+        self._values = MappingProxyType(dict(config))
+        self.to_save = MappingProxyType(_compose(self._values))
+        self.json_config = json.dumps(dict(self.to_save))
+
+    def __getitem__(self, key):
+        return self._values[key]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+def resolve_config(config):
+    """
+    Return the configuration as a ResolvedConfig (unchanged if it already is one).
+
+    Args:
+        config (Mapping): Merged configuration.
+
+    Returns:
+        ResolvedConfig: The resolved configuration.
+    """
+    if isinstance(config, ResolvedConfig):
+        return config
+    return ResolvedConfig(config)
+
 def save_config(config, path='config_out.json'):
     config_to_save = compose_config(config)
     
@@ -40,49 +93,39 @@ def save_config(config, path='config_out.json'):
 
 def save_debug_info(debug_info, path='debug_out.json'):
     with open(path, 'w') as f:
-        json.dump(debug_info, f, indent=4)
+        json.dump(debug_info, f, indent=4, default=str)
 
 def remote_save_config(config, url, username, password):
-    config_to_save = compose_config(config)
+    json_config = _json_config(config)
     try:
-        response = requests.post(
-            url,
-            auth=(username, password),
-            data={'json_config': json.dumps(config_to_save)}
-        )
-        response.raise_for_status()
+        get_client(config, username, password).request('POST', url, data={'json_config': json_config})
         return True
     except requests.RequestException as e:
-        print(f"Failed to save remote configuration: {e}", file=sys.stderr)
+        logger.error("Failed to save remote configuration: %s", e)
         return False
     
-def remote_load_config(url, username=None, password=None):
+def remote_load_config(url, username=None, password=None, config=None):
     try:
-        if username and password:
-            response = requests.get(url, auth=(username, password))
-        else:
-            response = requests.get(url)
-        response.raise_for_status()
-        config = response.json()
-        return config
+        response = get_client(config, username, password).request('GET', url)
+        remote_config = response.json()
+        return remote_config
     except requests.RequestException as e:
-        print(f"Failed to load remote configuration: {e}", file=sys.stderr)
+        logger.error("Failed to load remote configuration: %s", e)
         return None
 
 def remote_log(config, debug_info, url, username, password):
-    config_to_save = compose_config(config)
-    try:
-        data = {
-            'json_config': json.dumps(config_to_save),
-            'json_result': json.dumps(debug_info)
-        }
-        response = requests.post(
-            url,
-            auth=(username, password),
-            data=data
-        )
-        response.raise_for_status()
-        return True
-    except requests.RequestException as e:
-        print(f"Failed to log remote information: {e}", file=sys.stderr)
-        return False
+    """
+    Queue the configuration and debug information for the remote log server.
+
+    The entry is posted in the background by the shared client (see app.remote), so the
+    pipeline does not wait for the server; use flush_clients() to wait for it.
+
+    Returns:
+        bool: True once the entry is queued.
+    """
+    data = {
+        'json_config': _json_config(config),
+        'json_result': json.dumps(debug_info)
+    }
+    get_client(config, username, password).submit(url, data)
+    return True
@@ -0,0 +1,216 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from app.price_series import PriceSeries
+
+logger = logging.getLogger(__name__)
+
+# Bump when the parsing done by load_csv changes, so stale cache entries are never reused
+CACHE_VERSION = 1
+META_FILE = 'meta.json'
+STAGING_SUFFIX = '.tmp'
+
+
+def file_fingerprint(file_path, extra=None, block_size=1 << 20):
+    """
+    Compute the cache key of an input file from its path, size, mtime and content hash.
+
+    Args:
+        file_path (str): Path to the input file.
+        extra (dict, optional): Additional JSON-serializable load options that affect the parsed result.
+        block_size (int): Read size used while hashing the file contents.
+
+    Returns:
+        str: Hexadecimal cache key.
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.blake2b(digest_size=20)
+    header = {
+        'version': CACHE_VERSION,
+        'path': os.path.abspath(file_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'extra': extra or {}
+    }
+    digest.update(json.dumps(header, sort_keys=True, default=str).encode('utf-8'))
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _entry_size(entry_dir):
+    return sum(entry.stat().st_size for entry in os.scandir(entry_dir) if entry.is_file())
+
+
+def load_cached_frame(cache_dir, key):
+    """
+    Load a cached DataFrame with every column memory-mapped from its .npy file.
+
+    Args:
+        cache_dir (str): Cache directory.
+        key (str): Cache key returned by file_fingerprint.
+
+    Returns:
+        pd.DataFrame or None: The cached frame, or None on a cache miss.
+    """
+    entry_dir = os.path.join(cache_dir, key)
+    meta_path = os.path.join(entry_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        columns = {}
+        timezones = meta.get('timezones') or [None] * len(meta['columns'])
+        for i, name in enumerate(meta['columns']):
+            values = np.load(os.path.join(entry_dir, f'col_{i}.npy'), mmap_mode='r')
+            if meta['dtypes'][i] == 'str':
+                values = values.astype(object)
+            elif timezones[i]:
+                values = pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(timezones[i])
+            columns[name] = values
+        data = pd.DataFrame(columns, copy=False)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("Ignoring unreadable cache entry %s: %s", entry_dir, e)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+    # Touch the entry so eviction removes the least recently used entries first
+    os.utime(meta_path)
+    return data
+
+
+def load_cached_series(cache_dir, key):
+    """
+    Open a cache entry as a PriceSeries with every array memory-mapped, without building a DataFrame.
+
+    Args:
+        cache_dir (str): Cache directory.
+        key (str): Cache key returned by file_fingerprint.
+
+    Returns:
+        PriceSeries or None: The cached series, or None on a cache miss or if the entry does not
+            hold a datetime DATE_TIME column.
+    """
+    entry_dir = os.path.join(cache_dir, key)
+    meta_path = os.path.join(entry_dir, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        series = PriceSeries.open(entry_dir)
+    except (TypeError, KeyError):
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable cache entry %s: %s", entry_dir, e)
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        return None
+    os.utime(meta_path)
+    return series
+
+
+def store_cached_frame(cache_dir, key, data, max_size=None):
+    """
+    Store a parsed DataFrame as one .npy file per column and evict old entries if needed.
+
+    Frames with columns that cannot be stored as plain NumPy arrays (e.g. object columns
+    containing missing values) are not cached. Time zone aware datetime columns are stored as
+    UTC datetime64 values with their zone in the meta file. The entry is written to a private staging
+    directory and renamed into place, so concurrent writers of one key never see a partial
+    entry; the first complete entry wins.
+
+    Args:
+        cache_dir (str): Cache directory.
+        key (str): Cache key returned by file_fingerprint.
+        data (pd.DataFrame): Parsed frame to store.
+        max_size (int, optional): Maximum total cache size in bytes.
+
+    Returns:
+        bool: True if the frame was stored.
+    """
+    arrays = []
+    dtypes = []
+    timezones = []
+    for col in data.columns:
+        series = data[col]
+        tz = getattr(series.dtype, 'tz', None)
+        timezones.append(str(tz) if tz is not None else None)
+        if tz is not None:
+            # Stored as UTC datetime64 so the column stays memory-mappable; the zone goes to the meta
+            arrays.append(series.dt.tz_convert(None).to_numpy())
+            dtypes.append(str(series.dtype))
+        elif series.dtype.kind in 'biufcmM':
+            arrays.append(series.to_numpy())
+            dtypes.append(str(series.dtype))
+        elif not series.isna().any():
+            arrays.append(series.to_numpy().astype(str))
+            dtypes.append('str')
+        else:
+            return False
+
+    entry_dir = os.path.join(cache_dir, key)
+    os.makedirs(cache_dir, exist_ok=True)
+    # Stage in a directory of our own, so concurrent writers of the same key never share it
+    tmp_dir = tempfile.mkdtemp(prefix=f'{key}.', suffix=STAGING_SUFFIX, dir=cache_dir)
+    try:
+        for i, values in enumerate(arrays):
+            np.save(os.path.join(tmp_dir, f'col_{i}.npy'), values)
+        with open(os.path.join(tmp_dir, META_FILE), 'w') as f:
+            meta = {'columns': [str(col) for col in data.columns], 'dtypes': dtypes, 'timezones': timezones,
+                    'rows': len(data)}
+            if 'DATE_TIME' in data.columns:
+                meta['tz'] = timezones[list(data.columns).index('DATE_TIME')]  # Read by PriceSeries.open
+            json.dump(meta, f)
+        try:
+            os.replace(tmp_dir, entry_dir)
+        except OSError:
+            if os.path.exists(os.path.join(entry_dir, META_FILE)):
+                # Another worker stored the same key first; its entry holds the same frame
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+            else:
+                # Leftover of a partially removed entry
+                shutil.rmtree(entry_dir, ignore_errors=True)
+                os.replace(tmp_dir, entry_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    if max_size is not None:
+        evict_cache(cache_dir, max_size, keep=key)
+    return True
+
+
+def evict_cache(cache_dir, max_size, keep=None):
+    """
+    Remove least recently used cache entries until the cache fits in max_size bytes.
+
+    Args:
+        cache_dir (str): Cache directory.
+        max_size (int): Maximum total cache size in bytes.
+        keep (str, optional): Key of an entry that must not be evicted.
+
+    Returns:
+        list: Keys of the evicted entries.
+    """
+    if not os.path.isdir(cache_dir):
+        return []
+    entries = []
+    for entry in os.scandir(cache_dir):
+        meta_path = os.path.join(entry.path, META_FILE)
+        if entry.is_dir() and not entry.name.endswith(STAGING_SUFFIX) and os.path.exists(meta_path):
+            entries.append((os.stat(meta_path).st_mtime, entry.name, _entry_size(entry.path)))
+    total = sum(size for _, _, size in entries)
+    evicted = []
+    for _, name, size in sorted(entries):
+        if total <= max_size:
+            break
+        if name == keep:
+            continue
+        shutil.rmtree(os.path.join(cache_dir, name), ignore_errors=True)
+        total -= size
+        evicted.append(name)
+    return evicted
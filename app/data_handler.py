@@ -1,68 +1,632 @@
+import logging
+import os
+import time
+import numpy as np
 import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+from app.data_cache import file_fingerprint, load_cached_frame, load_cached_series, store_cached_frame
+from app.instrumentation import peak_rss_mb
+from app.price_series import PriceSeries
+
+logger = logging.getLogger(__name__)
+
+# Text format of datetime DATE_TIME values in CSV outputs
+DATE_TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def _column_dtypes(columns, dtypes):
+    """
+    Map the non-date columns to their declared dtypes.
+
+    Args:
+        columns (list): Column names, the first one being the date column.
+        dtypes (dict or str, optional): Dtype per column name, or a single dtype for every non-date column.
+
+    Returns:
+        dict: Declared dtype per column name.
+    """
+    if not dtypes:
+        return {}
+    if isinstance(dtypes, str):
+        return {col: dtypes for col in columns[1:]}
+    return {col: dtypes[col] for col in columns[1:] if col in dtypes}
 
-import pandas as pd
 
-def load_csv(file_path):
+def _prepare_frame(data, previous_close=None, dtypes=None, required_columns=('CLOSE',)):
+    """
+    Normalize a freshly parsed CSV frame: name the first column 'DATE_TIME', convert the
+    remaining columns to numeric and fill NaN values in the 'CLOSE' column.
+
+    Args:
+        data (pd.DataFrame): Frame as returned by pd.read_csv.
+        previous_close (float, optional): Last CLOSE value of the preceding chunk, used to
+            forward fill NaN values at the start of a chunk when reading in chunks.
+        dtypes (dict or str, optional): Declared dtypes of the numeric columns.
+        required_columns (list): Columns that must be present in the input.
+
+    Returns:
+        pd.DataFrame: The normalized DataFrame.
+    """
+    dtype_map = _column_dtypes(data.columns, dtypes)
+
+    # Renombrar explícitamente la primera columna a 'DATE_TIME'
+    data.rename(columns={data.columns[0]: 'DATE_TIME'}, inplace=True)
+
+    # Convertir todas las columnas excepto 'DATE_TIME' a numéricas, coercionando errores a NaN
+    for col in data.columns:
+        if col == 'DATE_TIME':
+            continue
+        if col in dtype_map and data[col].dtype == dtype_map[col]:
+            continue  # Already parsed with the declared dtype
+        data[col] = pd.to_numeric(data[col], errors='coerce')
+        if col in dtype_map:
+            data[col] = data[col].astype(dtype_map[col])
+
+    # Validar la existencia de las columnas requeridas
+    for col in required_columns or ():
+        if col not in data.columns:
+            raise KeyError(f"La columna '{col}' falta en los datos de entrada!")
+
+    # Manejar valores NaN en la columna 'CLOSE'
+    if 'CLOSE' in data.columns and data['CLOSE'].isna().any():
+        logger.warning("La columna 'CLOSE' contiene valores NaN. Rellenando valores faltantes...")
+        close = data['CLOSE'].ffill()  # Relleno hacia adelante
+        if previous_close is not None:
+            close = close.fillna(previous_close)
+        data['CLOSE'] = close.bfill()  # Relleno hacia atrás si es necesario
+
+    return data
+
+
+# Width of the fixed-width numeric directives supported by _parse_fixed_dates
+_FIXED_DIRECTIVES = {'%Y': 4, '%m': 2, '%d': 2, '%H': 2, '%M': 2, '%S': 2}
+
+
+def _parse_fixed_dates(values, date_format):
+    """
+    Parse date strings with a fixed-width numeric format (e.g. '%Y-%m-%d %H:%M:%S') using
+    vectorized byte arithmetic instead of per-value strptime calls.
+
+    Args:
+        values (array-like): Date strings.
+        date_format (str): strptime format made only of %Y, %m, %d, %H, %M, %S and literal characters.
+
+    Returns:
+        np.ndarray or None: datetime64 array with the resolution pd.to_datetime would use, or
+            None if the format is not fixed-width numeric.
+
+    Raises:
+        ValueError: If a value does not match the format.
+    """
+    fields = {}
+    literals = []
+    width = 0
+    i = 0
+    while i < len(date_format):
+        token = date_format[i:i + 2]
+        if token in _FIXED_DIRECTIVES:
+            fields[token] = (width, _FIXED_DIRECTIVES[token])
+            width += _FIXED_DIRECTIVES[token]
+            i += 2
+        elif date_format[i] == '%':
+            return None
+        else:
+            literals.append((width, ord(date_format[i])))
+            width += 1
+            i += 1
+    if '%Y' not in fields or '%m' not in fields or '%d' not in fields:
+        return None
+
+    # One extra byte per value detects strings longer than the format
+    raw = np.asarray(values).astype(f'S{width + 1}')
+    chars = raw.view(np.uint8).reshape(len(raw), width + 1)
+    if (chars[:, width] != 0).any() or (chars[:, width - 1] == 0).any():
+        raise ValueError(f"Date values do not match the format '{date_format}'.")
+    for position, code in literals:
+        if (chars[:, position] != code).any():
+            raise ValueError(f"Date values do not match the format '{date_format}'.")
+
+    def field(token, default=0):
+        if token not in fields:
+            return np.full(len(raw), default, dtype=np.int64)
+        start, size = fields[token]
+        digits = chars[:, start:start + size].astype(np.int64) - ord('0')
+        if ((digits < 0) | (digits > 9)).any():
+            raise ValueError(f"Date values do not match the format '{date_format}'.")
+        return digits @ (10 ** np.arange(size - 1, -1, -1, dtype=np.int64))
+
+    year, month, day = field('%Y'), field('%m'), field('%d')
+    hour, minute, second = field('%H'), field('%M'), field('%S')
+    if ((month < 1) | (month > 12) | (day < 1) | (day > 31) | (hour > 23) | (minute > 59) | (second > 59)).any():
+        raise ValueError(f"Date values out of range for the format '{date_format}'.")
+
+    dates = (year - 1970).astype('datetime64[Y]') + (month - 1).astype('timedelta64[M]')
+    days = dates.astype('datetime64[D]') + (day - 1).astype('timedelta64[D]')
+    # Reject impossible days such as 31/04 that would roll over into the next month
+    if (days.astype('datetime64[M]') != dates).any():
+        raise ValueError(f"Date values out of range for the format '{date_format}'.")
+    seconds = hour * 3600 + minute * 60 + second
+    resolution = pd.to_datetime(values[:1], format=date_format).dtype
+    return (days.astype('datetime64[s]') + seconds.astype('timedelta64[s]')).astype(resolution)
+
+
+def _read_csv_with_schema(file_path, date_format=None, dtypes=None, required_columns=('CLOSE',)):
+    """
+    Read a CSV file in a single typed pass using a declared schema.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        date_format (str, optional): strptime format of the date column.
+        dtypes (dict or str, optional): Declared dtypes of the numeric columns.
+        required_columns (list): Columns that must be present in the input.
+
+    Returns:
+        pd.DataFrame: Frame with the date column parsed and the declared columns typed.
+
+    Raises:
+        KeyError: If a required column is missing from the header.
+        ValueError: If a value does not match the declared schema.
+    """
+    columns = list(pd.read_csv(file_path, sep=',', nrows=0).columns)
+    for col in required_columns or ():
+        if col not in ['DATE_TIME'] + columns[1:]:
+            raise KeyError(f"La columna '{col}' falta en los datos de entrada!")
+
+    dtype_map = _column_dtypes(columns, dtypes)
+    if date_format:
+        dtype_map[columns[0]] = str
+        data = pd.read_csv(file_path, sep=',', dtype=dtype_map)
+        dates = None
+        if not data[columns[0]].isna().any():
+            dates = _parse_fixed_dates(data[columns[0]].to_numpy(), date_format)
+        if dates is None:
+            dates = pd.to_datetime(data[columns[0]], format=date_format)
+        data[columns[0]] = dates
+    else:
+        data = pd.read_csv(file_path, sep=',', dtype=dtype_map, parse_dates=[0], dayfirst=True)
+    return data
+
+
+def _cache_key(file_path, date_format=None, dtypes=None, required_columns=('CLOSE',), **extra):
+    """Cache key of an input file parsed with the given schema (extra marks other representations)."""
+    schema = {'date_format': date_format, 'dtypes': dtypes, 'required_columns': list(required_columns or ())}
+    schema.update(extra)
+    return file_fingerprint(file_path, extra=schema)
+
+
+def load_csv(file_path, cache_dir=None, cache_max_size=None, date_format=None, dtypes=None,
+             required_columns=('CLOSE',)):
     """
     Load a CSV file assuming it has headers and a 'DATE_TIME' column at the beginning.
     The 'DATE_TIME' column remains as a regular column, and all other columns are converted to numeric.
 
+    When a schema (date_format and/or dtypes) is declared, the file is parsed in a single typed
+    pass with a fixed date format; if the data does not match the schema, loading falls back to
+    date inference and per-column numeric coercion.
+
+    When cache_dir is given, the parsed frame is stored there as memory-mappable .npy columns
+    keyed by the file fingerprint, and later loads of the unchanged file skip CSV parsing.
+
     Args:
         file_path (str): Path to the CSV file.
+        cache_dir (str, optional): Directory of the columnar cache (disabled when None).
+        cache_max_size (int, optional): Maximum total cache size in bytes.
+        date_format (str, optional): strptime format of the date column, e.g. '%Y-%m-%d %H:%M:%S'.
+        dtypes (dict or str, optional): Dtype per column name (e.g. {'CLOSE': 'float32'}), or a
+            single dtype for every non-date column.
+        required_columns (list): Columns that must be present in the input.
 
     Returns:
         pd.DataFrame: Loaded and processed DataFrame.
     """
+    cache_key = None
+    if cache_dir:
+        cache_key = _cache_key(file_path, date_format, dtypes, required_columns)
+        data = load_cached_frame(cache_dir, cache_key)
+        if data is not None:
+            logger.debug("Loaded %s from cache entry %s", file_path, cache_key)
+            return data
+
     try:
-        # Leer el CSV con encabezados y parsear la primera columna como fechas
-        data = pd.read_csv(file_path, sep=',', parse_dates=[0], dayfirst=True)
+        data = None
+        if date_format or dtypes:
+            try:
+                data = _read_csv_with_schema(file_path, date_format, dtypes, required_columns)
+            except (ValueError, TypeError) as e:
+                logger.warning("The input does not match the declared schema (%s). Falling back to type inference...", e)
 
-        # Renombrar explícitamente la primera columna a 'DATE_TIME'
-        data.rename(columns={data.columns[0]: 'DATE_TIME'}, inplace=True)
+        if data is None:
+            # Leer el CSV con encabezados y parsear la primera columna como fechas
+            data = pd.read_csv(file_path, sep=',', parse_dates=[0], dayfirst=True)
 
-        print(f"[DEBUG] Loaded data columns: {list(data.columns)}")  # Línea de depuración
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Loaded data columns: %s", ['DATE_TIME'] + list(data.columns[1:]))
 
-        # Convertir todas las columnas excepto 'DATE_TIME' a numéricas, coercionando errores a NaN
-        for col in data.columns:
-            if col != 'DATE_TIME':
-                data[col] = pd.to_numeric(data[col], errors='coerce')
+        data = _prepare_frame(data, dtypes=dtypes, required_columns=required_columns)
 
-        # Validar la existencia de la columna 'CLOSE'
-        if 'CLOSE' not in data.columns:
-            raise KeyError("La columna 'CLOSE' falta en los datos de entrada!")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("First 5 rows of the data:\n%s", data.head())
 
-        # Manejar valores NaN en la columna 'CLOSE'
-        if data['CLOSE'].isna().any():
-            print("[WARNING] La columna 'CLOSE' contiene valores NaN. Rellenando valores faltantes...")
-            data['CLOSE'].fillna(method='ffill', inplace=True)  # Relleno hacia adelante
-            data['CLOSE'].fillna(method='bfill', inplace=True)  # Relleno hacia atrás si es necesario
+    except Exception as e:
+        logger.error("Ocurrió un error al cargar el CSV: %s", e)
+        raise
 
-        print(f"[DEBUG] First 5 rows of the data:\n{data.head()}")  # Línea de depuración
+    if cache_key is not None:
+        try:
+            store_cached_frame(cache_dir, cache_key, data, cache_max_size)
+        except OSError as e:
+            logger.warning("Could not write the CSV cache: %s", e)
 
+    return data
+
+
+def _infer_date_format(column):
+    """
+    Infer a single strptime format that parses every value of a date column.
+
+    Year-first dates are read as year-month-day (ISO order), since a year-day-month guess
+    parses any sample whose days are all 12 or less and then swaps month and day. Other
+    dates try day-first formats before month-first ones, matching the dayfirst=True
+    convention used by load_csv.
+
+    Args:
+        column (pd.Series): Column of date strings.
+
+    Returns:
+        str or None: The first candidate format that parses the whole column, or None.
+    """
+    sample = column.dropna()
+    if sample.empty:
+        return None
+    first = str(sample.iloc[0])
+    month_first = guess_datetime_format(first, dayfirst=False)
+    candidates = []
+    for dayfirst in ((False, True) if month_first and month_first.startswith('%Y') else (True, False)):
+        candidate = guess_datetime_format(first, dayfirst=dayfirst)
+        if candidate and candidate not in candidates:
+            candidates.append(candidate)
+    for candidate in candidates:
+        try:
+            pd.to_datetime(sample, format=candidate)
+            return candidate
+        except (ValueError, TypeError):
+            continue
+    return None
+
+
+def input_date_format(file_path, date_format=None):
+    """
+    Resolve the date format of a CSV input from its whole date column.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        date_format (str, optional): Declared strptime format, returned as is.
+
+    Returns:
+        str: The declared format, or the one inferred by _infer_date_format.
+
+    Raises:
+        ValueError: If no single format parses every date of the file.
+    """
+    if date_format:
+        return date_format
+    dates = pd.read_csv(file_path, sep=',', usecols=[0], dtype=str).iloc[:, 0]
+    date_format = _infer_date_format(dates)
+    if date_format is None:
+        raise ValueError(f"Could not infer the date format of {file_path}.")
+    return date_format
+
+
+def load_csv_chunks(file_path, chunk_size, date_format=None, dtypes=None, required_columns=('CLOSE',)):
+    """
+    Load a CSV file in fixed-size chunks, applying the same parsing and NaN handling as load_csv.
+
+    Unless date_format is declared, the date format is inferred once from the first chunk and
+    then used for every chunk, so all chunks get the same DATE_TIME dtype regardless of how
+    ambiguous their values are.
+
+    Args:
+        file_path (str or file-like): Path to the CSV file, or a text buffer with its contents.
+        chunk_size (int): Number of rows per chunk.
+        date_format (str, optional): strptime format of the date column.
+        dtypes (dict or str, optional): Declared dtypes of the numeric columns.
+        required_columns (list): Columns that must be present in the input.
+
+    Yields:
+        pd.DataFrame: Loaded and processed chunk, with a RangeIndex starting at 0.
+    """
+    previous_close = None
+    try:
+        reader = pd.read_csv(file_path, sep=',', chunksize=chunk_size)
+        for chunk in reader:
+            chunk = chunk.reset_index(drop=True)
+            date_column = chunk.columns[0]
+            if date_format is None:
+                date_format = _infer_date_format(chunk[date_column])
+                if date_format is None:
+                    raise ValueError(f"Could not infer the date format of column '{date_column}'.")
+            chunk[date_column] = pd.to_datetime(chunk[date_column], format=date_format)
+            chunk = _prepare_frame(chunk, previous_close, dtypes, required_columns)
+            if len(chunk) and not pd.isna(chunk['CLOSE'].iloc[-1]):
+                previous_close = chunk['CLOSE'].iloc[-1]
+            yield chunk
     except Exception as e:
-        print(f"[ERROR] Ocurrió un error al cargar el CSV: {e}")
+        logger.error("Ocurrió un error al cargar el CSV por bloques: %s", e)
         raise
 
-    return data
 
 
 
+def to_price_series(data, date_format=None):
+    """
+    Convert a loaded DataFrame to a PriceSeries, parsing a text DATE_TIME column if needed.
+
+    Args:
+        data (pd.DataFrame): Frame as returned by load_csv.
+        date_format (str, optional): strptime format of a text DATE_TIME column (inferred when None).
+
+    Returns:
+        PriceSeries: Series sharing the float columns of data.
+
+    Raises:
+        ValueError: If a DATE_TIME value does not match the date format.
+    """
+    date_time = data['DATE_TIME']
+    if not pd.api.types.is_datetime64_any_dtype(date_time.dtype):
+        date_format = date_format or _infer_date_format(date_time)
+        if date_format is None:
+            raise ValueError("Could not infer the format of the DATE_TIME column.")
+        try:
+            parsed = pd.to_datetime(date_time, format=date_format)
+        except (ValueError, TypeError):
+            invalid = pd.to_datetime(date_time, format=date_format, errors='coerce').isna() & date_time.notna()
+            raise ValueError(f"{int(invalid.sum())} DATE_TIME value(s) do not match the format '{date_format}', "
+                             f"e.g. '{date_time[invalid].iloc[0]}'.") from None
+        missing = int(parsed.isna().sum())
+        if missing:
+            logger.warning("%d row(s) have no DATE_TIME; plugins skip them.", missing)
+        data = data.assign(DATE_TIME=parsed)
+    return PriceSeries.from_frame(data)
+
+
+class DataSource:
+    """
+    Lazily loaded input file, parsed at most once and shared by every consumer.
+
+    The first call to load() parses the file with load_csv; later calls return the same
+    DataFrame. load_series() returns the same data as a PriceSeries, built once and shared
+    by every plugin. Consumers that stream the input (chunked mode) never call load(), so
+    the whole file is not read into memory for them.
+    """
+
+    def __init__(self, file_path, **load_kwargs):
+        """
+        Args:
+            file_path (str): Path to the CSV file.
+            **load_kwargs: Keyword arguments passed to load_csv (cache and schema options).
+        """
+        self.file_path = file_path
+        self.load_kwargs = load_kwargs
+        self.data = None
+        self.series = None
+        self.load_count = 0
+        self.load_seconds = 0.0
+
+    @classmethod
+    def from_frame(cls, data, file_path=None):
+        """Wrap an already loaded DataFrame (or PriceSeries) as a data source."""
+        source = cls(file_path)
+        if isinstance(data, PriceSeries):
+            source.series = data
+        else:
+            source.data = data
+        return source
+
+    def load(self):
+        """
+        Return the loaded DataFrame, parsing the file on the first call only.
+
+        Returns:
+            pd.DataFrame: Loaded and processed DataFrame.
+        """
+        if self.data is None:
+            if self.series is not None:
+                # Already loaded as a series (e.g. memory-mapped from the cache): view it instead of parsing again
+                self.data = self.series.to_frame()
+                return self.data
+            start = time.perf_counter()
+            self.data = load_csv(self.file_path, **self.load_kwargs)
+            self.load_seconds += time.perf_counter() - start
+            self.load_count += 1
+        return self.data
+
+    def load_series(self):
+        """
+        Return the input as a PriceSeries, building it on the first call only.
+
+        With a cache directory, the series is kept in the cache with a datetime DATE_TIME column,
+        and later runs memory-map its arrays without parsing the CSV or building a DataFrame.
+        The bar index of the series (cadence, gaps, duplicates) is built as part of the load.
+
+        Returns:
+            PriceSeries: The loaded series.
+        """
+        if self.series is None:
+            cache_dir = self.load_kwargs.get('cache_dir')
+            schema = {k: v for k, v in self.load_kwargs.items() if k in ('date_format', 'dtypes', 'required_columns')}
+            cache_key = None
+            if cache_dir and self.data is None:
+                start = time.perf_counter()
+                cache_key = _cache_key(self.file_path, series=True, **schema)
+                self.series = load_cached_series(cache_dir, cache_key)
+                if self.series is not None:
+                    self.load_seconds += time.perf_counter() - start
+                    self.load_count += 1
+            if self.series is None:
+                self.series = to_price_series(self.load(), schema.get('date_format'))
+                if cache_key is not None:
+                    try:
+                        store_cached_frame(cache_dir, cache_key, self.series.to_frame(),
+                                           self.load_kwargs.get('cache_max_size'))
+                    except OSError as e:
+                        logger.warning("Could not write the CSV cache: %s", e)
+            bars = self.series.bar_index
+            if not bars.is_regular:
+                logger.info("Irregular bars in %s: %d gap(s) (%d missing bars), %d duplicate(s), %d out of order",
+                            self.file_path, len(bars.gap_rows), bars.missing_bars.sum(), len(bars.duplicate_rows),
+                            len(bars.out_of_order_rows), extra={'bars': bars.summary()})
+        return self.series
+
+    def stats(self):
+        """
+        Return the load report of this source.
+
+        Returns:
+            dict: Number of CSV parses, parse time, loaded rows, process peak RSS and, once the
+                series is loaded, the bar index summary.
+        """
+        report = {
+            'input_file': self.file_path,
+            'load_count': self.load_count,
+            'load_seconds': round(self.load_seconds, 6),
+            'rows': len(self.data) if self.data is not None else len(self.series) if self.series is not None else None,
+            'peak_rss_mb': peak_rss_mb()
+        }
+        if self.series is not None:
+            report['bars'] = self.series.bar_index.summary()
+        return report
 
-def write_csv(file_path, data, include_date=True, headers=True):
+
+def write_csv(file_path, data, include_date=True, headers=True, mode='w', columns=None):
     """
     Write a DataFrame to a CSV file, optionally including the date column and headers.
+
+    A naive datetime DATE_TIME column is always written as DATE_TIME_FORMAT, so rows at
+    midnight keep their time and every write of a series (full, chunked or incremental)
+    formats it the same way.
     
     Parameters:
     - file_path: str: Path to the output CSV file
     - data: pd.DataFrame: DataFrame to save
     - include_date: bool: Whether to include the 'date' column in the output
     - headers: bool: Whether to include the column headers in the output
+    - mode: str: File mode, 'w' to overwrite or 'a' to append to an existing file
+    - columns: list: Columns to write (all by default), written straight from data without a projected copy
     """
+    # Time zone aware values keep the default format, which includes their offset
+    date_format = None
+    if 'DATE_TIME' in data.columns and pd.api.types.is_datetime64_dtype(data['DATE_TIME'].dtype):
+        date_format = DATE_TIME_FORMAT
     try:
-        if include_date and 'date' in data.columns:
-            data.to_csv(file_path, index=True, header=headers)
+        if include_date and 'date' in (data.columns if columns is None else columns):
+            data.to_csv(file_path, index=True, header=headers, mode=mode, columns=columns, date_format=date_format)
         else:
-            data.to_csv(file_path, index=False, header=headers)
+            data.to_csv(file_path, index=False, header=headers, mode=mode, columns=columns, date_format=date_format)
     except Exception as e:
-        print(f"An error occurred while writing the CSV: {e}")
+        logger.error("An error occurred while writing the CSV: %s", e)
         raise
+
+
+# Output format of each known file extension; other extensions are written as CSV
+OUTPUT_FORMATS = {
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.npz': 'npz'
+}
+
+
+def output_format(file_path, fmt=None):
+    """
+    Return the output format of a file: fmt when given, otherwise the one of its extension.
+
+    Args:
+        file_path (str): Output path.
+        fmt (str, optional): Explicit format ('csv', 'parquet', 'feather' or 'npz').
+
+    Returns:
+        str: The output format.
+    """
+    if fmt:
+        if fmt not in set(OUTPUT_FORMATS.values()):
+            raise ValueError(f"Unsupported output format '{fmt}', expected one of {sorted(set(OUTPUT_FORMATS.values()))}.")
+        return fmt
+    return OUTPUT_FORMATS.get(os.path.splitext(file_path)[1].lower(), 'csv')
+
+
+def _require_pyarrow(fmt):
+    """Raise ImportError if pyarrow, needed by the Parquet and Feather writers, is not installed."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise ImportError(f"Writing {fmt} output requires pyarrow (pip install pyarrow).") from e
+
+
+def _npz_array(values):
+    """Column values as a NumPy array that np.load can read without pickle."""
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        if getattr(values.dt, 'tz', None) is not None:
+            values = values.dt.tz_convert('UTC').dt.tz_localize(None)
+        return values.to_numpy(dtype='datetime64[ns]')
+    if pd.api.types.is_string_dtype(values.dtype) or values.dtype == object:
+        return values.to_numpy(dtype=str)
+    if isinstance(values.dtype, pd.api.extensions.ExtensionDtype):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return values.to_numpy()
+
+
+def write_output(file_path, data, fmt=None, include_date=True, headers=True, mode='w', compression=None,
+                 row_group_size=None, columns=None):
+    """
+    Write a DataFrame in the format selected by fmt or by the file extension.
+
+    CSV output goes through write_csv. Parquet and Feather (Arrow IPC) are written with
+    pyarrow, which is an optional dependency. Feather files are uncompressed unless a codec is
+    given, so readers can memory-map them. NPZ stores one NumPy array per column (dates as
+    datetime64[ns]). Binary formats always store the column names and can not be appended to.
+
+    Args:
+        file_path (str): Output path.
+        data (pd.DataFrame): DataFrame to save.
+        fmt (str, optional): Output format, overriding the file extension.
+        include_date (bool): Whether to include the index when the frame has a 'date' column.
+        headers (bool): Whether to include the column headers (CSV only).
+        mode (str): 'w' to overwrite or 'a' to append (CSV only).
+        compression (str, optional): Codec of the binary formats (e.g. 'snappy', 'zstd' or 'lz4';
+            'none' disables it; None means snappy for Parquet and no compression for Feather and
+            NPZ; any value but 'none' compresses NPZ).
+        row_group_size (int, optional): Rows per Parquet row group.
+        columns (list, optional): Columns to write (all by default).
+    """
+    fmt = output_format(file_path, fmt)
+    if fmt == 'csv':
+        return write_csv(file_path, data, include_date=include_date, headers=headers, mode=mode, columns=columns)
+    if mode != 'w':
+        raise ValueError(f"Appending is only supported for CSV outputs, not {fmt} ({file_path}).")
+    if columns is not None:
+        data = data[columns]
+
+    keep_index = bool(include_date and 'date' in data.columns)
+    uncompressed = compression is not None and str(compression).lower() in ('none', 'uncompressed')
+    if fmt == 'parquet':
+        _require_pyarrow(fmt)
+        options = {'compression': None if uncompressed else (compression or 'snappy')}
+        if row_group_size:
+            options['row_group_size'] = int(row_group_size)
+        data.to_parquet(file_path, engine='pyarrow', index=keep_index, **options)
+    elif fmt == 'feather':
+        _require_pyarrow(fmt)
+        # Feather requires a default index
+        frame = data.reset_index(drop=not keep_index)
+        # Compression is opt-in: pyarrow would otherwise pick lz4 and readers could not memory-map the file
+        frame.to_feather(file_path, compression='uncompressed' if uncompressed or not compression else compression)
+    else:
+        frame = data.reset_index() if keep_index else data
+        arrays = {str(col): _npz_array(frame[col]) for col in frame.columns}
+        with open(file_path, 'wb') as f:
+            if compression and not uncompressed:
+                np.savez_compressed(f, **arrays)
+            else:
+                np.savez(f, **arrays)
@@ -0,0 +1,109 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def horizon_matrix(values, offsets):
+    """
+    Build a 2-D matrix of future values for several lookahead offsets in one pass.
+
+    Column j of the result holds ``values`` shifted backwards by ``offsets[j]``
+    (equivalent to ``Series.shift(-offsets[j])``), restricted to the rows where every
+    offset is resolvable, i.e. the first ``len(values) - max(offsets)`` rows.
+
+    Args:
+        values (array-like): 1-D contiguous series (e.g. the CLOSE column).
+        offsets (list of int): Positive lookahead offsets, in output column order.
+
+    Returns:
+        np.ndarray: Array of shape (len(values) - max(offsets), len(offsets)).
+    """
+    values = np.ascontiguousarray(values)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if values.ndim != 1:
+        raise ValueError("horizon_matrix expects a 1-D array of values.")
+    if offsets.size == 0:
+        return np.empty((len(values), 0), dtype=values.dtype)
+    if (offsets < 0).any():
+        raise ValueError("Horizon offsets must be non-negative.")
+
+    max_offset = int(offsets.max())
+    if len(values) <= max_offset:
+        return np.empty((0, offsets.size), dtype=values.dtype)
+
+    # Each window row i is values[i:i + max_offset + 1]; picking the offset columns
+    # gathers every horizon for every row in a single strided take.
+    windows = sliding_window_view(values, max_offset + 1)
+    return np.ascontiguousarray(windows[:, offsets])
+
+
+def shifted_matrix(values, offsets):
+    """
+    Full-length variant of horizon_matrix: every row is kept and offsets past the end of the
+    series are filled with NaN, like Series.shift(-offset).
+
+    Args:
+        values (array-like): 1-D series.
+        offsets (list of int): Non-negative lookahead offsets, in output column order.
+
+    Returns:
+        np.ndarray: Array of shape (len(values), len(offsets)) with a floating dtype.
+    """
+    values = np.asarray(values)
+    dtype = np.result_type(values.dtype, np.float32)
+    max_offset = max(offsets, default=0)
+    padded = np.concatenate([values.astype(dtype, copy=False), np.full(max_offset, np.nan, dtype=dtype)])
+    return horizon_matrix(padded, offsets)
+
+
+class HorizonCache:
+    """
+    Shifted copies of one series, computed once and shared by several horizon matrices.
+
+    Used when the same series is processed with many horizon configurations (e.g. a
+    parameter sweep): every distinct offset is computed a single time, and each
+    configuration gathers its columns from the cache instead of shifting the series again.
+    """
+
+    def __init__(self, values, column=None):
+        """
+        Args:
+            values (array-like): 1-D series the offsets are applied to.
+            column (str, optional): Name of the source column, used to check cache reuse.
+        """
+        self.values = np.ascontiguousarray(values)
+        self.column = column
+        self.columns = {}
+
+    def matches(self, column, length):
+        """Return True if the cache was built for this column and series length."""
+        return self.column == column and len(self.values) == length
+
+    def prefetch(self, offsets):
+        """
+        Compute the full-length shifted columns of every offset not cached yet, in one pass.
+
+        Args:
+            offsets (iterable of int): Offsets to compute.
+        """
+        missing = sorted({int(offset) for offset in offsets} - set(self.columns))
+        if not missing:
+            return
+        block = shifted_matrix(self.values, missing)
+        for j, offset in enumerate(missing):
+            self.columns[offset] = block[:, j]
+
+    def matrix(self, offsets):
+        """
+        Same result as horizon_matrix(values, offsets), gathered from the cached columns.
+
+        Args:
+            offsets (list of int): Positive lookahead offsets, in output column order.
+
+        Returns:
+            np.ndarray: Array of shape (len(values) - max(offsets), len(offsets)).
+        """
+        self.prefetch(offsets)
+        if not offsets:
+            return np.empty((len(self.values), 0), dtype=self.values.dtype)
+        valid_rows = max(len(self.values) - max(offsets), 0)
+        return np.column_stack([self.columns[int(offset)][:valid_rows] for offset in offsets])
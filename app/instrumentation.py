@@ -0,0 +1,190 @@
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+
+
+def peak_rss_mb():
+    """
+    Return the peak resident set size of the current process in MB.
+
+    Returns:
+        float or None: Peak RSS, or None on platforms without the resource module.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class Span:
+    """One timed region: wall and CPU time, peak RSS at its end, row count and attributes."""
+
+    def __init__(self, name, parent=None, rows=None, **attributes):
+        self.name = name
+        self.parent = parent
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.rows = rows
+        self.attributes = attributes
+        self.thread_id = threading.get_ident()
+        self.start = None
+        self.wall_seconds = None
+        self.cpu_seconds = None
+        self.peak_rss_mb = None
+
+    def set(self, **attributes):
+        """Attach attributes (e.g. rows_out) to the span."""
+        self.attributes.update(attributes)
+
+    def to_dict(self, origin):
+        """Return the span as a JSON-serializable dict, its start relative to origin."""
+        report = {
+            'name': self.name,
+            'parent': None if self.parent is None else self.parent.name,
+            'depth': self.depth,
+            'start_seconds': round(self.start - origin, 6),
+            'wall_seconds': None if self.wall_seconds is None else round(self.wall_seconds, 6),
+            'cpu_seconds': None if self.cpu_seconds is None else round(self.cpu_seconds, 6),
+            'peak_rss_mb': None if self.peak_rss_mb is None else round(self.peak_rss_mb, 3)
+        }
+        if self.rows is not None:
+            report['rows'] = int(self.rows)
+        report.update(self.attributes)
+        return report
+
+
+class _NullSpan:
+    """Span returned when tracing is off: accepts rows and attributes and records nothing."""
+    rows = None
+
+    def set(self, **attributes):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """
+    Collects nested spans of one run (one stack of open spans per thread).
+
+    CPU time is the thread's CPU time, so spans running on worker threads are measured on
+    their own; work done in child processes is not included.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def span(self, name, rows=None, **attributes):
+        """
+        Time the enclosed block as a span nested in the thread's current span.
+
+        Args:
+            name (str): Span name.
+            rows (int, optional): Rows handled by the block (may also be set on the yielded span).
+            **attributes: Extra values saved with the span.
+
+        Yields:
+            Span: The open span.
+        """
+        stack = self._local.__dict__.setdefault('stack', [])
+        current = Span(name, stack[-1] if stack else None, rows, **attributes)
+        with self._lock:
+            self.spans.append(current)
+        stack.append(current)
+        current.start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield current
+        finally:
+            current.cpu_seconds = time.thread_time() - cpu_start
+            current.wall_seconds = time.perf_counter() - current.start
+            current.peak_rss_mb = peak_rss_mb()
+            stack.pop()
+
+    def report(self):
+        """Return every span as a dict, in start order."""
+        with self._lock:
+            spans = list(self.spans)
+        return [span.to_dict(self.origin) for span in spans]
+
+    def chrome_trace(self):
+        """
+        Return the spans in the Chrome trace event format (chrome://tracing, Perfetto or
+        speedscope), as complete events with the span values in their args.
+        """
+        pid = os.getpid()
+        events = []
+        for report, span in zip(self.report(), self.spans):
+            args = {k: v for k, v in report.items() if k not in ('name', 'start_seconds', 'wall_seconds')}
+            events.append({
+                'name': span.name,
+                'cat': 'trading_signal',
+                'ph': 'X',
+                'ts': round(report['start_seconds'] * 1e6, 3),
+                'dur': round((report['wall_seconds'] or 0.0) * 1e6, 3),
+                'pid': pid,
+                'tid': span.thread_id,
+                'args': args
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, file_path):
+        """Save chrome_trace() as JSON to file_path."""
+        with open(file_path, 'w') as f:
+            json.dump(self.chrome_trace(), f, default=str)
+
+
+# Tracer spans are recorded to; None disables them (span() is then a no-op)
+_ACTIVE_TRACER = None
+
+
+def start_tracing():
+    """Start recording spans in a new tracer and return it."""
+    global _ACTIVE_TRACER
+    _ACTIVE_TRACER = Tracer()
+    return _ACTIVE_TRACER
+
+
+def stop_tracing():
+    """Stop recording spans and return the tracer that recorded them (or None)."""
+    global _ACTIVE_TRACER
+    tracer, _ACTIVE_TRACER = _ACTIVE_TRACER, None
+    return tracer
+
+
+def span(name, rows=None, **attributes):
+    """
+    Context manager timing a block in the active tracer; a no-op when tracing is off.
+
+    Example:
+        with span('load_input') as s:
+            data = source.load()
+            s.rows = len(data)
+    """
+    if _ACTIVE_TRACER is None:
+        return contextlib.nullcontext(_NULL_SPAN)
+    return _ACTIVE_TRACER.span(name, rows, **attributes)
+
+
+def traced(name=None):
+    """Decorator running the function inside a span (named after the function by default)."""
+    def decorator(function):
+        span_name = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
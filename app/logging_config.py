@@ -0,0 +1,71 @@
+import json
+import logging
+import sys
+
+# Logger of the application; every module logs to a child of it (logging.getLogger(__name__))
+ROOT_LOGGER = 'app'
+
+LOG_LEVELS = ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+LOG_FORMATS = ('text', 'json')
+
+# Attributes of every LogRecord; anything else was passed with extra= and is a structured field
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Format each record as one JSON object per line, including the fields passed with extra=."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def log_level(config):
+    """
+    Return the logging level of a configuration: log_level when set, otherwise WARNING in
+    quiet mode and INFO in normal mode.
+    """
+    level = config.get('log_level')
+    if not level:
+        return logging.WARNING if config.get('quiet_mode') else logging.INFO
+    level = str(level).upper()
+    if level not in LOG_LEVELS:
+        raise ValueError(f"Unsupported log level '{level}', expected one of {LOG_LEVELS}.")
+    return getattr(logging, level)
+
+
+def configure_logging(config):
+    """
+    Set up the application logger from the configuration (log_level, quiet_mode, log_format,
+    log_file). Calling it again replaces the previous setup.
+
+    Args:
+        config (dict): Configuration, possibly partial (e.g. the parsed CLI arguments).
+
+    Returns:
+        logging.Logger: The application logger.
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(log_level(config))
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+
+    log_format = config.get('log_format') or 'text'
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unsupported log format '{log_format}', expected one of {LOG_FORMATS}.")
+    handler = logging.FileHandler(config['log_file']) if config.get('log_file') else logging.StreamHandler(sys.stdout)
+    if log_format == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    logger.addHandler(handler)
+    return logger
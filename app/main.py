@@ -1,67 +1,143 @@
 import sys
 ##print(sys.path)  # Print the current Python path for debugging
 import json
-from app.config_handler import load_config, save_config, remote_load_config, remote_save_config, remote_log
+import logging
+from app.config_handler import load_config, save_config, save_debug_info, remote_load_config, remote_save_config, remote_log, resolve_config
 from app.cli import parse_args
-from app.data_processor import run_processing_pipeline
-from app.data_handler import load_csv
+from app.data_processor import run_processing_pipeline, input_source
 from app.config import DEFAULT_VALUES
+from app.batch import run_batch
+from app.sweep import run_sweep
+from app.multi_plugin import run_plugins
 from app.plugin_loader import load_plugin
-from config_merger import merge_config, process_unknown_args
+from app.remote import flush_clients
+from app.config_merger import merge_config, process_unknown_args
+from app.instrumentation import span, start_tracing, stop_tracing
+from app.logging_config import ROOT_LOGGER, configure_logging
+
+# Named explicitly: run as `python -m app.main`, __name__ is __main__, outside the app logger
+logger = logging.getLogger(f'{ROOT_LOGGER}.main')
+
+def _report_timings(tracer, config, debug_info):
+    """
+    Stop tracing and write the timing spans of the run: under 'timings' in the debug file and,
+    with trace_file, as a Chrome trace.
+
+    Args:
+        tracer (Tracer): Tracer of the run.
+        config (dict): Run configuration (trace_file, debug_file).
+        debug_info (dict): Debug information of the run, saved with the timings.
+    """
+    stop_tracing()
+    debug_info['timings'] = tracer.report()
+    if config.get('trace_file'):
+        tracer.write_chrome_trace(config['trace_file'])
+        logger.info("Chrome trace written to %s", config['trace_file'])
+    if config.get('debug_file'):
+        save_debug_info(debug_info, config['debug_file'])
 
 def main():
-    print("Parsing initial arguments...")
-    args, unknown_args = parse_args()
-
-    cli_args = vars(args)
-
-    print("Loading default configuration...")
-    config = DEFAULT_VALUES.copy()
-
-    file_config = {}
-    # remote config file load
-    if args.remote_load_config:
-        file_config = remote_load_config(args.remote_load_config, args.username, args.password)
-        print(f"Loaded remote config: {file_config}")
-
-    # local config file load
-    if args.load_config:
-        file_config = load_config(args.load_config)
-        print(f"Loaded local config: {file_config}")
-
-    print("Merging configuration with CLI arguments and unknown args...")
-    unknown_args_dict = process_unknown_args(unknown_args)
-    config = merge_config(config, {}, file_config, cli_args, unknown_args_dict)
-
-    # Load data using data_handler
-    print(f"Loading data from {config['input_file']}...")
-    data = load_csv(config['input_file'])
-
-    # Plugin loading and processing
-    plugin_name = config['plugin']
-    print(f"Loading plugin: {plugin_name}")
-    plugin_class, _ = load_plugin('trading_signal.plugins', plugin_name)
-    plugin = plugin_class()
-
-    print("Running the feature engineering pipeline...")
-    run_processing_pipeline(config, plugin)
-
-    # Save local configuration if specified
-    if 'save_config' in config and config['save_config']:
-        save_config(config, config['save_config'])
-        print(f"Configuration saved to {config['save_config']}.")
-
-    # Save configuration remotely if specified
-    if 'remote_save_config' in config and config['remote_save_config']:
-        print(f"Remote saving configuration to {config['remote_save_config']}")
-        remote_save_config(config, config['remote_save_config'], config['username'], config['password'])
-        print(f"Remote configuration saved.")
-
-    # Log data remotely if specified
-    if 'remote_log' in config and config['remote_log']:
-        print(f"Logging data remotely to {config['remote_log']}")
-        remote_log(config, config['remote_log'], config['username'], config['password'])
-        print(f"Data logged remotely.")
+    tracer = start_tracing()
+    config = {}
+    debug_info = {}
+    try:
+        args, unknown_args = parse_args()
+
+        cli_args = vars(args)
+        # Logging from the command line until the configuration files are merged
+        configure_logging(cli_args)
+
+        logger.info("Loading default configuration...")
+        config = DEFAULT_VALUES.copy()
+
+        file_config = {}
+        # remote config file load
+        if args.remote_load_config:
+            file_config = remote_load_config(args.remote_load_config, args.remote_username, args.remote_password, cli_args)
+            logger.info("Loaded remote config: %s", file_config)
+
+        # local config file load
+        if args.load_config:
+            file_config = load_config(args.load_config)
+            logger.info("Loaded local config: %s", file_config)
+
+        logger.info("Merging configuration with CLI arguments and unknown args...")
+        with span('config_merge'):
+            unknown_args_dict = process_unknown_args(unknown_args)
+            config = merge_config(config, {}, file_config, cli_args, unknown_args_dict)
+        configure_logging(config)
+
+        # Batch mode: run every job of the manifest instead of a single input file
+        if config.get('batch_manifest'):
+            summary = run_batch(config)
+            logger.info("Batch finished: %d job(s) ok, %d failed.", summary['jobs_ok'], summary['jobs_failed'])
+            debug_info['batch'] = summary
+            return
+
+        # Sweep mode: run the plugin over a grid of parameters on a single parsed input
+        if config.get('sweep_grid'):
+            summary = run_sweep(config)
+            logger.info("Sweep finished: %d combination(s).", len(summary['combinations']))
+            debug_info['sweep'] = summary
+            return
+
+        # Multi-plugin mode: run several plugins over the input, loaded once
+        if config.get('plugins'):
+            summary = run_plugins(config)
+            failed = sum(report['status'] != 'ok' for report in summary['plugins'])
+            logger.info("Plugins finished: %d ok, %d failed.", len(summary['plugins']) - failed, failed)
+            debug_info['plugins'] = summary
+            return
+
+        # Input source shared with the pipeline: the CSV is parsed at most once per run
+        logger.info("Opening input source %s...", config['input_file'])
+        source = input_source(config)
+
+        # Plugin loading and processing
+        plugin_name = config['plugin']
+        logger.info("Loading plugin: %s", plugin_name)
+        with span('plugin_load', plugin=plugin_name):
+            plugin_class, _ = load_plugin('trading_signal.plugins', plugin_name)
+            plugin = plugin_class()
+            plugin.set_params(**config)
+
+        logger.info("Running the feature engineering pipeline...")
+        with span('pipeline'):
+            run_processing_pipeline(config, plugin, source, debug_info)
+
+        input_report = source.stats()
+        logger.info("Input parsed %d time(s) in %.3fs, peak RSS: %s MB", input_report['load_count'],
+                    input_report['load_seconds'], input_report['peak_rss_mb'], extra={'input_load': input_report})
+        if config.get('debug_file'):
+            debug_info['input_load'] = input_report
+        # Timings are written before the remote log, which includes them
+        _report_timings(tracer, config, debug_info)
+
+        # Configuration saved and logged by every sink below, composed once
+        if config.get('save_config') or config.get('remote_save_config') or config.get('remote_log'):
+            config = resolve_config(config)
+
+        # Save local configuration if specified
+        if 'save_config' in config and config['save_config']:
+            save_config(config, config['save_config'])
+            logger.info("Configuration saved to %s.", config['save_config'])
+
+        # Save configuration remotely if specified
+        if 'remote_save_config' in config and config['remote_save_config']:
+            logger.info("Remote saving configuration to %s", config['remote_save_config'])
+            remote_save_config(config, config['remote_save_config'], config['remote_username'], config['remote_password'])
+            logger.info("Remote configuration saved.")
+
+        # Log data remotely if specified
+        if 'remote_log' in config and config['remote_log']:
+            logger.info("Logging data remotely to %s", config['remote_log'])
+            remote_log(config, debug_info, config['remote_log'], config['remote_username'], config['remote_password'])
+            flush_clients()
+            logger.info("Data logged remotely.")
+    finally:
+        # Every mode, early return or failure included, stops the tracer and writes its timings
+        if 'timings' not in debug_info:
+            _report_timings(tracer, config, debug_info)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,175 @@
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from app.data_handler import DataSource
+from app.data_processor import input_source, run_processing_pipeline
+from app.plugin_loader import load_plugin
+
+logger = logging.getLogger(__name__)
+
+PLUGIN_MODES = ('fanout', 'chain')
+
+# State shared with the worker processes, set before the pool is created so that (with the fork
+# start method) every worker reads the loaded input from the parent's memory, as in app.sweep.
+_PLUGINS_STATE = {}
+
+
+def parse_plugins(spec):
+    """
+    Parse the list of plugins to run over one input.
+
+    Args:
+        spec (str or list): Comma-separated plugin names, a JSON list, or a path to a JSON file.
+            JSON items are plugin names or objects {"plugin": name, "params": {...}}.
+
+    Returns:
+        list: One {'plugin': name, 'params': dict} entry per plugin, in run order.
+    """
+    if isinstance(spec, str):
+        text = spec.strip()
+        if os.path.exists(text):
+            with open(text, 'r') as f:
+                spec = json.load(f)
+        elif text.startswith('['):
+            spec = json.loads(text)
+        else:
+            spec = [name.strip() for name in text.split(',') if name.strip()]
+    entries = []
+    for item in spec:
+        if isinstance(item, str):
+            item = {'plugin': item}
+        entries.append({'plugin': item['plugin'], 'params': dict(item.get('params') or {})})
+    if not entries:
+        raise ValueError("No plugins to run.")
+    return entries
+
+
+def output_paths(template, plugin_name, index):
+    """Format the hourly and daily output paths of one plugin ({plugin}, {index} and {kind})."""
+    return tuple(template.format(plugin=plugin_name, index=index, kind=kind) for kind in ('hourly', 'daily'))
+
+
+def _run_plugin(index, source=None):
+    """Run one configured plugin over the shared input (or the given source) and report it."""
+    state = _PLUGINS_STATE
+    plugin_config = state['configs'][index]
+    report = {
+        'plugin': plugin_config['plugin'],
+        'params': state['entries'][index]['params'],
+        'hourly_output_file': plugin_config['hourly_output_file'],
+        'daily_output_file': plugin_config['daily_output_file']
+    }
+    start = time.perf_counter()
+    output = None
+    try:
+        plugin = state['plugin_classes'][index]()
+        plugin.set_params(**plugin_config)
+        output = run_processing_pipeline(plugin_config, plugin, source or state['source'])['data']
+        report['status'] = 'ok'
+        report['rows_out'] = len(output)
+    except Exception as e:
+        report['status'] = 'failed'
+        report['error'] = f"{type(e).__name__}: {e}"
+    report['wall_seconds'] = round(time.perf_counter() - start, 6)
+    return report, output
+
+
+def _run_fanout(index):
+    """Worker entry point of fan-out mode: the report only (outputs are already written)."""
+    return _run_plugin(index)[0]
+
+
+def run_plugins(config):
+    """
+    Run several plugins over an input loaded only once, each one writing its own outputs.
+
+    In 'fanout' mode every plugin processes the input independently, on up to
+    config['plugins_workers'] forked processes that share the loaded input. In 'chain' mode the
+    plugins run in order and each one processes the output of the previous one; the chain stops
+    at the first failure.
+
+    Args:
+        config (dict): Configuration (plugins, plugins_mode, plugins_workers,
+            plugins_output_template, plugins_summary_file and the usual pipeline keys).
+
+    Returns:
+        dict: Summary with one report per plugin.
+    """
+    entries = parse_plugins(config['plugins'])
+    mode = config.get('plugins_mode') or 'fanout'
+    if mode not in PLUGIN_MODES:
+        raise ValueError(f"Unsupported plugins mode '{mode}', expected one of {PLUGIN_MODES}.")
+
+    # Incremental mode re-reads the input per run and keeps one state per output pair, which
+    # neither loads the input once nor fits several plugins
+    if config.get('incremental_state_file'):
+        raise ValueError("incremental_state_file is not supported in multi-plugin mode; "
+                         "run each plugin separately to process an input incrementally.")
+
+    base_config = {k: v for k, v in config.items() if not k.startswith('plugins')}
+    base_config['chunk_size'] = None
+    configs = []
+    plugin_classes = []
+    for index, entry in enumerate(entries):
+        plugin_config = base_config.copy()
+        plugin_config.update(entry['params'])
+        plugin_config['plugin'] = entry['plugin']
+        plugin_config['hourly_output_file'], plugin_config['daily_output_file'] = \
+            output_paths(config['plugins_output_template'], entry['plugin'], index)
+        configs.append(plugin_config)
+        plugin_classes.append(load_plugin('trading_signal.plugins', entry['plugin'])[0])
+    paths = [c[key] for c in configs for key in ('hourly_output_file', 'daily_output_file')]
+    if len(set(paths)) != len(paths):
+        raise ValueError("plugins_output_template gives several plugins the same output file; "
+                         "use {index} to tell repeated plugins apart.")
+
+    # Load the input once, as a PriceSeries and/or a DataFrame depending on what the plugins
+    # accept (both share the same column arrays)
+    source = input_source(base_config)
+    if any(getattr(plugin_class, 'accepts_price_series', False) for plugin_class in plugin_classes):
+        source.load_series()
+    if not all(getattr(plugin_class, 'accepts_price_series', False) for plugin_class in plugin_classes):
+        source.load()
+
+    _PLUGINS_STATE.clear()
+    _PLUGINS_STATE.update({'entries': entries, 'configs': configs, 'plugin_classes': plugin_classes,
+                           'source': source})
+
+    workers = int(config.get('plugins_workers') or os.cpu_count() or 1)
+    workers = 1 if mode == 'chain' else max(1, min(workers, len(entries)))
+    logger.info("Running %d plugins (%s) on %d worker(s)...", len(entries), mode, workers)
+
+    start = time.perf_counter()
+    if mode == 'chain':
+        reports = []
+        chain_source = source
+        for index in range(len(entries)):
+            report, output = _run_plugin(index, chain_source)
+            reports.append(report)
+            if report['status'] != 'ok':
+                break
+            chain_source = DataSource.from_frame(output, base_config['input_file'])
+    elif workers == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        reports = [_run_fanout(index) for index in range(len(entries))]
+    else:
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            reports = list(executor.map(_run_fanout, range(len(entries))))
+    _PLUGINS_STATE.clear()
+
+    summary = {
+        'input_file': config['input_file'],
+        'mode': mode,
+        'workers': workers,
+        'input_load': source.stats(),
+        'total_wall_seconds': round(time.perf_counter() - start, 6),
+        'plugins': reports
+    }
+    if config.get('plugins_summary_file'):
+        with open(config['plugins_summary_file'], 'w') as f:
+            json.dump(summary, f, indent=4, default=str)
+        logger.info("Plugins summary written to %s", config['plugins_summary_file'])
+    return summary
@@ -1,50 +1,113 @@
-import pkg_resources
+import logging
+from importlib import metadata
+from types import MappingProxyType
 
-def load_plugin(plugin_group='trading_signal.plugins', plugin_name='default_plugin'):
-    print(f"Attempting to load plugin: {plugin_name}")
-    try:
-        # Debugging: Print the group and plugin name being searched
-        print(f"[DEBUG] Searching in plugin group: {plugin_group}")
-        entry_map = pkg_resources.get_entry_map('trading_signal', plugin_group)
-        print(f"[DEBUG] Available plugins in group '{plugin_group}': {list(entry_map.keys())}")
+logger = logging.getLogger(__name__)
+
+# Entry points and plugin classes resolved in this process: each group is scanned and each
+# plugin is imported at most once, no matter how many times it is requested.
+_ENTRY_POINTS = {}
+_PLUGIN_CLASSES = {}
+# Read-only default parameters of each resolved plugin, see plugin_defaults()
+_PLUGIN_DEFAULTS = {}
+
+
+def _entry_points(plugin_group):
+    """
+    Return the entry points of a plugin group as a dict keyed by plugin name.
+
+    Only the metadata of the trading_signal distribution is read; if it is not installed, the
+    group is looked up across the installed distributions instead.
+    """
+    if plugin_group not in _ENTRY_POINTS:
+        try:
+            entry_points = [ep for ep in metadata.distribution('trading_signal').entry_points
+                            if ep.group == plugin_group]
+        except metadata.PackageNotFoundError:
+            entry_points = metadata.entry_points(group=plugin_group)
+        _ENTRY_POINTS[plugin_group] = {ep.name: ep for ep in entry_points}
+    return _ENTRY_POINTS[plugin_group]
+
+
+def _plugin_class(plugin_group, plugin_name):
+    """Return the plugin class, importing it on the first request only."""
+    key = (plugin_group, plugin_name)
+    if key not in _PLUGIN_CLASSES:
+        entry_map = _entry_points(plugin_group)
+        logger.debug("Available plugins in group '%s': %s", plugin_group, list(entry_map))
 
         # Check if the plugin exists in the entry map
         if plugin_name not in entry_map:
-            print(f"[DEBUG] Plugin '{plugin_name}' not found in entry map.")
+            logger.debug("Plugin '%s' not found in entry map.", plugin_name)
             raise KeyError(plugin_name)
 
         # Load the entry point
         entry_point = entry_map[plugin_name]
-        print(f"[DEBUG] Found entry point: {entry_point}")
+        logger.debug("Found entry point: %s", entry_point)
+        _PLUGIN_CLASSES[key] = entry_point.load()
+    return _PLUGIN_CLASSES[key]
+
+
+def load_plugin(plugin_group='trading_signal.plugins', plugin_name='default_plugin'):
+    logger.debug("Attempting to load plugin: %s", plugin_name)
+    try:
+        logger.debug("Searching in plugin group: %s", plugin_group)
 
         # Load the plugin class
-        plugin_class = entry_point.load()
-        print(f"[DEBUG] Plugin class loaded: {plugin_class}")
+        plugin_class = _plugin_class(plugin_group, plugin_name)
+        logger.debug("Plugin class loaded: %s", plugin_class)
 
         # Retrieve required parameters from the plugin class
         required_params = list(plugin_class.plugin_params.keys())
-        print(f"Successfully loaded plugin: {plugin_name} with params: {plugin_class.plugin_params}")
+        logger.info("Loaded plugin %s with params: %s", plugin_name, plugin_class.plugin_params)
         return plugin_class, required_params
 
     except KeyError as e:
-        print(f"[ERROR] Failed to find plugin '{plugin_name}' in group '{plugin_group}', Error: {e}")
+        logger.error("Failed to find plugin '%s' in group '%s', Error: %s", plugin_name, plugin_group, e)
         raise ImportError(f"Plugin {plugin_name} not found.") from e
 
     except Exception as e:
-        print(f"[ERROR] An unexpected error occurred while loading plugin '{plugin_name}', Error: {e}")
+        logger.error("An unexpected error occurred while loading plugin '%s', Error: %s", plugin_name, e)
         raise
 
 
 def get_plugin_params(plugin_name):
-    print(f"Getting plugin parameters for: {plugin_name}")
+    logger.debug("Getting plugin parameters for: %s", plugin_name)
     try:
-        entry_point = pkg_resources.get_entry_map('trading_signal', 'trading_signal.plugins')[plugin_name]
-        plugin_class = entry_point.load()
-        print(f"Retrieved plugin params: {plugin_class.plugin_params}")
+        plugin_class = _plugin_class('trading_signal.plugins', plugin_name)
+        logger.debug("Retrieved plugin params: %s", plugin_class.plugin_params)
         return plugin_class.plugin_params
     except KeyError as e:
-        print(f"Failed to find plugin {plugin_name}, Error: {e}")
+        logger.error("Failed to find plugin %s, Error: %s", plugin_name, e)
         return {}
     except Exception as e:
-        print(f"Failed to get plugin params: {plugin_name}, Error: {e}")
+        logger.error("Failed to get plugin params: %s, Error: %s", plugin_name, e)
         return {}
+
+
+def plugin_defaults(plugin_name, plugin_group='trading_signal.plugins'):
+    """
+    Return the default parameters of a plugin as a read-only mapping.
+
+    The defaults are read from the plugin_params class attribute, so the plugin is not
+    instantiated, and they are resolved once per plugin and process however many
+    configurations are composed from them.
+
+    Args:
+        plugin_name (str): Plugin name.
+        plugin_group (str): Entry-point group of the plugin.
+
+    Returns:
+        MappingProxyType: The default parameters.
+
+    Raises:
+        ImportError: If the plugin is not found.
+    """
+    key = (plugin_group, plugin_name)
+    if key not in _PLUGIN_DEFAULTS:
+        try:
+            plugin_class = _plugin_class(plugin_group, plugin_name)
+        except KeyError as e:
+            raise ImportError(f"Plugin {plugin_name} not found.") from e
+        _PLUGIN_DEFAULTS[key] = MappingProxyType(dict(plugin_class.plugin_params))
+    return _PLUGIN_DEFAULTS[key]
@@ -1,9 +1,11 @@
+import logging
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import skew, kurtosis
-import json
+from app.instrumentation import span
+from app.price_series import PriceSeries
+from app.targets import Shift, TradingDayShift, build_targets
+
+logger = logging.getLogger(__name__)
 
 class Plugin:
     """
@@ -17,12 +19,19 @@ class Plugin:
         'time_horizon': 6,        # Number of hourly predictions
         'ticks_per_day': 24,      # Number of ticks per day (assume hourly data by default)
         'days_horizon': 6,        # Number of daily predictions
-        'std_dev_horizon': 12     # Optional: for rolling standard deviation calculation (not used now)
+        'std_dev_horizon': 12,    # Optional: for rolling standard deviation calculation (not used now)
+        'daily_mode': 'ticks',    # Daily targets every ticks_per_day ticks, or 'calendar' (N trading days ahead)
+        'session_start': '00:00', # Start time of a trading day in calendar mode (e.g. '17:00' for FX)
+        'session_timezone': None, # Time zone of session_start (None uses the timestamps as they are)
+        'data_timezone': 'UTC'    # Time zone of naive timestamps when session_timezone is set
     }
 
     # Define the debug variables for this plugin
     plugin_debug_vars = ['column_metrics', 'normalization_params']
 
+    # process() reads its columns with column_values, so it accepts a PriceSeries as well as a DataFrame
+    accepts_price_series = True
+
     def __init__(self):
         """
         Initialize the Plugin with default parameters.
@@ -30,6 +39,7 @@ class Plugin:
         self.params = self.plugin_params.copy()
         self.normalization_params = {}  # To store normalization parameters for each column
         self.column_metrics = {}        # To store metrics for each column
+        self.horizon_cache = None       # Optional HorizonCache shared across runs over the same data
 
     def set_params(self, **kwargs):
         """
@@ -64,6 +74,56 @@ class Plugin:
         """
         debug_info.update(self.get_debug_info())
 
+    def lookahead(self):
+        """
+        Number of future rows needed to resolve every prediction of a row.
+
+        Returns:
+            int: The longest hourly or daily horizon, in ticks.
+        """
+        if self.params['daily_mode'] == 'calendar':
+            raise ValueError("Calendar daily targets have no fixed lookahead in ticks; chunked and "
+                             "incremental processing need daily_mode 'ticks'.")
+        return max(self.params['time_horizon'], self.params['days_horizon'] * self.params['ticks_per_day'])
+
+    def horizon_offsets(self):
+        """
+        Lookahead offsets of the prediction columns, hourly first and then daily (hourly only in
+        calendar mode, where daily targets are resolved from the timestamps).
+
+        Returns:
+            list: Offsets in ticks, in output column order.
+        """
+        time_horizon = self.params['time_horizon']
+        ticks_per_day = self.params['ticks_per_day']
+        days_horizon = self.params['days_horizon']
+        if self.params['daily_mode'] == 'calendar':
+            return list(range(1, time_horizon + 1))
+        return list(range(1, time_horizon + 1)) + [i * ticks_per_day for i in range(1, days_horizon + 1)]
+
+    def targets(self):
+        """
+        Target declarations of the output columns, for build_targets.
+
+        Returns:
+            list: Hourly then daily predictions of the target column, plus its current value,
+                which is not output but must exist for a row to be kept.
+        """
+        target_column = self.params['target_column']
+        time_horizon = self.params['time_horizon']
+        days_horizon = self.params['days_horizon']
+        targets = [Shift(target_column, range(1, time_horizon + 1), 'Prediction_h_{i}')]
+        if self.params['daily_mode'] == 'calendar':
+            targets.append(TradingDayShift(target_column, range(1, days_horizon + 1), 'Prediction_d_{i}',
+                                           self.params['session_start'], self.params['session_timezone'],
+                                           self.params['data_timezone']))
+        else:
+            ticks_per_day = self.params['ticks_per_day']
+            targets.append(Shift(target_column, [i * ticks_per_day for i in range(1, days_horizon + 1)],
+                                 'Prediction_d_{i}'))
+        targets.append(Shift(target_column, [0], output=False))
+        return targets
+
     def process(self, data):
         """
         Generate a dataset with hourly and daily predictions.
@@ -73,57 +133,48 @@ class Plugin:
           - Prediction_h_1, ..., Prediction_h_{time_horizon}
           - Prediction_d_1, ..., Prediction_d_{days_horizon}
 
-        The predictions are generated by shifting the target column.
+        The predictions are generated by shifting the target column. In calendar mode the daily
+        predictions are the target value N trading days ahead (see trading_day_index), so
+        weekends, holidays and gaps in the data do not shift them.
         Unwanted columns (OPEN, HIGH, LOW, CLOSE, std_dev) are removed.
         """
-        print(f"[DEBUG] Loaded data shape: {data.shape}")
-        print(f"[DEBUG] Columns in the data: {list(data.columns)}")
+        daily_mode = self.params['daily_mode']
+        if daily_mode not in ('ticks', 'calendar'):
+            raise ValueError(f"[ERROR] Unsupported daily_mode '{daily_mode}', expected 'ticks' or 'calendar'.")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Loaded data shape: %s", data.shape)
+            logger.debug("Columns in the data: %s", list(data.columns))
 
         # Step 1: Ensure DATE_TIME column is included as a regular column
-        if isinstance(data.index, pd.DatetimeIndex):
-            print("[DEBUG] DATE_TIME is currently the index. Resetting it to a regular column...")
+        if isinstance(data, pd.DataFrame) and isinstance(data.index, pd.DatetimeIndex):
+            logger.debug("DATE_TIME is currently the index. Resetting it to a regular column...")
             data.reset_index(inplace=True)
         if 'DATE_TIME' not in data.columns:
             raise ValueError("[ERROR] DATE_TIME column is missing in the input data!")
 
         target_column = self.params['target_column']
-        print(f"[DEBUG] Target column: {target_column}")
+        logger.debug("Target column: %s", target_column)
         if target_column not in data.columns:
             raise ValueError(f"[ERROR] Target column '{target_column}' is missing in the input data!")
 
-        # Step 2: Extract only DATE_TIME and target column for processing
-        columns_to_extract = ['DATE_TIME', target_column]
-        processed_data = data[columns_to_extract].copy()
-        print(f"[DEBUG] Extracted columns: {list(processed_data.columns)}")
-
-        # Step 3: Generate hourly predictions from the target column.
-        time_horizon = self.params['time_horizon']
-        for i in range(1, time_horizon + 1):
-            processed_data[f'Prediction_h_{i}'] = processed_data[target_column].shift(-i)
-
-        # Step 4: Generate daily predictions
-        ticks_per_day = self.params['ticks_per_day']
-        days_horizon = self.params['days_horizon']
-        for i in range(1, days_horizon + 1):
-            processed_data[f'Prediction_d_{i}'] = processed_data[target_column].shift(-i * ticks_per_day)
-
-        # Step 5: Drop rows with NaN values resulting from shifts
-        initial_shape = processed_data.shape
-        processed_data.dropna(inplace=True)
-        final_shape = processed_data.shape
-        print(f"[DEBUG] Processed data shape before dropping NaN: {initial_shape}")
-        print(f"[DEBUG] Processed data shape after dropping NaN: {final_shape}")
-
-        # Step 6: Remove the original target column (and any other non-prediction columns)
-        if target_column in processed_data.columns:
-            processed_data.drop(columns=[target_column], inplace=True)
-
-        # Step 7: Reset index and ensure chronological order
-        processed_data.reset_index(drop=True, inplace=True)
-        processed_data.sort_values(by='DATE_TIME', inplace=True)
-        processed_data.reset_index(drop=True, inplace=True)
-
-        print(f"[DEBUG] Final processed data shape: {processed_data.shape}")
+        # Step 2 to 5: Declare the hourly and daily predictions of the target column and let
+        # build_targets shift it once for every horizon and drop the rows that miss one
+        processed_data = build_targets(data, self.targets(), horizon_cache=self.horizon_cache)
+        logger.debug("Processed data shape before dropping NaN: %s", (len(data), processed_data.shape[1] + 1))
+        logger.debug("Processed data shape after dropping NaN: %s", (len(processed_data), processed_data.shape[1] + 1))
+
+        # Step 6: Ensure chronological order. Output rows keep the input order, so the sort is
+        # skipped when the input is already sorted (known from the bar index of a PriceSeries)
+        if isinstance(data, PriceSeries):
+            is_sorted = data.bar_index.is_sorted
+        else:
+            is_sorted = processed_data['DATE_TIME'].is_monotonic_increasing
+        if not is_sorted:
+            with span('sort', rows=len(processed_data)):
+                processed_data.sort_values(by='DATE_TIME', inplace=True)
+                processed_data.reset_index(drop=True, inplace=True)
+
+        logger.debug("Final processed data shape: %s", processed_data.shape)
         return processed_data
 
 
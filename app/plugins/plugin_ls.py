@@ -1,9 +1,18 @@
+import logging
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy.stats import skew, kurtosis
-import json
+from app.targets import DailyAggregate, Rolling, Shift, build_targets
+
+logger = logging.getLogger(__name__)
+
+# Daily aggregation of each target column (output as daily_<column>_D<n>)
+_DAILY_AGG = {
+    'HIGH': 'max',
+    'LOW': 'min',
+    'CLOSE': 'last',
+    'OPEN': 'first'
+}
+
 
 class Plugin:
     """
@@ -21,6 +30,9 @@ class Plugin:
     # Define the debug variables for this plugin
     plugin_debug_vars = ['column_metrics', 'normalization_params']
 
+    # process() reads its columns with column_values, so it accepts a PriceSeries as well as a DataFrame
+    accepts_price_series = True
+
     def __init__(self):
         """
         Initialize the Plugin with default parameters.
@@ -62,107 +74,67 @@ class Plugin:
         """
         debug_info.update(self.get_debug_info())
 
+    def targets(self):
+        """
+        Target declarations of the output columns, for build_targets.
+
+        Returns:
+            list: Current OHLC values, hourly CLOSE predictions, daily aggregates of every
+                column and the rolling standard deviations of CLOSE, in output column order.
+        """
+        time_horizon = self.params['time_horizon']
+        daily_horizon = self.params['daily_horizon']
+        targets = [Shift(col, [0], '{column}') for col in ['CLOSE', 'HIGH', 'LOW', 'OPEN']]
+        targets.append(Shift('CLOSE', range(1, time_horizon + 1), '{column}_t+{n}'))
+        for col, agg in _DAILY_AGG.items():
+            targets.append(DailyAggregate(col, agg, range(1, daily_horizon + 1), 'daily_{column}_D{n}'))
+        # The current day must have every aggregate for a row to be kept
+        for col, agg in _DAILY_AGG.items():
+            targets.append(DailyAggregate(col, agg, [0], output=False))
+        targets.append(Rolling('CLOSE', 'std', [self.params['std_dev_horizon'], 12 * 24],
+                               ['std_dev_12h', 'std_dev_12d']))
+        return targets
+
     def process(self, data):
         """
         Generate a training signal dataset with predictions for hourly and daily horizons,
         rolling standard deviations, and proper column organization.
 
         Args:
-            data (pd.DataFrame): The input data to be processed.
+            data (pd.DataFrame or PriceSeries): The input data to be processed.
 
         Returns:
             pd.DataFrame: The processed dataset ready for NEAT.
         """
-        print(f"[DEBUG] Loaded data shape: {data.shape}")
-        print(f"[DEBUG] Columns in the data: {list(data.columns)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Loaded data shape: %s", data.shape)
+            logger.debug("Columns in the data: %s", list(data.columns))
 
         # Paso 1: Asegurarse de que la columna DATE_TIME esté como columna regular
-        if isinstance(data.index, pd.DatetimeIndex):
-            print("[DEBUG] DATE_TIME está actualmente como índice. Reiniciando a columna regular...")
+        if isinstance(data, pd.DataFrame) and isinstance(data.index, pd.DatetimeIndex):
+            logger.debug("DATE_TIME está actualmente como índice. Reiniciando a columna regular...")
             data.reset_index(inplace=True)
         if 'DATE_TIME' not in data.columns:
             raise ValueError("[ERROR] La columna DATE_TIME falta en los datos de entrada!")
 
         # Paso 2: Extraer DATE_TIME y las columnas objetivo
         target_columns = ['CLOSE', 'HIGH', 'LOW', 'OPEN']
-        print(f"[DEBUG] Target columns: {target_columns}")
+        logger.debug("Target columns: %s", target_columns)
 
         for target_column in target_columns:
             if target_column not in data.columns:
                 raise ValueError(f"[ERROR] La columna objetivo '{target_column}' falta en los datos de entrada!")
 
-        # Extraer columnas relevantes
-        processed_data = data[['DATE_TIME'] + target_columns].copy()
-
-        # Paso 3: Generar predicciones horarias (horizonte a corto plazo) para 'CLOSE'
-        time_horizon = self.params['time_horizon']
-        print(f"[DEBUG] Generando predicciones horarias para los próximos {time_horizon} ticks...")
-        for i in range(1, time_horizon + 1):
-            processed_data[f"CLOSE_t+{i}"] = processed_data['CLOSE'].shift(-i)
-
-        # Paso 4: Generar predicciones diarias (horizonte a largo plazo) para todas las columnas objetivo
-        print("[DEBUG] Calculando daily HIGH, LOW, CLOSE, OPEN...")
-        data['DATE'] = pd.to_datetime(data['DATE_TIME']).dt.date  # Extraer fecha
-
-        # Utilizar un diccionario para la agregación correcta
-        daily_agg = {
-            'HIGH': 'max',
-            'LOW': 'min',
-            'CLOSE': 'last',
-            'OPEN': 'first'
-        }
-        daily_data = data.groupby('DATE').agg(daily_agg).reset_index()
+        # Pasos 3 a 7: Declarar las predicciones horarias, diarias y las desviaciones estándar
+        # móviles; build_targets las calcula una sola vez y elimina las filas con NaN
+        logger.debug("Generando predicciones para los próximos %d ticks y %d días...",
+                     self.params['time_horizon'], self.params['daily_horizon'])
+        processed_data = build_targets(data, self.targets(), index='rows')
+        logger.debug("Forma de los datos procesados después de eliminar NaN: %s", processed_data.shape)
 
-        # Renombrar columnas diarias para evitar conflictos durante la fusión
-        daily_data = daily_data.rename(columns={
-            'HIGH': 'daily_HIGH',
-            'LOW': 'daily_LOW',
-            'CLOSE': 'daily_CLOSE',
-            'OPEN': 'daily_OPEN'
-        })
-
-        daily_horizon = self.params['daily_horizon']
-        print(f"[DEBUG] Generando predicciones diarias para los próximos {daily_horizon} días...")
-        for col in ['daily_HIGH', 'daily_LOW', 'daily_CLOSE', 'daily_OPEN']:
-            for i in range(1, daily_horizon + 1):
-                daily_data[f"{col}_D{i}"] = daily_data[col].shift(-i)
-
-        # Fusión de las predicciones diarias de vuelta al conjunto de datos principal
-        processed_data['DATE'] = pd.to_datetime(processed_data['DATE_TIME']).dt.date
-        processed_data = processed_data.merge(daily_data, on='DATE', how='left')
-
-        # Depuración después de la fusión
-        print(f"[DEBUG] Columns after merge: {list(processed_data.columns)}")
-
-        # Paso 5: Calcular desviaciones estándar móviles para 'CLOSE'
-        std_dev_horizon = self.params['std_dev_horizon']
-        print(f"[DEBUG] Calculando desviación estándar móvil sobre los últimos {std_dev_horizon} ticks...")
-        if 'CLOSE' not in processed_data.columns:
-            raise KeyError(f"La columna objetivo 'CLOSE' no se encontró después de la fusión.")
-        processed_data['std_dev_12h'] = processed_data['CLOSE'].rolling(window=std_dev_horizon).std()
-
-        print("[DEBUG] Calculando desviación estándar móvil sobre los últimos 12 días...")
-        processed_data['std_dev_12d'] = processed_data['CLOSE'].rolling(window=12 * 24).std()
-
-        # Paso 6: Eliminar filas con valores NaN
-        initial_shape = processed_data.shape
-        processed_data.dropna(inplace=True)
-        final_shape = processed_data.shape
-        print(f"[DEBUG] Forma de los datos procesados antes de eliminar NaN: {initial_shape}")
-        print(f"[DEBUG] Forma de los datos procesados después de eliminar NaN: {final_shape}")
-
-        # Paso 7: Organizar columnas según la estructura acordada
-        print("[DEBUG] Organizando columnas...")
-        hourly_columns = [f"CLOSE_t+{i}" for i in range(1, time_horizon + 1)]
-        daily_columns = [f"{col}_D{i}" for col in ['daily_HIGH', 'daily_LOW', 'daily_CLOSE', 'daily_OPEN'] for i in range(1, daily_horizon + 1)]
-        std_dev_columns = ['std_dev_12h', 'std_dev_12d']
-
-        # Incluir 'CLOSE', 'HIGH', 'LOW', 'OPEN' para el valor actual
-        final_columns = ['DATE_TIME', 'CLOSE', 'HIGH', 'LOW', 'OPEN'] + hourly_columns + daily_columns + std_dev_columns
-        processed_data = processed_data[final_columns]
-
-        print(f"[DEBUG] Final processed data shape: {processed_data.shape}")
-        print(f"[DEBUG] Final columns: {list(processed_data.columns)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Final processed data shape: %s", processed_data.shape)
+            logger.debug("Final columns: %s", list(processed_data.columns))
         return processed_data
 
 
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+# Supported precision modes: full float64, float32 end-to-end, or float32 computation with
+# prices stored as int32 multiples of 1 / pip_scale
+PRECISION_MODES = ('float64', 'float32', 'pips')
+
+
+def check_precision(precision):
+    """Raise ValueError if precision is not one of PRECISION_MODES."""
+    if precision not in PRECISION_MODES:
+        raise ValueError(f"Unsupported precision '{precision}', expected one of {PRECISION_MODES}.")
+
+
+def input_dtype(precision):
+    """Return the dtype numeric input columns are parsed with in the given mode (None infers it)."""
+    check_precision(precision)
+    return None if precision == 'float64' else 'float32'
+
+
+def to_output_precision(data, precision, pip_scale=100000):
+    """
+    Convert the numeric columns of a processed frame to the storage type of the precision mode.
+
+    In 'float32' mode float columns are stored as float32; in 'pips' mode they are rounded to
+    int32 multiples of 1 / pip_scale (nullable Int32 if a column has NaN values). Other
+    columns (e.g. DATE_TIME) are kept as they are.
+
+    Args:
+        data (pd.DataFrame): Processed frame.
+        precision (str): One of PRECISION_MODES.
+        pip_scale (int): Price units per pip-scaled integer, e.g. 100000 for 5-decimal quotes.
+
+    Returns:
+        pd.DataFrame: The converted frame (data itself in 'float64' mode).
+    """
+    check_precision(precision)
+    if precision == 'float64':
+        return data
+    converted = {}
+    for col in data.columns:
+        values = data[col]
+        if not pd.api.types.is_float_dtype(values.dtype):
+            continue
+        if precision == 'float32':
+            converted[col] = values.astype(np.float32)
+            continue
+        scaled = np.rint(values.to_numpy(dtype=np.float64) * pip_scale)
+        limit = np.iinfo(np.int32).max
+        if np.nanmax(np.abs(scaled), initial=0) > limit:
+            raise ValueError(f"Column '{col}' overflows int32 at a pip scale of {pip_scale}.")
+        if np.isnan(scaled).any():
+            converted[col] = pd.array(scaled, dtype='Int32')
+        else:
+            converted[col] = scaled.astype(np.int32)
+    if not converted:
+        return data
+    result = data.copy(deep=False)
+    for col, values in converted.items():
+        result[col] = values
+    return result
+
+
+def precision_report(reference, compact, precision, pip_scale=100000):
+    """
+    Compare a compact-precision result with the float64 result of the same run.
+
+    Args:
+        reference (pd.DataFrame): Output computed in float64.
+        compact (pd.DataFrame): Output computed (and stored) in the compact mode.
+        precision (str): Mode of the compact output.
+        pip_scale (int): Pip scale of the 'pips' mode.
+
+    Returns:
+        dict: Maximum absolute deviation (in price units) per numeric column and overall, the
+            maximum relative deviation, and the number of compared and mismatched rows.
+    """
+    rows = reference.index.intersection(compact.index)
+    report = {
+        'precision': precision,
+        'rows_compared': len(rows),
+        'rows_mismatched': len(reference.index.symmetric_difference(compact.index)),
+        'columns': {}
+    }
+    max_abs = 0.0
+    max_rel = 0.0
+    for col in reference.columns:
+        if col not in compact.columns or not pd.api.types.is_float_dtype(reference[col].dtype):
+            continue
+        expected = reference[col].loc[rows].to_numpy(dtype=np.float64)
+        actual = compact[col].loc[rows].to_numpy(dtype=np.float64, na_value=np.nan)
+        if precision == 'pips':
+            actual = actual / pip_scale
+        deviation = np.abs(actual - expected)
+        if not deviation.size or np.isnan(deviation).all():
+            continue
+        col_abs = float(np.nanmax(deviation))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            relative = deviation / np.abs(expected)
+        relative = relative[np.isfinite(relative)]
+        max_abs = max(max_abs, col_abs)
+        max_rel = max(max_rel, float(relative.max(initial=0.0)))
+        report['columns'][col] = col_abs
+    report['max_abs_deviation'] = max_abs
+    report['max_rel_deviation'] = max_rel
+    return report
@@ -0,0 +1,184 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from app.bar_index import BarIndex
+
+# Layout of a saved series, shared with the parsed-input cache entries (app.data_cache)
+_META_FILE = 'meta.json'
+_DATE_COLUMN = 'DATE_TIME'
+
+
+class PriceSeries:
+    """
+    Compact columnar price history: an int64 timestamp array plus one float array per column.
+
+    The arrays are plain contiguous NumPy arrays, possibly memory-mapped from a saved series, so
+    several plugins (or processes) can read the same multi-GB history without copying it.
+    Plugins read columns with column_values() and a DataFrame is only built on demand by
+    to_frame(). Like a DataFrame, ``len(series)``, ``name in series.columns`` and
+    ``series[name]`` are supported.
+    """
+
+    def __init__(self, timestamps, columns, unit='ns', tz=None):
+        """
+        Args:
+            timestamps (np.ndarray): int64 timestamps since the epoch, NaT as the minimum int64.
+            columns (dict): Float array per column name, each with the length of timestamps.
+            unit (str): Resolution of the timestamps ('s', 'ms', 'us' or 'ns').
+            tz (str, optional): Time zone of the DATE_TIME column (timestamps are then UTC).
+        """
+        self.timestamps = np.asarray(timestamps).view(np.int64)
+        self.arrays = dict(columns)
+        self.unit = unit
+        self.tz = tz
+        self._bar_index = None
+        for name, values in self.arrays.items():
+            if len(values) != len(self.timestamps):
+                raise ValueError(f"Column '{name}' has {len(values)} rows, expected {len(self.timestamps)}.")
+
+    @classmethod
+    def from_frame(cls, data):
+        """
+        Build a series from a loaded DataFrame, sharing its float columns without copying them.
+
+        Integer and nullable columns are converted to float64; non-numeric columns are skipped.
+
+        Args:
+            data (pd.DataFrame): Frame with a datetime DATE_TIME column.
+
+        Returns:
+            PriceSeries: The series.
+        """
+        date_time = data[_DATE_COLUMN]
+        if not pd.api.types.is_datetime64_any_dtype(date_time.dtype):
+            raise TypeError(f"{_DATE_COLUMN} must be a datetime column to build a PriceSeries, not {date_time.dtype}.")
+        tz = None
+        if date_time.dt.tz is not None:
+            tz = str(date_time.dt.tz)
+            date_time = date_time.dt.tz_convert(None)
+        stamps = date_time.to_numpy()
+        unit = np.datetime_data(stamps.dtype)[0]
+
+        columns = {}
+        for name in data.columns:
+            if name == _DATE_COLUMN or not pd.api.types.is_numeric_dtype(data[name].dtype):
+                continue
+            values = data[name]
+            if isinstance(values.dtype, np.dtype) and values.dtype.kind == 'f':
+                columns[str(name)] = values.to_numpy()
+            else:
+                columns[str(name)] = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls(stamps.view(np.int64), columns, unit=unit, tz=tz)
+
+    @classmethod
+    def open(cls, directory, mmap_mode='r'):
+        """
+        Open a series saved with save(), memory-mapping its arrays by default.
+
+        Args:
+            directory (str): Directory of the saved series.
+            mmap_mode (str, optional): np.load memory-map mode (None reads the arrays into memory).
+
+        Returns:
+            PriceSeries: The series.
+        """
+        with open(os.path.join(directory, _META_FILE), 'r') as f:
+            meta = json.load(f)
+        timestamps = None
+        unit = 'ns'
+        columns = {}
+        for i, (name, dtype) in enumerate(zip(meta['columns'], meta['dtypes'])):
+            values = np.load(os.path.join(directory, f'col_{i}.npy'), mmap_mode=mmap_mode)
+            if name == _DATE_COLUMN:
+                if values.dtype.kind != 'M':
+                    raise TypeError(f"{_DATE_COLUMN} is stored as {dtype}, not as datetimes.")
+                unit = np.datetime_data(values.dtype)[0]
+                timestamps = values.view(np.int64)
+            elif values.dtype.kind == 'f':
+                columns[name] = values
+        if timestamps is None:
+            raise KeyError(_DATE_COLUMN)
+        return cls(timestamps, columns, unit=unit, tz=meta.get('tz'))
+
+    def save(self, directory):
+        """
+        Save the series as one .npy file per column, in the layout of the input cache entries.
+
+        Args:
+            directory (str): Target directory, created if needed.
+        """
+        os.makedirs(directory, exist_ok=True)
+        names = [_DATE_COLUMN] + list(self.arrays)
+        arrays = [self.timestamps.view(f'datetime64[{self.unit}]')] + list(self.arrays.values())
+        for i, values in enumerate(arrays):
+            np.save(os.path.join(directory, f'col_{i}.npy'), values)
+        with open(os.path.join(directory, _META_FILE), 'w') as f:
+            json.dump({'columns': names, 'dtypes': [str(values.dtype) for values in arrays],
+                       'rows': len(self), 'tz': self.tz}, f)
+
+    @property
+    def columns(self):
+        """Column names, DATE_TIME first, like DataFrame.columns."""
+        return [_DATE_COLUMN] + list(self.arrays)
+
+    @property
+    def date_time(self):
+        """The timestamps as datetime64 values (a tz-aware DatetimeArray when tz is set)."""
+        stamps = self.timestamps.view(f'datetime64[{self.unit}]')
+        if self.tz is None:
+            return stamps
+        return pd.DatetimeIndex(stamps).tz_localize('UTC').tz_convert(self.tz).array
+
+    @property
+    def bar_index(self):
+        """BarIndex of the timestamps (cadence, gaps, duplicates), built on first use."""
+        if self._bar_index is None:
+            self._bar_index = BarIndex(self.timestamps, self.unit)
+        return self._bar_index
+
+    @property
+    def nbytes(self):
+        """Total size of the arrays in bytes."""
+        return self.timestamps.nbytes + sum(values.nbytes for values in self.arrays.values())
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, name):
+        if name == _DATE_COLUMN:
+            return self.date_time
+        return self.arrays[name]
+
+    def to_frame(self, columns=None):
+        """
+        Materialize a DataFrame view of the series.
+
+        Args:
+            columns (list, optional): Columns to include besides DATE_TIME (default: all).
+
+        Returns:
+            pd.DataFrame: Frame with DATE_TIME first.
+        """
+        names = list(self.arrays) if columns is None else [name for name in columns if name != _DATE_COLUMN]
+        data = {_DATE_COLUMN: self.date_time}
+        data.update({name: self.arrays[name] for name in names})
+        return pd.DataFrame(data, copy=False)
+
+
+def column_values(data, name):
+    """
+    Return the values of a column of a DataFrame or PriceSeries without copying them.
+
+    Args:
+        data (pd.DataFrame or PriceSeries): Plugin input.
+        name (str): Column name.
+
+    Returns:
+        The DATE_TIME values as an array-like, any other column as a NumPy array.
+    """
+    if isinstance(data, PriceSeries):
+        return data[name]
+    if name == _DATE_COLUMN:
+        return data[name].array
+    return data[name].to_numpy()
@@ -0,0 +1,190 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from app.config import DEFAULT_VALUES
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Responses after which a non-idempotent request (POST) was certainly not processed
+POST_RETRY_STATUSES = (429, 503)
+# Methods that can be sent again without side effects
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE')
+
+# Clients shared by every remote call of the process, one per credentials and settings
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+class RemoteClient:
+    """
+    HTTP client of the remote configuration and logging server.
+
+    All requests go through one pooled requests.Session, so connections are reused instead of
+    opened per call, and every request has a timeout and bounded retries with exponential
+    backoff. Non-idempotent requests (POST) are only retried when the server can not have
+    processed them, so a log entry is never stored twice.
+
+    Log entries are submitted to a background queue, posted by a worker thread while the
+    pipeline keeps running; flush() waits until the queue is empty.
+    """
+
+    def __init__(self, username=None, password=None, timeout=10.0, retries=3, backoff=0.5, pool_size=4):
+        """
+        Args:
+            username (str, optional): Basic-auth user name (used together with password).
+            password (str, optional): Basic-auth password.
+            timeout (float): Connect and read timeout of each attempt, in seconds.
+            retries (int): Attempts after the first one on connection errors, timeouts and
+                RETRY_STATUSES responses (for POST: connection errors and POST_RETRY_STATUSES only).
+            backoff (float): Delay before the first retry, doubled for each following one, in seconds.
+            pool_size (int): Connections kept open per host.
+        """
+        self.timeout = timeout
+        self.retries = max(int(retries), 0)
+        self.backoff = backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if username and password:
+            self.session.auth = (username, password)
+        self.sent = 0
+        self.failed = 0
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        """
+        Send a request, retrying transient failures.
+
+        Idempotent methods are retried after connection errors, timeouts and RETRY_STATUSES
+        responses. Other methods may already have been processed after a read timeout or a
+        server error, so they are only retried when the connection failed or the server
+        answered with one of POST_RETRY_STATUSES.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Target URL.
+            **kwargs: Arguments of requests.Session.request (data, json, params, ...).
+
+        Returns:
+            requests.Response: The successful response.
+
+        Raises:
+            requests.RequestException: If the last attempt fails or the server rejects the request.
+        """
+        if method.upper() in IDEMPOTENT_METHODS:
+            retry_statuses, retry_errors = RETRY_STATUSES, (requests.ConnectionError, requests.Timeout)
+        else:
+            # ConnectTimeout is a ConnectionError; a ReadTimeout means the request was sent
+            retry_statuses, retry_errors = POST_RETRY_STATUSES, (requests.ConnectionError,)
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+                if response.status_code not in retry_statuses or attempt == self.retries:
+                    response.raise_for_status()
+                    return response
+                reason = f"HTTP {response.status_code}"
+            except retry_errors as e:
+                if attempt == self.retries:
+                    raise
+                reason = type(e).__name__
+            delay = self.backoff * 2 ** attempt
+            logger.warning("%s %s failed (%s), retrying in %.2fs (%d/%d)", method, url, reason, delay,
+                           attempt + 1, self.retries)
+            time.sleep(delay)
+
+    def submit(self, url, data):
+        """
+        Queue a POST request, sent in the background by the worker thread.
+
+        Args:
+            url (str): Target URL.
+            data (dict): Form data of the request.
+        """
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._work, name='remote-log', daemon=True)
+                self._worker.start()
+        self._queue.put((url, data))
+
+    def _work(self):
+        """Post the queued requests until the stop sentinel (None) is read."""
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                url, data = item
+                self.request('POST', url, data=data)
+                self.sent += 1
+            except requests.RequestException as e:
+                self.failed += 1
+                logger.error("Failed to log remote information: %s", e)
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Wait until every queued request has been sent or has failed."""
+        self._queue.join()
+
+    def close(self):
+        """Flush the queue, stop the worker thread and close the pooled connections."""
+        with self._lock:
+            worker, self._worker = self._worker, None
+        if worker is not None and worker.is_alive():
+            self._queue.put(None)
+            worker.join()
+        self.session.close()
+
+
+def get_client(config=None, username=None, password=None):
+    """
+    Return the shared client for these credentials and the remote settings of the configuration.
+
+    Args:
+        config (dict, optional): Configuration with remote_timeout, remote_retries and
+            remote_backoff (defaults from DEFAULT_VALUES).
+        username (str, optional): Basic-auth user name.
+        password (str, optional): Basic-auth password.
+
+    Returns:
+        RemoteClient: The client, created on first use.
+    """
+    settings = DEFAULT_VALUES.copy()
+    settings.update(config or {})
+    key = (username, password, settings['remote_timeout'], settings['remote_retries'], settings['remote_backoff'])
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = RemoteClient(username, password, timeout=settings['remote_timeout'],
+                                  retries=settings['remote_retries'], backoff=settings['remote_backoff'])
+            _CLIENTS[key] = client
+    return client
+
+
+def flush_clients():
+    """Wait until the queued requests of every shared client are sent."""
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+    for client in clients:
+        client.flush()
+
+
+def close_clients():
+    """Flush and close every shared client (also run at interpreter exit)."""
+    with _CLIENTS_LOCK:
+        clients = list(_CLIENTS.values())
+        _CLIENTS.clear()
+    for client in clients:
+        client.close()
+
+
+atexit.register(close_clients)
@@ -0,0 +1,203 @@
+import numpy as np
+
+# Statistics supported by rolling_stats and the highest power sum each one needs
+_STAT_POWERS = {
+    'count': 0,
+    'mean': 1,
+    'var': 2,
+    'std': 2,
+    'skew': 3,
+    'min': 0,
+    'max': 0
+}
+
+
+class _BlockSums:
+    """
+    Running power sums of a series, restarted at every block and centered on the block mean.
+
+    Restarting the sums at each block (at least as long as the longest window) and centering
+    them on a local reference bounds the rounding error of any window sum by the size of one
+    block, however long and drifting the series is. A window lies in one block or spans two;
+    for the second case the sums of each block are also kept centered on the previous block's
+    mean, so every window is read with slices only, whatever its length.
+    """
+
+    def __init__(self, values, block_size, max_power, first_power=0):
+        n_blocks = -(-len(values) // block_size)
+        padded = np.full(n_blocks * block_size, np.nan)
+        padded[:len(values)] = values
+        blocks = padded.reshape(n_blocks, block_size)
+        valid = ~np.isnan(blocks)
+        counts = valid.sum(axis=1)
+        centers = np.where(valid, blocks, 0.0).sum(axis=1) / np.maximum(counts, 1)
+        previous_centers = np.concatenate([centers[:1], centers[:-1]])
+
+        self.block = np.repeat(np.arange(n_blocks), block_size)
+        self.center = np.repeat(centers, block_size)
+        self.inclusive = []  # Sum up to and including each row, centered on its block
+        self.exclusive = []  # Same, excluding the row itself
+        self.total = []  # Total of the row's block, centered on it
+        self.carried = []  # Inclusive sum centered on the previous block's center
+        own = np.where(valid, blocks - centers[:, None], 0.0)
+        shifted = np.where(valid, blocks - previous_centers[:, None], 0.0)
+        own_term = valid.astype(np.float64)
+        shifted_term = own_term
+        for p in range(max_power + 1):
+            if p > 0:
+                own_term = own_term * own
+                shifted_term = shifted_term * shifted
+            if p < first_power:
+                continue
+            inclusive = np.cumsum(own_term, axis=1)
+            self.inclusive.append(inclusive.ravel())
+            self.exclusive.append((inclusive - own_term).ravel())
+            self.total.append(np.repeat(inclusive[:, -1], block_size))
+            self.carried.append(np.cumsum(shifted_term, axis=1).ravel())
+
+    def window_sums(self, window, n):
+        """
+        Power sums of every trailing window, centered on the mean of the window's first block.
+
+        Returns:
+            tuple: (centers, sums) for rows window - 1 to n - 1, with sums[i] the sum of
+                (x - center) ** (first_power + i) over each window.
+        """
+        starts = slice(0, n - window + 1)
+        ends = slice(window - 1, n)
+        split = self.block[ends] != self.block[starts]
+        sums = []
+        for inclusive, exclusive, total, carried in zip(self.inclusive, self.exclusive, self.total, self.carried):
+            window_sum = np.where(split, total[starts] + carried[ends], inclusive[ends])
+            sums.append(np.subtract(window_sum, exclusive[starts], out=window_sum))
+        return self.center[starts], sums
+
+
+def _window_extreme(values, window, use_max):
+    """Trailing rolling max (or min) in O(n) with block prefix/suffix scans (van Herk/Gil-Werman)."""
+    n = len(values)
+    n_blocks = -(-n // window)
+    fill = -np.inf if use_max else np.inf
+    padded = np.full(n_blocks * window, fill)
+    padded[:n] = np.where(np.isnan(values), fill, values)
+    blocks = padded.reshape(n_blocks, window)
+    accumulate = np.maximum.accumulate if use_max else np.minimum.accumulate
+    prefix = accumulate(blocks, axis=1).ravel()
+    suffix = accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    # The window ending at j is the suffix of its first block plus the prefix of its last one
+    combine = np.maximum if use_max else np.minimum
+    return combine(suffix[:n - window + 1], prefix[window - 1:n])
+
+
+def rolling_stats(values, windows, stats=('mean', 'std'), min_periods=None, ddof=1):
+    """
+    Compute several trailing rolling statistics over several window lengths in one pass.
+
+    The power sums needed by the moments are accumulated once for all windows and statistics,
+    then each window reads them with a few vectorized slice operations. The sums are kept per
+    block and centered locally, so the results stay accurate on long, drifting price series
+    (the usual running-sum shortcut loses most digits of a short-window variance). min and max
+    use block prefix/suffix scans, also O(n) per window. Results follow pandas
+    ``Series.rolling(window).<stat>()``: the value at row i covers rows i - window + 1 to i,
+    NaN values are skipped, and rows with fewer than min_periods valid values are NaN.
+
+    Args:
+        values (array-like): 1-D series (e.g. the CLOSE column).
+        windows (list of int): Window lengths, in ticks.
+        stats (iterable of str): Statistics among 'count', 'mean', 'var', 'std', 'skew',
+            'min' and 'max'.
+        min_periods (int, optional): Minimum number of valid values for a result (defaults to
+            the window length, like pandas).
+        ddof (int): Delta degrees of freedom of var and std.
+
+    Returns:
+        dict: Mapping of (stat, window) to an array with the length of the series.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    windows = [int(w) for w in windows]
+    stats = list(stats)
+    unknown = [stat for stat in stats if stat not in _STAT_POWERS]
+    if unknown:
+        raise ValueError(f"Unsupported rolling statistics: {unknown}")
+    if values.ndim != 1:
+        raise ValueError("rolling_stats expects a 1-D array of values.")
+    if any(w < 1 for w in windows):
+        raise ValueError("Rolling windows must be positive.")
+
+    n = len(values)
+    results = {(stat, w): np.full(n, np.nan) for stat in stats for w in windows}
+    if n == 0 or not windows:
+        return results
+
+    block_size = max(windows)
+    max_power = max(_STAT_POWERS[stat] for stat in stats)
+    # Without NaN every full window holds exactly `window` values: no need to count them
+    has_nan = bool(np.isnan(values).any())
+    first_power = 0 if has_nan else 1
+    block_sums = _BlockSums(values, block_size, max_power, first_power)
+
+    for window in windows:
+        periods = window if min_periods is None else max(min(int(min_periods), window), 1)
+        # Rows before window - 1 only see a partial window (from row 0, inside block 0); they
+        # are needed only when min_periods is lower than the window
+        if periods < window:
+            head = slice(periods - 1, min(window - 1, n))
+            sums = [inclusive[head] for inclusive in block_sums.inclusive]
+            if not has_nan:
+                sums.insert(0, np.arange(head.start + 1, head.stop + 1, dtype=np.float64))
+            _window_results(results, window, head, block_sums.center[head], sums, values, stats, periods, ddof)
+        if n >= window:
+            centers, sums = block_sums.window_sums(window, n)
+            if not has_nan:
+                sums.insert(0, float(window))
+            _window_results(results, window, slice(window - 1, n), centers, sums, values, stats, periods, ddof)
+    return results
+
+
+def _window_results(results, window, rows, centers, sums, values, stats, periods, ddof):
+    """
+    Turn the window power sums of the given rows into the requested statistics.
+
+    sums[0] (the count of valid values) may be a scalar when every window is full.
+    """
+    count = sums[0]
+    max_power = len(sums) - 1
+    with np.errstate(invalid='ignore', divide='ignore'):
+        enough = count >= periods
+        if max_power >= 1:
+            offset = sums[1] / count  # Window mean minus the reference center
+        if max_power >= 2:
+            m2 = np.maximum(sums[2] - sums[1] * offset, 0.0)  # Sum of squared deviations
+        if max_power >= 3:
+            m3 = sums[3] - 3.0 * offset * sums[2] + 2.0 * sums[1] * offset ** 2
+
+        for stat in stats:
+            if stat == 'count':
+                result = count  # Like pandas, counted over every full window
+            elif stat == 'mean':
+                result = _masked(centers + offset, enough)
+            elif stat in ('var', 'std'):
+                result = _masked(m2 / (count - ddof), enough & (count > ddof))
+                if stat == 'std':
+                    result = np.sqrt(result, out=result)
+            elif stat == 'skew':
+                variance = m2 / count
+                skew = (np.sqrt(count * (count - 1.0)) * (m3 / count)) / ((count - 2.0) * variance ** 1.5)
+                # Near-constant windows have no defined skew (same threshold as pandas)
+                result = _masked(skew, enough & (count >= 3) & (variance > 1e-14))
+            else:
+                use_max = stat == 'max'
+                if rows.stop <= window - 1:
+                    accumulate = np.fmax.accumulate if use_max else np.fmin.accumulate
+                    extreme = accumulate(values[:rows.stop])[rows]
+                else:
+                    extreme = _window_extreme(values, window, use_max)
+                result = _masked(extreme, enough)
+            results[(stat, window)][rows] = result
+
+
+def _masked(result, condition):
+    """Set result to NaN where condition is False, skipping the pass when it always holds."""
+    if np.ndim(condition) == 0:
+        return result if condition else np.full_like(result, np.nan)
+    return np.where(condition, result, np.nan)
@@ -0,0 +1,214 @@
+import itertools
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from app.config import DEFAULT_VALUES
+from app.data_processor import input_schema, input_source, plugin_input, run_processing_pipeline
+from app.data_handler import DataSource
+from app.horizon import HorizonCache
+from app.plugin_loader import load_plugin
+from app.price_series import column_values
+
+logger = logging.getLogger(__name__)
+
+# State shared with the worker processes. It is set before the pool is created so that, with the
+# fork start method, workers read the parsed inputs and the shared horizon columns from the
+# parent's memory instead of receiving a copy.
+_SWEEP_STATE = {}
+
+# Pipeline keys that differ per combination without changing what is computed
+_OUTPUT_PATH_KEYS = ('hourly_output_file', 'daily_output_file')
+
+
+def parse_grid(grid):
+    """
+    Parse a parameter grid given as a dict, a JSON object string or a path to a JSON file.
+
+    Args:
+        grid (dict or str): Mapping of plugin parameter name to a list of values (a scalar is
+            treated as a single value).
+
+    Returns:
+        dict: Mapping of parameter name to a list of values.
+    """
+    if isinstance(grid, str):
+        if os.path.exists(grid):
+            with open(grid, 'r') as f:
+                grid = json.load(f)
+        else:
+            grid = json.loads(grid)
+    return {k: v if isinstance(v, list) else [v] for k, v in grid.items()}
+
+
+def expand_grid(grid):
+    """Return every parameter combination of the grid, in grid order."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def output_paths(template, plugin_name, combo):
+    """
+    Format the hourly and daily output paths of one combination.
+
+    The template may use {plugin}, {kind} (hourly/daily), {params} (all parameters as
+    name-value pairs) and any parameter name, e.g. './sweep/{plugin}_th{time_horizon}_{kind}.csv'.
+    """
+    params = '_'.join(f"{k}-{v}" for k, v in combo.items())
+    return tuple(template.format(plugin=plugin_name, kind=kind, params=params, **combo)
+                 for kind in ('hourly', 'daily'))
+
+
+def _run_combo(index):
+    """Process one parameter combination using the shared sweep state."""
+    state = _SWEEP_STATE
+    combo_config = state['configs'][index]
+    report = {
+        'params': state['combos'][index],
+        'hourly_output_file': combo_config['hourly_output_file'],
+        'daily_output_file': combo_config['daily_output_file']
+    }
+    start = time.perf_counter()
+    try:
+        plugin = state['plugin_class']()
+        plugin.set_params(**combo_config)
+        if state['horizon_caches'][index] is not None:
+            plugin.horizon_cache = state['horizon_caches'][index]
+        result = run_processing_pipeline(combo_config, plugin, DataSource.from_frame(state['inputs'][index]))
+        report['status'] = 'ok'
+        report['rows_out'] = result['rows_out']
+    except Exception as e:
+        report['status'] = 'failed'
+        report['error'] = f"{type(e).__name__}: {e}"
+    report['wall_seconds'] = round(time.perf_counter() - start, 6)
+    return report
+
+
+def _copy_outputs(report, combo_config):
+    """Write the outputs of a duplicate combination by copying the ones already computed."""
+    for key in ('hourly_output_file', 'daily_output_file'):
+        if report[key] != combo_config[key]:
+            with open(report[key], 'rb') as src, open(combo_config[key], 'wb') as dst:
+                dst.write(src.read())
+
+
+def run_sweep(config):
+    """
+    Run the plugin once per combination of config['sweep_grid'] over an input parsed only once.
+
+    Combinations that resolve to the same effective plugin parameters and pipeline settings
+    (every known configuration key but the output paths) are computed once and their outputs
+    copied; grid keys that are neither are ignored. The input is parsed once per distinct
+    input schema (date format, dtypes or precision, bar fill). For plugins exposing
+    horizon_offsets(), every shifted target column needed by the grid is computed once per
+    input in a shared HorizonCache before the workers start.
+
+    Args:
+        config (dict): Sweep configuration (sweep_grid, sweep_workers, sweep_output_template,
+            sweep_summary_file and the usual pipeline keys).
+
+    Returns:
+        dict: Sweep summary with one report per combination and one input load report per
+            distinct input.
+    """
+    # Every combination would read and advance the same incremental state
+    if config.get('incremental_state_file'):
+        raise ValueError("incremental_state_file is not supported in sweep mode; "
+                         "run each combination separately to process an input incrementally.")
+
+    grid = parse_grid(config['sweep_grid'])
+    combos = expand_grid(grid)
+    plugin_name = config['plugin']
+    plugin_class, _ = load_plugin('trading_signal.plugins', plugin_name)
+
+    base_config = {k: v for k, v in config.items() if not k.startswith('sweep_')}
+    base_config['chunk_size'] = None
+    configs = []
+    plugins = []
+    for combo in combos:
+        combo_config = base_config.copy()
+        combo_config.update(combo)
+        combo_config['hourly_output_file'], combo_config['daily_output_file'] = \
+            output_paths(config['sweep_output_template'], plugin_name, combo)
+        configs.append(combo_config)
+        plugin = plugin_class()
+        plugin.set_params(**combo_config)
+        plugins.append(plugin)
+
+    # Combinations with identical effective plugin parameters and pipeline settings produce identical outputs
+    unique = {}
+    duplicate_of = []
+    for i, (plugin, combo_config) in enumerate(zip(plugins, configs)):
+        pipeline = {k: v for k, v in combo_config.items() if k in DEFAULT_VALUES and k not in _OUTPUT_PATH_KEYS}
+        key = json.dumps({'plugin': plugin.params, 'pipeline': pipeline}, sort_keys=True, default=str)
+        duplicate_of.append(unique.setdefault(key, i))
+    to_run = sorted(set(duplicate_of))
+
+    # One parsed input, and one shared horizon cache, per distinct input schema
+    groups = {}
+    for i in to_run:
+        key = json.dumps([input_schema(configs[i]), configs[i].get('bar_fill')], sort_keys=True, default=str)
+        groups.setdefault(key, []).append(i)
+    sources = []
+    inputs = [None] * len(combos)
+    horizon_caches = [None] * len(combos)
+    for indices in groups.values():
+        source = input_source(configs[indices[0]])
+        data = plugin_input(plugins[indices[0]], source, configs[indices[0]].get('bar_fill'))
+        sources.append(source)
+        horizon_cache = None
+        if hasattr(plugins[0], 'horizon_offsets') and 'target_column' in plugins[0].params:
+            targets = {plugins[i].params['target_column'] for i in indices}
+            if len(targets) == 1:
+                target_column = targets.pop()
+                horizon_cache = HorizonCache(column_values(data, target_column), target_column)
+                horizon_cache.prefetch(set().union(*(plugins[i].horizon_offsets() for i in indices)))
+        for i in indices:
+            inputs[i] = data
+            horizon_caches[i] = horizon_cache
+
+    _SWEEP_STATE.clear()
+    _SWEEP_STATE.update({'inputs': inputs, 'configs': configs, 'combos': combos, 'plugin_class': plugin_class,
+                         'horizon_caches': horizon_caches})
+
+    workers = int(config.get('sweep_workers') or os.cpu_count() or 1)
+    workers = max(1, min(workers, len(to_run)))
+    logger.info("Sweeping %d combinations (%d distinct) on %d worker(s)...", len(combos), len(to_run), workers)
+
+    start = time.perf_counter()
+    if workers == 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        results = dict(zip(to_run, map(_run_combo, to_run)))
+    else:
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            results = dict(zip(to_run, executor.map(_run_combo, to_run)))
+
+    reports = []
+    for i, combo in enumerate(combos):
+        source_index = duplicate_of[i]
+        report = dict(results[source_index])
+        if source_index != i:
+            if report['status'] == 'ok':
+                _copy_outputs(report, configs[i])
+            report.update({'params': combo, 'duplicate_of': source_index,
+                           'hourly_output_file': configs[i]['hourly_output_file'],
+                           'daily_output_file': configs[i]['daily_output_file']})
+        reports.append(report)
+    _SWEEP_STATE.clear()
+
+    summary = {
+        'input_file': config['input_file'],
+        'plugin': plugin_name,
+        'grid': grid,
+        'workers': workers,
+        'input_load': [source.stats() for source in sources],
+        'total_wall_seconds': round(time.perf_counter() - start, 6),
+        'combinations': reports
+    }
+    if config.get('sweep_summary_file'):
+        with open(config['sweep_summary_file'], 'w') as f:
+            json.dump(summary, f, indent=4, default=str)
+        logger.info("Sweep summary written to %s", config['sweep_summary_file'])
+    return summary
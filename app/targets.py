@@ -0,0 +1,273 @@
+import numpy as np
+import pandas as pd
+from app.horizon import horizon_matrix, shifted_matrix
+from app.instrumentation import span
+from app.price_series import column_values
+from app.rolling import rolling_stats
+from app.trading_calendar import take_rows, trading_day_index
+
+
+def day_index(date_time):
+    """
+    Map every row to the position of its calendar day among the sorted distinct days.
+
+    Days are integer codes (datetime64 floored to the day), so no Python date objects are
+    built. Rows without a valid timestamp get -1.
+
+    Args:
+        date_time (array-like): DATE_TIME values.
+
+    Returns:
+        np.ndarray: Day position per row (int64).
+    """
+    timestamps = pd.to_datetime(pd.Series(date_time, copy=False))
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_localize(None)  # Local calendar days, like .dt.date
+    valid = timestamps.notna().to_numpy()
+    day_codes = timestamps.to_numpy().astype('datetime64[D]').astype(np.int64)
+    row_day = np.full(len(day_codes), -1, dtype=np.int64)
+    _, row_day[valid] = np.unique(day_codes[valid], return_inverse=True)
+    return row_day
+
+
+def daily_aggregate(values, row_day, agg):
+    """
+    Aggregate a column per day with the NaN-skipping semantics of groupby().agg().
+
+    Args:
+        values (np.ndarray): Column values per row.
+        row_day (np.ndarray): Day position per row, as returned by day_index.
+        agg (str): One of 'max', 'min', 'first' or 'last'.
+
+    Returns:
+        np.ndarray: One value per day (NaN where the day has no valid value).
+    """
+    # Stable sort keeps the original row order inside each day, as groupby does
+    order = np.argsort(row_day, kind='stable')
+    order = order[row_day[order] >= 0]
+    sorted_days = row_day[order]
+    sorted_values = values[order]
+    n_days = int(sorted_days[-1]) + 1 if len(sorted_days) else 0
+    if n_days == 0:
+        return np.empty(0, dtype=values.dtype)
+    starts = np.searchsorted(sorted_days, np.arange(n_days))
+    if agg == 'max':
+        return np.fmax.reduceat(sorted_values, starts)
+    if agg == 'min':
+        return np.fmin.reduceat(sorted_values, starts)
+
+    is_valid = ~np.isnan(sorted_values)
+    positions = np.arange(len(sorted_values))
+    ends = np.append(starts[1:], len(sorted_values))
+    if agg == 'first':
+        picked = np.minimum.reduceat(np.where(is_valid, positions, len(sorted_values)), starts)
+        found = picked < ends
+    elif agg == 'last':
+        picked = np.maximum.reduceat(np.where(is_valid, positions, -1), starts)
+        found = picked >= starts
+    else:
+        raise ValueError(f"Unsupported daily aggregation: {agg}")
+    result = np.full(n_days, np.nan, dtype=sorted_values.dtype)
+    result[found] = sorted_values[picked[found]]
+    return result
+
+
+class Target:
+    """
+    A group of target columns computed from one input column, one per step (offset, number of
+    days or window length).
+
+    Names are a list, or a template formatted for every step with {column}, {n} (the step)
+    and {i} (its 1-based position), e.g. 'Prediction_h_{i}' or '{column}_t+{n}'. Targets
+    declared with output=False only restrict the rows kept (e.g. the current value must exist).
+    """
+
+    def __init__(self, column, steps, names=None, output=True):
+        self.column = column
+        self.steps = [int(step) for step in steps]
+        self.output = output
+        if names is None or isinstance(names, str):
+            template = names or '{column}_{n}'
+            names = [template.format(column=column, n=step, i=i) for i, step in enumerate(self.steps, 1)]
+        if len(names) != len(self.steps):
+            raise ValueError(f"{type(self).__name__} of '{column}' has {len(self.steps)} steps but {len(names)} names.")
+        self.names = list(names)
+
+
+class Shift(Target):
+    """Values `offset` ticks ahead of each row, like Series.shift(-offset); offset 0 is the row's own value."""
+
+    def __init__(self, column, offsets, names=None, output=True):
+        super().__init__(column, offsets, names, output)
+        if any(step < 0 for step in self.steps):
+            raise ValueError("Shift offsets must be non-negative.")
+
+
+class DailyAggregate(Target):
+    """
+    Aggregate ('max', 'min', 'first' or 'last') of the calendar day `days` ahead of each row's
+    day, counting the days present in the data; day 0 is the row's own day.
+    """
+
+    def __init__(self, column, agg, days, names=None, output=True):
+        super().__init__(column, days, names, output)
+        self.agg = agg
+
+
+class TradingDayShift(Target):
+    """Value N trading days ahead of each row, resolved from the timestamps (see trading_day_index)."""
+
+    def __init__(self, column, days, names=None, session_start='00:00', session_timezone=None,
+                 data_timezone='UTC', output=True):
+        super().__init__(column, days, names, output)
+        self.session = (session_start, session_timezone, data_timezone)
+
+
+class Rolling(Target):
+    """Trailing rolling statistic of rolling_stats (e.g. 'std') over each window, in ticks."""
+
+    def __init__(self, column, stat, windows, names=None, output=True):
+        super().__init__(column, windows, names, output)
+        self.stat = stat
+
+
+def _group(targets, kind, key):
+    """Targets of one kind grouped by key, in declaration order."""
+    groups = {}
+    for target in targets:
+        if isinstance(target, kind):
+            groups.setdefault(key(target), []).append(target)
+    return groups
+
+
+def _union(group):
+    return sorted({step for target in group for step in target.steps})
+
+
+def build_targets(data, targets, index='reset', horizon_cache=None):
+    """
+    Compute declared targets and return them as a frame with DATE_TIME first, one row per input
+    row that has every target (output or not) and a valid DATE_TIME.
+
+    Every lag, daily aggregate, trading-day lookup and rolling window is computed once for
+    all the targets that need it. Rows that cannot have every target (the last max-offset
+    rows, the first longest-window rows) are cut with a slice computed from the declarations,
+    and the row mask only scans the blocks whose source column holds NaN values.
+
+    Args:
+        data (pd.DataFrame or PriceSeries): Input with a DATE_TIME column.
+        targets (list of Target): Target declarations, in output column order.
+        index (str): 'reset' for a 0-based index, or 'rows' to keep the input row positions.
+        horizon_cache (HorizonCache, optional): Shared shifted columns of one input column,
+            used by the Shift targets of that column.
+
+    Returns:
+        pd.DataFrame: DATE_TIME followed by the output targets.
+    """
+    if index not in ('reset', 'rows'):
+        raise ValueError(f"Unsupported index '{index}', expected 'reset' or 'rows'.")
+    for target in targets:
+        if target.column not in data.columns:
+            raise ValueError(f"[ERROR] Column '{target.column}' is missing in the input data!")
+
+    n_rows = len(data)
+    date_time = column_values(data, 'DATE_TIME')
+    values = {}
+    has_nan = {}
+    for target in targets:
+        if target.column not in values:
+            column = column_values(data, target.column)
+            if not np.issubdtype(column.dtype, np.floating):
+                column = column.astype(np.float64)
+            values[target.column] = column
+            has_nan[target.column] = bool(np.isnan(column).any())
+
+    # Valid-range slice: later rows miss a shifted value, earlier rows a full rolling window
+    stop = n_rows - max((max(t.steps) for t in targets if isinstance(t, Shift) and t.steps), default=0)
+    start = max((max(t.steps) - 1 for t in targets if isinstance(t, Rolling) and t.steps), default=0)
+    stop = max(stop, 0)
+    start = min(start, stop)
+    rows = slice(start, stop)
+
+    blocks = {}  # Target -> (values of the kept range, row validity or None when all valid)
+
+    with span('shift_targets', rows=stop - start):
+        for column, group in _group(targets, Shift, lambda t: t.column).items():
+            offsets = _union(group)
+            if horizon_cache is not None and horizon_cache.matches(column, n_rows):
+                matrix = horizon_cache.matrix(offsets)[rows]
+            else:
+                matrix = horizon_matrix(values[column][start:stop + max(offsets)], offsets)
+            for target in group:
+                block = matrix[:, [offsets.index(step) for step in target.steps]]
+                blocks[target] = (block, ~np.isnan(block).any(axis=1) if has_nan[column] else None)
+
+    trading_groups = _group(targets, TradingDayShift, lambda t: t.session)
+    if trading_groups:
+        with span('trading_day_targets', rows=stop - start):
+            for session, group in trading_groups.items():
+                days = _union(group)
+                day_rows = trading_day_index(date_time, days, *session)[rows]
+                for target in group:
+                    positions = day_rows[:, [days.index(step) for step in target.steps]]
+                    block = take_rows(values[target.column], positions)
+                    if has_nan[target.column]:
+                        blocks[target] = (block, ~np.isnan(block).any(axis=1))
+                    else:
+                        blocks[target] = (block, (positions >= 0).all(axis=1))
+
+    daily_groups = _group(targets, DailyAggregate, lambda t: (t.column, t.agg))
+    if daily_groups:
+        with span('daily_targets', rows=stop - start):
+            row_day = day_index(date_time)
+            row_day_kept = row_day[rows]
+            for (column, agg), group in daily_groups.items():
+                days = _union(group)
+                daily_values = daily_aggregate(values[column], row_day, agg)
+                shifted = shifted_matrix(daily_values, days)
+                for target in group:
+                    per_day = shifted[:, [days.index(step) for step in target.steps]]
+                    if len(per_day) == 0:
+                        blocks[target] = (np.full((stop - start, len(target.steps)), np.nan, dtype=per_day.dtype),
+                                          np.zeros(stop - start, dtype=bool))
+                        continue
+                    # Validity is decided per day, then gathered per row
+                    day_valid = ~np.isnan(per_day).any(axis=1)
+                    block = per_day[np.maximum(row_day_kept, 0)]
+                    block[row_day_kept < 0] = np.nan
+                    blocks[target] = (block, day_valid[np.maximum(row_day_kept, 0)] & (row_day_kept >= 0))
+
+    rolling_groups = _group(targets, Rolling, lambda t: t.column)
+    if rolling_groups:
+        with span('rolling_targets', rows=n_rows):
+            for column, group in rolling_groups.items():
+                stats = sorted({target.stat for target in group})
+                results = rolling_stats(values[column], _union(group), stats=stats)
+                for target in group:
+                    block = np.column_stack([results[(target.stat, step)][rows] for step in target.steps])
+                    block = block.astype(values[column].dtype, copy=False)
+                    # Checked even without NaN inputs: a one-row window has no std
+                    blocks[target] = (block, ~np.isnan(block).any(axis=1))
+
+    with span('drop_nan', rows=stop - start) as drop_span:
+        mask = ~pd.isna(date_time[rows])
+        for block, valid in blocks.values():
+            if valid is not None:
+                mask &= valid
+        outputs = [target for target in targets if target.output]
+        block = np.column_stack([blocks[target][0] for target in outputs]) if outputs else \
+            np.empty((stop - start, 0))
+        names = [name for target in outputs for name in target.names]
+        if mask.all():
+            kept = np.arange(start, stop)
+            frame = pd.DataFrame(block, columns=names, copy=False)
+            dates = date_time[rows]
+        else:
+            kept = start + np.flatnonzero(mask)
+            frame = pd.DataFrame(block[mask], columns=names)
+            dates = date_time[rows][mask]
+        if index == 'rows':
+            frame.index = kept
+        frame.insert(0, 'DATE_TIME', dates)
+        drop_span.set(rows_out=len(frame))
+    return frame
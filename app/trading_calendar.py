@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+_DAY_NS = 86400 * 10 ** 9
+
+
+def _session_keys(date_time, session_start='00:00', session_timezone=None, data_timezone='UTC'):
+    """
+    Position of every timestamp on the session clock: local wall time minus the session start.
+
+    Returns:
+        tuple: (keys, valid) with keys the int64 nanoseconds since the epoch on the session clock
+            (so that floor(key / day) is the session day) and valid False for missing timestamps.
+    """
+    timestamps = pd.to_datetime(pd.Series(date_time, copy=False))
+    if session_timezone is not None:
+        if timestamps.dt.tz is None:
+            timestamps = timestamps.dt.tz_localize(data_timezone or 'UTC', ambiguous='NaT', nonexistent='NaT')
+        timestamps = timestamps.dt.tz_convert(session_timezone)
+    if timestamps.dt.tz is not None:
+        timestamps = timestamps.dt.tz_localize(None)  # Local wall time of the session time zone
+    valid = timestamps.notna().to_numpy()
+    keys = timestamps.to_numpy().astype('datetime64[ns]').view(np.int64)
+    return keys - _session_offset(session_start), valid
+
+
+def _session_offset(session_start):
+    """Session start time ('HH:MM' or 'HH:MM:SS') as nanoseconds after midnight."""
+    session_start = str(session_start)
+    if session_start.count(':') == 1:
+        session_start += ':00'
+    offset = pd.Timedelta(session_start).value
+    if not 0 <= offset < _DAY_NS:
+        raise ValueError(f"session_start must be a time of day, not '{session_start}'.")
+    return offset
+
+
+def trading_day_index(date_time, days, session_start='00:00', session_timezone=None, data_timezone='UTC'):
+    """
+    Resolve, for every row, the row holding the value N trading days ahead.
+
+    Trading days are the sessions present in the data, so weekends, holidays and gaps are
+    skipped instead of being counted as ticks. A session starts every day at session_start in
+    session_timezone (e.g. '17:00' in 'America/New_York' for FX). The target of a row is the
+    last row at or before the same time into the session, N sessions later, or the first row of
+    that session when it has no row by then (so a stub session, like a single Sunday-evening
+    bar, does not drop the rows that target it); it is missing only past the last session.
+    Everything is done with one sort and a few searchsorted
+    calls, in O(n log n), whatever the order of the rows.
+
+    Args:
+        date_time (array-like): DATE_TIME values (datetimes or parseable strings).
+        days (list of int): Positive numbers of trading days ahead, in output column order.
+        session_start (str): Session start time, e.g. '00:00' (calendar days) or '17:00'.
+        session_timezone (str, optional): Time zone of the session clock (None uses the
+            timestamps as they are).
+        data_timezone (str): Time zone of naive timestamps when session_timezone is set.
+
+    Returns:
+        np.ndarray: Row positions of shape (len(date_time), len(days)), -1 where unresolved.
+    """
+    keys, valid = _session_keys(date_time, session_start, session_timezone, data_timezone)
+    n = len(keys)
+    result = np.full((n, len(days)), -1, dtype=np.int64)
+    rows = np.flatnonzero(valid)
+    if len(rows) == 0:
+        return result
+
+    order = rows[np.argsort(keys[rows], kind='stable')]
+    sorted_keys = keys[order]
+    sorted_days = sorted_keys // _DAY_NS
+    sessions = np.unique(sorted_days)
+    session_rank = np.searchsorted(sessions, sorted_days)
+    time_in_session = sorted_keys - sorted_days * _DAY_NS
+
+    for j, ahead in enumerate(days):
+        target_rank = session_rank + int(ahead)
+        resolvable = target_rank < len(sessions)
+        target_day = sessions[np.minimum(target_rank, len(sessions) - 1)]
+        target = np.searchsorted(sorted_keys, target_day * _DAY_NS + time_in_session, side='right') - 1
+        # A session without a row by then (e.g. a lone Sunday-evening bar) resolves to its first
+        # row, the nearest one, instead of leaving the row without a target
+        too_early = (target < 0) | (sorted_days[np.maximum(target, 0)] != target_day)
+        target[too_early] = np.searchsorted(sorted_days, target_day[too_early], side='left')
+        result[order[resolvable], j] = order[target[resolvable]]
+    return result
+
+
+def take_rows(values, index):
+    """
+    Gather values at row positions, with NaN where the position is -1.
+
+    Args:
+        values (np.ndarray): 1-D series.
+        index (np.ndarray): Row positions, as returned by trading_day_index.
+
+    Returns:
+        np.ndarray: Gathered values with the shape of index and a floating dtype.
+    """
+    values = np.asarray(values)
+    dtype = np.result_type(values.dtype, np.float32)
+    gathered = values.astype(dtype, copy=False)[np.maximum(index, 0)]
+    gathered[index < 0] = np.nan
+    return gathered
@@ -6,10 +6,31 @@
     Read more about conftest.py under:
     https://pytest.org/latest/plugins.html
 """
-# import pytest
 import os
 import sys
+import pytest
 
 sys.path.insert(
     0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../trading-signal"))
 )
+
+
+@pytest.fixture
+def pipeline_config(tmp_path):
+    """
+    Factory of pipeline configurations: the defaults with the given input, outputs written to
+    tmp_path as <prefix>_hourly.csv and <prefix>_daily.csv, quiet mode and any overrides.
+    """
+    from app.config import DEFAULT_VALUES
+
+    def make_config(prefix='run', input_file='tests/data/base_d1.csv', **overrides):
+        config = DEFAULT_VALUES.copy()
+        config.update({
+            'input_file': str(input_file),
+            'hourly_output_file': str(tmp_path / f'{prefix}_hourly.csv'),
+            'daily_output_file': str(tmp_path / f'{prefix}_daily.csv'),
+            'quiet_mode': True
+        })
+        config.update(overrides)
+        return config
+    return make_config
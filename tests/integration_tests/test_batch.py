@@ -0,0 +1,58 @@
+import json
+from unittest.mock import patch
+from app import instrumentation
+from app.batch import run_batch
+from app.config import DEFAULT_VALUES
+from app.main import main
+
+
+def test_run_batch(tmp_path):
+    manifest = {
+        'defaults': {'quiet_mode': True},
+        'jobs': [
+            {'input_file': 'tests/data/base_d1.csv', 'plugin': 'default_plugin',
+             'params': {'time_horizon': 3},
+             'hourly_output_file': str(tmp_path / 'd1_hourly.csv'),
+             'daily_output_file': str(tmp_path / 'd1_daily.csv')},
+            {'input_file': 'tests/data/base_d3.csv', 'plugin': 'default_plugin',
+             'hourly_output_file': str(tmp_path / 'd3_hourly.csv'),
+             'daily_output_file': str(tmp_path / 'd3_daily.csv')},
+            {'input_file': 'tests/data/missing.csv', 'plugin': 'default_plugin',
+             'hourly_output_file': str(tmp_path / 'missing_hourly.csv'),
+             'daily_output_file': str(tmp_path / 'missing_daily.csv')}
+        ]
+    }
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text(json.dumps(manifest))
+    config = DEFAULT_VALUES.copy()
+    config.update({
+        'batch_manifest': str(manifest_path),
+        'batch_workers': 2,
+        'batch_summary_file': str(tmp_path / 'summary.json')
+    })
+    summary = run_batch(config)
+    assert summary['jobs_ok'] == 2
+    assert summary['jobs_failed'] == 1
+    first = summary['jobs'][0]
+    assert first['rows_in'] == 11346
+    assert first['rows_out'] == 11346 - 6 * 24
+    with open(tmp_path / 'd1_hourly.csv') as f:
+        assert f.readline().strip() == 'DATE_TIME,Prediction_h_1,Prediction_h_2,Prediction_h_3'
+    assert json.loads((tmp_path / 'summary.json').read_text())['jobs'][2]['status'] == 'failed'
+
+# Batch runs from the CLI stop the tracer and write the trace and the debug timings too
+def test_batch_cli_timings(tmp_path):
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text(json.dumps([{'input_file': 'tests/data/base_d1.csv', 'plugin': 'default_plugin',
+                                          'hourly_output_file': str(tmp_path / 'hourly.csv'),
+                                          'daily_output_file': str(tmp_path / 'daily.csv')}]))
+    argv = ['app.main', '--batch_manifest', str(manifest_path), '--batch_workers', '1',
+            '--batch_summary_file', str(tmp_path / 'summary.json'), '--trace_file', str(tmp_path / 'trace.json'),
+            '--debug_file', str(tmp_path / 'debug.json'), '--quiet_mode']
+    with patch('sys.argv', argv):
+        main()
+    assert instrumentation._ACTIVE_TRACER is None
+    assert json.loads((tmp_path / 'trace.json').read_text())['traceEvents']
+    debug_info = json.loads((tmp_path / 'debug.json').read_text())
+    assert any(entry['name'] == 'config_merge' for entry in debug_info['timings'])
+    assert debug_info['batch']['jobs_ok'] == 1
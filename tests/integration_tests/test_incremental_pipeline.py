@@ -0,0 +1,65 @@
+import json
+import pytest
+from app.data_processor import run_processing_pipeline
+from app.plugins.plugin_default import Plugin
+
+# Appending rows and running incrementally must give the same outputs as a full run
+def test_incremental_matches_full_run(tmp_path, pipeline_config):
+    with open('tests/data/base_d1.csv') as f:
+        lines = f.readlines()
+    growing = tmp_path / 'growing.csv'
+    growing.write_text(''.join(lines[:5000]))
+
+    plugin = Plugin()
+    plugin.set_params(time_horizon=3, ticks_per_day=24, days_horizon=2)
+    state_file = str(tmp_path / 'state.json')
+    incremental_config = pipeline_config('incremental', growing, incremental_state_file=state_file)
+    run_processing_pipeline(incremental_config, plugin)
+
+    # Append the rest of the rows in two batches, the last one ending in a partial line
+    with open(growing, 'a') as f:
+        f.write(''.join(lines[5000:9000]))
+    assert run_processing_pipeline(incremental_config, plugin) == {'rows_out': 4000, 'data': None}
+    with open(growing, 'a') as f:
+        f.write(''.join(lines[9000:]) + '2099-01-01 00:0')
+    run_processing_pipeline(incremental_config, plugin)
+    with open(state_file) as f:
+        state = json.load(f)
+    assert len(state['carry_lines']) == plugin.lookahead()
+    assert state['date_format'] == '%Y-%m-%d %H:%M:%S'
+    assert state['last_date_time'] == lines[-1].split(',')[0]
+
+    full_config = pipeline_config('full')
+    run_processing_pipeline(full_config, plugin)
+    for key in ('hourly_output_file', 'daily_output_file'):
+        with open(full_config[key], 'rb') as f_full, open(incremental_config[key], 'rb') as f_incremental:
+            assert f_full.read() == f_incremental.read()
+
+# Rows appended one at a time in the first days of a month keep their dates and times
+def test_incremental_early_month_rows(tmp_path, pipeline_config):
+    with open('tests/data/base_d1.csv') as f:
+        lines = f.readlines()
+    start = next(i for i, line in enumerate(lines) if line.startswith('2011-07-01 00:00'))
+    growing = tmp_path / 'growing.csv'
+    growing.write_text(''.join(lines[:start]))
+
+    plugin = Plugin()
+    plugin.set_params(time_horizon=2, ticks_per_day=2, days_horizon=1)
+    incremental_config = pipeline_config('incremental', growing, incremental_state_file=str(tmp_path / 'state.json'))
+    run_processing_pipeline(incremental_config, plugin)
+    for line in lines[start:start + 30]:
+        with open(growing, 'a') as f:
+            f.write(line)
+        run_processing_pipeline(incremental_config, plugin)
+
+    full_config = pipeline_config('full', growing)
+    run_processing_pipeline(full_config, plugin)
+    for key in ('hourly_output_file', 'daily_output_file'):
+        with open(full_config[key], 'rb') as f_full, open(incremental_config[key], 'rb') as f_incremental:
+            assert f_full.read() == f_incremental.read()
+
+# Appended rows can not regularize the bars already written, so bar_fill is rejected
+def test_incremental_rejects_bar_fill(tmp_path, pipeline_config):
+    config = pipeline_config('incremental', incremental_state_file=str(tmp_path / 'state.json'), bar_fill='ffill')
+    with pytest.raises(ValueError, match='bar_fill'):
+        run_processing_pipeline(config, Plugin())
@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+from app.data_processor import run_processing_pipeline
+from app.multi_plugin import parse_plugins, run_plugins
+from app.plugins.plugin_ls import Plugin as LSPlugin
+
+@pytest.fixture
+def plugins_config(tmp_path, pipeline_config):
+    def make_config(plugins, mode='fanout'):
+        return pipeline_config(input_file='tests/data/base_d2.csv', plugins=plugins, plugins_mode=mode,
+                               plugins_workers=2,
+                               plugins_output_template=str(tmp_path / '{index}_{plugin}_{kind}.csv'),
+                               plugins_summary_file=str(tmp_path / 'summary.json'))
+    return make_config
+
+# Plugin lists are given as names or as JSON objects with per-plugin parameters
+def test_parse_plugins():
+    assert parse_plugins('default_plugin, ls') == [{'plugin': 'default_plugin', 'params': {}},
+                                                   {'plugin': 'ls', 'params': {}}]
+    assert parse_plugins('[{"plugin": "ls", "params": {"time_horizon": 3}}]') == \
+        [{'plugin': 'ls', 'params': {'time_horizon': 3}}]
+    with pytest.raises(ValueError):
+        parse_plugins('')
+
+# Fan-out parses the input once and writes the same outputs as separate runs
+def test_fanout(tmp_path, pipeline_config, plugins_config):
+    summary = run_plugins(plugins_config('default_plugin,ls'))
+    assert [report['status'] for report in summary['plugins']] == ['ok', 'ok']
+    assert summary['input_load']['load_count'] == 1
+
+    single = pipeline_config('ls', 'tests/data/base_d2.csv')
+    plugin = LSPlugin()
+    plugin.set_params(**single)
+    run_processing_pipeline(single, plugin)
+    for kind in ('hourly', 'daily'):
+        pd.testing.assert_frame_equal(pd.read_csv(tmp_path / f'1_ls_{kind}.csv'),
+                                      pd.read_csv(tmp_path / f'ls_{kind}.csv'))
+    assert (tmp_path / '0_default_plugin_hourly.csv').exists()
+
+# In a chain each plugin processes the previous output, and a failure stops the chain
+def test_chain(tmp_path, plugins_config):
+    plugins = [{'plugin': 'default_plugin', 'params': {'time_horizon': 3}},
+               {'plugin': 'default_plugin', 'params': {'target_column': 'Prediction_h_1', 'time_horizon': 2,
+                                                       'days_horizon': 1}},
+               'ls', 'default_plugin']
+    summary = run_plugins(plugins_config(plugins, mode='chain'))
+    assert [report['status'] for report in summary['plugins']] == ['ok', 'ok', 'failed']
+
+    first = pd.read_csv(tmp_path / '0_default_plugin_hourly.csv')
+    second = pd.read_csv(tmp_path / '1_default_plugin_hourly.csv')
+    # Prediction_h_2 of the second plugin is Prediction_h_1 of the first, two rows ahead
+    assert second['Prediction_h_2'].iloc[0] == pytest.approx(first['Prediction_h_1'].iloc[2])
+
+# Incremental mode keeps one state per run, so it is rejected instead of shared by the plugins
+def test_incremental_rejected(tmp_path, plugins_config):
+    config = plugins_config('default_plugin,ls')
+    config['incremental_state_file'] = str(tmp_path / 'state.json')
+    with pytest.raises(ValueError):
+        run_plugins(config)
+    assert not (tmp_path / 'state.json').exists()
@@ -0,0 +1,61 @@
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+from app import data_processor
+from app.data_processor import run_processing_pipeline
+from app.plugins.plugin_default import Plugin
+
+# Concurrent writes (threads, or forked processes for large CSV outputs) match sequential writes
+@pytest.mark.parametrize('strategy', ['thread', 'process'])
+def test_parallel_writes_match_sequential(pipeline_config, monkeypatch, strategy):
+    if strategy == 'process':
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            pytest.skip('fork start method not available')
+        monkeypatch.setattr(data_processor, '_PROCESS_WRITE_MIN_ROWS', 0)
+        monkeypatch.setattr(data_processor.os, 'cpu_count', lambda: 2)
+    plugin = Plugin()
+    plugin.set_params(time_horizon=3, ticks_per_day=24, days_horizon=4)
+    sequential_config = pipeline_config('sequential', parallel_writes=False)
+    parallel_config = pipeline_config('parallel', parallel_writes=True)
+    run_processing_pipeline(sequential_config, plugin)
+    debug_info = {}
+    run_processing_pipeline(parallel_config, plugin, debug_info=debug_info)
+    assert debug_info['output_write']['strategy'] == strategy
+    assert debug_info['output_write']['write_seconds'] >= debug_info['output_write']['hourly_write_seconds']
+    for key in ('hourly_output_file', 'daily_output_file'):
+        with open(sequential_config[key], 'rb') as f_sequential, open(parallel_config[key], 'rb') as f_parallel:
+            assert f_sequential.read() == f_parallel.read()
+
+# Concurrent write phases of one process each write their own frame, and never fork from
+# a multithreaded process even when the outputs are large enough for it
+@pytest.mark.parametrize('large', [False, True])
+def test_concurrent_write_phases(pipeline_config, monkeypatch, large):
+    if large:
+        monkeypatch.setattr(data_processor, '_PROCESS_WRITE_MIN_ROWS', 0)
+        monkeypatch.setattr(data_processor.os, 'cpu_count', lambda: 2)
+    frames = [pd.DataFrame({'Prediction_h_1': [float(i)] * 50, 'Prediction_d_1': [float(-i)] * 50})
+              for i in range(4)]
+    configs = [pipeline_config(f'run{i}', parallel_writes=True) for i in range(4)]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(data_processor._write_outputs, configs, frames))
+    assert {result['strategy'] for result in results} == {'thread'}
+    assert data_processor._WRITE_STATE == {}
+    for i, config in enumerate(configs):
+        assert pd.read_csv(config['hourly_output_file'])['Prediction_h_1'].eq(i).all()
+        assert pd.read_csv(config['daily_output_file'])['Prediction_d_1'].eq(-i).all()
+
+# Streaming writes every chunk on one writer pool created for the whole run
+def test_streaming_shares_one_pool(pipeline_config, monkeypatch):
+    pools = []
+
+    class CountingPool(ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            pools.append(self)
+
+    monkeypatch.setattr(data_processor, 'ThreadPoolExecutor', CountingPool)
+    plugin = Plugin()
+    plugin.set_params(time_horizon=3, ticks_per_day=24, days_horizon=4)
+    result = run_processing_pipeline(pipeline_config('stream', chunk_size=500, parallel_writes=True), plugin)
+    assert result['rows_out'] > 0 and len(pools) == 1
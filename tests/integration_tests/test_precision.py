@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data_processor import run_processing_pipeline
+from app.plugins.plugin_default import Plugin
+from app.plugins.plugin_ls import Plugin as LSPlugin
+
+def precision_config(pipeline_config, precision):
+    return pipeline_config(precision, 'tests/data/base_d2.csv', precision=precision, precision_check=True)
+
+# Compact precision outputs stay within float32 / pip rounding of the float64 outputs
+@pytest.mark.parametrize('precision, tolerance', [('float32', 1e-5), ('pips', 1e-5)])
+def test_compact_precision_matches_float64(pipeline_config, precision, tolerance):
+    plugin = Plugin()
+    plugin.set_params(time_horizon=3, ticks_per_day=24, days_horizon=4)
+    reference = run_processing_pipeline(precision_config(pipeline_config, 'float64'), plugin)['data']
+    assert reference['Prediction_h_1'].dtype == np.float64
+
+    debug_info = {}
+    config = precision_config(pipeline_config, precision)
+    processed_data = run_processing_pipeline(config, plugin, debug_info=debug_info)['data']
+    assert processed_data['Prediction_h_1'].dtype == np.float32
+
+    report = debug_info['precision_check']
+    assert report['rows_compared'] == len(reference) and report['rows_mismatched'] == 0
+    assert report['max_abs_deviation'] < tolerance
+
+    written = pd.read_csv(config['hourly_output_file']).drop(columns='DATE_TIME')
+    expected = pd.read_csv(precision_config(pipeline_config, 'float64')['hourly_output_file']).drop(columns='DATE_TIME')
+    if precision == 'pips':
+        assert all(written[col].dtype == np.int64 for col in written.columns)
+        written = written / config['pip_scale']
+    np.testing.assert_allclose(written.to_numpy(), expected.to_numpy(), atol=tolerance)
+
+# The LS plugin keeps float32 through its computation
+def test_ls_plugin_float32():
+    data = pd.read_csv('tests/data/base_d2.csv', parse_dates=['DATE_TIME'])
+    plugin = LSPlugin()
+    reference = plugin.process(data)
+    compact = plugin.process(data.astype({col: np.float32 for col in ['CLOSE', 'HIGH', 'LOW', 'OPEN']}))
+    assert all(compact[col].dtype == np.float32 for col in compact.columns[1:])
+    pd.testing.assert_index_equal(reference.index, compact.index)
+    np.testing.assert_allclose(compact.iloc[:, 1:].to_numpy(), reference.iloc[:, 1:].to_numpy(), rtol=1e-5, atol=1e-6)
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data_processor import run_processing_pipeline
+from app.plugins.plugin_default import Plugin
+
+# Streaming output must be byte-identical to the in-memory output
+@pytest.mark.parametrize('chunk_size', [50, 1000, 100000])
+def test_streaming_matches_in_memory(pipeline_config, chunk_size):
+    plugin = Plugin()
+    plugin.set_params(time_horizon=3, ticks_per_day=24, days_horizon=4)
+    memory_config = pipeline_config('memory')
+    stream_config = pipeline_config('stream', chunk_size=chunk_size)
+    run_processing_pipeline(memory_config, plugin)
+    run_processing_pipeline(stream_config, plugin)
+    for key in ('hourly_output_file', 'daily_output_file'):
+        with open(memory_config[key], 'rb') as f_memory, open(stream_config[key], 'rb') as f_stream:
+            assert f_memory.read() == f_stream.read()
+
+# ISO dates whose first chunk only has days up to 12 keep month and day in place
+def test_streaming_early_month_dates(tmp_path, pipeline_config):
+    date_time = pd.date_range('2010-01-01', periods=5000, freq='5min')
+    close = 1.1 + np.cumsum(np.random.default_rng(0).normal(0, 1e-4, len(date_time)))
+    input_file = tmp_path / 'early.csv'
+    pd.DataFrame({'DATE_TIME': date_time.strftime('%Y-%m-%d %H:%M:%S'), 'OPEN': close, 'LOW': close,
+                  'HIGH': close, 'CLOSE': close}).to_csv(input_file, index=False)
+    plugin = Plugin()
+    plugin.set_params(time_horizon=3, ticks_per_day=288, days_horizon=1)
+    memory_config = pipeline_config('memory', input_file)
+    stream_config = pipeline_config('stream', input_file, chunk_size=1000)
+    run_processing_pipeline(memory_config, plugin)
+    run_processing_pipeline(stream_config, plugin)
+    hourly = pd.read_csv(stream_config['hourly_output_file'])
+    assert hourly['DATE_TIME'].iloc[[0, 300]].tolist() == ['2010-01-01 00:00:00', '2010-01-02 01:00:00']
+    for key in ('hourly_output_file', 'daily_output_file'):
+        with open(memory_config[key], 'rb') as f_memory, open(stream_config[key], 'rb') as f_stream:
+            assert f_memory.read() == f_stream.read()
+
+# Regularizing bars needs the whole series, so bar_fill is rejected in streaming mode
+def test_streaming_rejects_bar_fill(pipeline_config):
+    with pytest.raises(ValueError, match='bar_fill'):
+        run_processing_pipeline(pipeline_config('stream', chunk_size=1000, bar_fill='nan'), Plugin())
+
+# Streaming appends chunk by chunk, so binary output formats are rejected up front
+def test_streaming_rejects_binary_outputs(tmp_path, pipeline_config):
+    config = pipeline_config('stream', chunk_size=1000)
+    config['daily_output_file'] = str(tmp_path / 'stream_daily.npz')
+    with pytest.raises(ValueError):
+        run_processing_pipeline(config, Plugin())
+
+# Every mode returns the same result type: the rows written, and the frame in memory only
+def test_pipeline_result(pipeline_config):
+    plugin = Plugin()
+    memory = run_processing_pipeline(pipeline_config('memory'), plugin)
+    stream = run_processing_pipeline(pipeline_config('stream', chunk_size=1000), plugin)
+    assert memory['rows_out'] == len(memory['data']) == stream['rows_out']
+    assert stream['data'] is None
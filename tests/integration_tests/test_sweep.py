@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+from app.config import DEFAULT_VALUES
+from app.sweep import run_sweep
+
+
+def test_run_sweep(tmp_path):
+    config = DEFAULT_VALUES.copy()
+    config.update({
+        'input_file': 'tests/data/base_d1.csv',
+        'plugin': 'default_plugin',
+        'quiet_mode': True,
+        'sweep_grid': '{"time_horizon": [2, 4], "days_horizon": [1, 3], "unused_param": [0, 1]}',
+        'sweep_workers': 2,
+        'sweep_output_template': str(tmp_path / '{plugin}_{params}_{kind}.csv'),
+        'sweep_summary_file': str(tmp_path / 'summary.json')
+    })
+    summary = run_sweep(config)
+    reports = summary['combinations']
+    assert len(reports) == 8
+    assert all(report['status'] == 'ok' for report in reports)
+    # Parameters unknown to the plugin do not change the result, so half the grid is reused
+    assert sum('duplicate_of' in report for report in reports) == 4
+    assert [load['load_count'] for load in summary['input_load']] == [1]
+
+    hourly = pd.read_csv(tmp_path / 'default_plugin_time_horizon-4_days_horizon-3_unused_param-1_hourly.csv')
+    daily = pd.read_csv(tmp_path / 'default_plugin_time_horizon-4_days_horizon-3_unused_param-1_daily.csv')
+    assert list(hourly.columns) == ['DATE_TIME'] + [f'Prediction_h_{i}' for i in range(1, 5)]
+    assert list(daily.columns) == ['DATE_TIME'] + [f'Prediction_d_{i}' for i in range(1, 4)]
+    assert len(hourly) == 11346 - 3 * 24
+
+
+# Pipeline settings in the grid are not deduplicated away, and each input schema is parsed once
+def test_sweep_pipeline_settings(tmp_path):
+    config = DEFAULT_VALUES.copy()
+    config.update({
+        'input_file': 'tests/data/base_d1.csv',
+        'plugin': 'default_plugin',
+        'sweep_grid': '{"precision": ["float64", "pips"], "time_horizon": [2, 2]}',
+        'sweep_workers': 1,
+        'sweep_output_template': str(tmp_path / '{plugin}_{params}_{kind}.csv'),
+        'sweep_summary_file': str(tmp_path / 'summary.json')
+    })
+    summary = run_sweep(config)
+    reports = summary['combinations']
+    assert [report.get('duplicate_of') for report in reports] == [None, 0, None, 2]
+    assert [load['load_count'] for load in summary['input_load']] == [1, 1]
+    reference = pd.read_csv(reports[0]['hourly_output_file'])
+    pips = pd.read_csv(reports[2]['hourly_output_file'])
+    assert pips['Prediction_h_1'].dtype.kind == 'i'
+    assert (pips['Prediction_h_1'] - reference['Prediction_h_1'] * 100000).abs().max() <= 0.5
+
+# Sweep combinations can not share one incremental state
+def test_sweep_incremental_rejected(tmp_path):
+    config = DEFAULT_VALUES.copy()
+    config.update({'input_file': 'tests/data/base_d1.csv', 'sweep_grid': '{"time_horizon": [2, 4]}',
+                   'incremental_state_file': str(tmp_path / 'state.json')})
+    with pytest.raises(ValueError, match='incremental_state_file'):
+        run_sweep(config)
@@ -0,0 +1,25 @@
+from app.benchmark import compare_results, measure_pipeline, synthetic_ohlc
+
+# Synthetic bars have a consistent OHLC layout
+def test_synthetic_ohlc():
+    data = synthetic_ohlc(1000, '5min')
+    assert list(data.columns) == ['DATE_TIME', 'OPEN', 'LOW', 'HIGH', 'CLOSE']
+    assert (data['HIGH'] >= data[['OPEN', 'CLOSE']].max(axis=1)).all()
+    assert (data['LOW'] <= data[['OPEN', 'CLOSE']].min(axis=1)).all()
+    assert (data['DATE_TIME'].diff().dropna() == data['DATE_TIME'].iloc[1] - data['DATE_TIME'].iloc[0]).all()
+
+# The pipeline suite reports every stage and its results can be compared across runs
+def test_measure_pipeline_and_compare(tmp_path):
+    results = measure_pipeline(2000, '1h', formats=('csv', 'npz', 'parquet'), work_dir=str(tmp_path))
+    assert results['load']['rows'] == 2000 and results['load']['rows_per_second'] > 0
+    for plugin_name in ('default_plugin', 'ls'):
+        plugin_results = results['plugins'][plugin_name]
+        assert plugin_results['process']['peak_traced_mb'] > 0
+        assert plugin_results['write']['csv']['output_mb'] > 0
+        assert 'wall_seconds' in plugin_results['write']['npz']
+        assert 'wall_seconds' in plugin_results['write']['parquet'] or 'skipped' in plugin_results['write']['parquet']
+
+    slower = {'plugins': {'ls': {'process': {'wall_seconds': results['plugins']['ls']['process']['wall_seconds'] * 2}}}}
+    comparison = compare_results({'pipeline': {'run': results}}, {'pipeline': {'run': slower}})
+    assert list(comparison) == ['pipeline/run/plugins/ls/process']
+    assert comparison['pipeline/run/plugins/ls/process']['regression']
@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Modules that must never be imported on the CLI cold-start path
+HEAVY_MODULES = ('matplotlib', 'seaborn', 'scipy')
+
+# Cold-start budget for importing the CLI and both plugins, relative to a bare `import pandas`
+IMPORT_BUDGET_RATIO = 1.75
+
+# Runs per measurement; the fastest one is kept to filter out scheduling noise
+IMPORT_RUNS = 3
+
+
+def import_times(code):
+    """Run code with -X importtime and return the cumulative import time per top-level module."""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = ROOT_DIR + os.pathsep + env.get('PYTHONPATH', '')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT_DIR, env=env,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_cli_cold_start_imports():
+    modules = ('app.main', 'app.plugins.plugin_default', 'app.plugins.plugin_ls')
+    times = import_times("import " + ", ".join(modules))
+    heavy = [name for name in times if name.split('.')[0] in HEAVY_MODULES]
+    assert not heavy, f"Heavy optional modules imported at startup: {heavy}"
+    total = min(sum(run.get(name, 0) for name in modules) for run in
+                [times] + [import_times("import " + ", ".join(modules)) for _ in range(IMPORT_RUNS - 1)])
+    pandas_us = min(import_times("import pandas")['pandas'] for _ in range(IMPORT_RUNS))
+    budget = int(IMPORT_BUDGET_RATIO * pandas_us)
+    assert total < budget, f"Cold-start imports took {total} us (budget {budget} us, bare pandas {pandas_us} us)"
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.bar_index import BarIndex, regularize
+from app.config import DEFAULT_VALUES
+from app.data_handler import DataSource
+from app.data_processor import run_processing_pipeline
+from app.plugins.plugin_default import Plugin
+from app.price_series import PriceSeries
+
+def make_series(stamps, close=None):
+    date_time = pd.to_datetime(pd.Series(stamps)).astype('datetime64[ns]')
+    close = np.arange(len(stamps), dtype=float) if close is None else np.asarray(close, dtype=float)
+    return PriceSeries.from_frame(pd.DataFrame({'DATE_TIME': date_time, 'CLOSE': close}))
+
+IRREGULAR = ['2024-01-01 00:00', '2024-01-01 01:00', '2024-01-01 01:00', '2024-01-01 04:00',
+             '2024-01-01 03:00', None, '2024-01-01 05:00']
+
+# The index finds the cadence, the gaps, the duplicates and the out-of-order rows
+def test_bar_index():
+    index = make_series(IRREGULAR).bar_index
+    summary = index.summary()
+    assert summary['cadence_seconds'] == 3600.0
+    assert summary['duplicate_rows'] == [2] and summary['out_of_order_rows'] == [4]
+    assert summary['gap_rows'] == [3, 6] and summary['missing_bars'] == 3
+    assert summary['invalid_rows'] == 1
+    assert not index.is_sorted and not index.is_unique and not index.is_regular
+    assert BarIndex(np.arange(0, 50, 5, dtype=np.int64)).is_regular
+
+# Regularized series are sorted, unique and gapless, with NaN or repeated missing bars
+@pytest.mark.parametrize('fill, expected', [('nan', [0, 2, np.nan, 4, 3, 6]), ('ffill', [0, 2, 2, 4, 3, 6])])
+def test_regularize(fill, expected):
+    series = regularize(make_series(IRREGULAR), fill)
+    assert series.bar_index.is_regular
+    assert list(pd.DatetimeIndex(series.date_time).hour) == [0, 1, 2, 3, 4, 5]
+    np.testing.assert_array_equal(series['CLOSE'], expected)
+    with pytest.raises(ValueError):
+        regularize(series, 'zero')
+
+# The bar index is part of the load report, and sorted inputs skip the final sort of the plugin
+def test_load_report_and_sorted_input(monkeypatch):
+    source = DataSource('tests/data/base_d2.csv')
+    source.load_series()
+    bars = source.stats()['bars']
+    assert bars['cadence_seconds'] == 3600.0 and bars['out_of_order'] == 0 and bars['gaps'] > 0
+
+    def no_sort(self, *args, **kwargs):
+        raise AssertionError("sorted input sorted again")
+
+    monkeypatch.setattr(pd.DataFrame, 'sort_values', no_sort)
+    result = Plugin().process(source.load_series())
+    assert result['DATE_TIME'].is_monotonic_increasing
+
+# bar_fill regularizes the input of the pipeline
+def test_pipeline_bar_fill(tmp_path):
+    config = DEFAULT_VALUES.copy()
+    config.update({
+        'input_file': 'tests/data/base_d2.csv',
+        'hourly_output_file': str(tmp_path / 'hourly.csv'),
+        'daily_output_file': str(tmp_path / 'daily.csv'),
+        'quiet_mode': True,
+        'bar_fill': 'ffill'
+    })
+    plugin = Plugin()
+    plugin.set_params(**config)
+    result = run_processing_pipeline(config, plugin)['data']
+    steps = pd.to_datetime(result['DATE_TIME']).diff().dropna().unique()
+    assert list(steps) == [pd.Timedelta(hours=1)]
@@ -0,0 +1,48 @@
+import json
+import pytest
+import app.config_handler as config_handler
+from app.config import DEFAULT_VALUES
+from app.config_handler import ResolvedConfig, compose_config, resolve_config, save_config
+from app.plugin_loader import plugin_defaults
+from app.plugins.plugin_default import Plugin
+
+# Plugin defaults are read from the class once, without instantiating the plugin
+def test_plugin_defaults_are_memoized(monkeypatch):
+    def no_init(self):
+        raise AssertionError("plugin instantiated to read its defaults")
+
+    monkeypatch.setattr(Plugin, '__init__', no_init)
+    defaults = plugin_defaults('default_plugin')
+    assert defaults['time_horizon'] == Plugin.plugin_params['time_horizon']
+    assert plugin_defaults('default_plugin') is defaults
+    with pytest.raises(TypeError):
+        defaults['time_horizon'] = 1
+    with pytest.raises(ImportError):
+        plugin_defaults('missing_plugin')
+
+# The resolved config is read-only and composed once for all the sinks
+def test_resolved_config(monkeypatch, tmp_path):
+    config = DEFAULT_VALUES.copy()
+    config.update({'plugin': 'default_plugin', 'time_horizon': 3, 'days_horizon': 6, 'input_file': 'prices.csv'})
+    calls = []
+    compose = config_handler._compose
+
+    def counted_compose(values):
+        calls.append(values)
+        return compose(values)
+
+    monkeypatch.setattr(config_handler, '_compose', counted_compose)
+
+    resolved = resolve_config(config)
+    assert isinstance(resolved, ResolvedConfig) and resolve_config(resolved) is resolved
+    assert dict(resolved.to_save) == {'time_horizon': 3, 'input_file': 'prices.csv'}
+    config['time_horizon'] = 4  # Later changes to the merged dict do not leak in
+    assert resolved['time_horizon'] == 3 and resolved.get('remote_log') is None
+    with pytest.raises(TypeError):
+        resolved['time_horizon'] = 5
+
+    for i in range(3):
+        save_config(resolved, tmp_path / f'config_{i}.json')
+    assert json.loads((tmp_path / 'config_2.json').read_text()) == compose_config(resolved)
+    assert json.loads(resolved.json_config) == dict(resolved.to_save)
+    assert len(calls) == 1
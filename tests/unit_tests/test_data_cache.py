@@ -0,0 +1,80 @@
+import json
+import os
+import shutil
+import threading
+import numpy as np
+import pandas as pd
+from app.data_cache import evict_cache, file_fingerprint, load_cached_frame, load_cached_series, store_cached_frame
+from app.data_handler import load_csv
+
+# A cache hit must return the same frame as parsing the CSV, backed by memory-mapped columns
+def test_load_csv_cache_roundtrip(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    parsed = load_csv('tests/data/base_d1.csv')
+    first = load_csv('tests/data/base_d1.csv', cache_dir=cache_dir)
+    cached = load_csv('tests/data/base_d1.csv', cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    pd.testing.assert_frame_equal(first, parsed)
+    pd.testing.assert_frame_equal(cached, parsed)
+    base = cached['CLOSE'].to_numpy()
+    while base is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+
+# The fingerprint changes with the file contents
+def test_file_fingerprint_changes(tmp_path):
+    path = tmp_path / 'input.csv'
+    shutil.copy('tests/data/base_d1.csv', path)
+    key = file_fingerprint(str(path))
+    with open(path, 'a') as f:
+        f.write('2015-01-01 00:00:00,1,1,1,1\n')
+    assert file_fingerprint(str(path)) != key
+
+# Eviction removes the least recently used entries first
+def test_evict_cache(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    load_csv('tests/data/base_d1.csv', cache_dir=cache_dir)
+    first = set(os.listdir(cache_dir))
+    load_csv('tests/data/normalized_d1.csv', cache_dir=cache_dir)
+    keep = (set(os.listdir(cache_dir)) - first).pop()
+    evicted = evict_cache(cache_dir, 1, keep=keep)
+    assert len(evicted) == 1
+    assert os.listdir(cache_dir) == [keep]
+
+# Concurrent writers of the same key stage in their own directories and leave one valid entry
+def test_concurrent_store(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    data = load_csv('tests/data/base_d1.csv')
+    barrier = threading.Barrier(4)
+    errors = []
+
+    def store():
+        barrier.wait()
+        try:
+            for _ in range(5):
+                assert store_cached_frame(cache_dir, 'key', data)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=store) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert os.listdir(cache_dir) == ['key']
+    pd.testing.assert_frame_equal(load_cached_frame(cache_dir, 'key'), data)
+
+# Time zone aware columns are stored as UTC datetimes and read back memory-mapped with their zone
+def test_tz_aware_roundtrip(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    data = pd.DataFrame({'DATE_TIME': pd.date_range('2024-03-30', periods=48, freq='h', tz='Europe/Madrid'),
+                         'CLOSE': np.arange(48.0)})
+    assert store_cached_frame(cache_dir, 'key', data)
+    with open(os.path.join(cache_dir, 'key', 'meta.json')) as f:
+        assert json.load(f)['tz'] == 'Europe/Madrid'
+    pd.testing.assert_frame_equal(load_cached_frame(cache_dir, 'key'), data)
+    series = load_cached_series(cache_dir, 'key')
+    assert series.tz == 'Europe/Madrid'
+    pd.testing.assert_frame_equal(series.to_frame(), data)
+    assert os.path.exists(os.path.join(cache_dir, 'key'))
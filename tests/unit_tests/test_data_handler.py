@@ -0,0 +1,75 @@
+import pytest
+import numpy as np
+import pandas as pd
+from app.data_handler import load_csv, output_format, write_output
+
+# Loading with a declared schema parses dates with the fixed format and types the columns
+def test_load_csv_with_schema():
+    data = load_csv('tests/data/base_d1.csv', date_format='%Y-%m-%d %H:%M:%S', dtypes='float32')
+    assert pd.api.types.is_datetime64_any_dtype(data['DATE_TIME'])
+    assert data['DATE_TIME'].iloc[1] == pd.Timestamp('2011-01-11 00:00:00')
+    assert all(data[col].dtype == 'float32' for col in ['OPEN', 'LOW', 'HIGH', 'CLOSE'])
+
+# A schema that does not match the data falls back to inference
+def test_load_csv_schema_fallback():
+    data = load_csv('tests/data/base_d1.csv', date_format='%d/%m/%Y %H:%M', dtypes={'CLOSE': 'float64'})
+    assert len(data) == 11346
+    assert data['CLOSE'].dtype == 'float64'
+
+# A missing required column raises a KeyError
+def test_load_csv_required_columns():
+    with pytest.raises(KeyError):
+        load_csv('tests/data/base_d1.csv', date_format='%Y-%m-%d %H:%M:%S', required_columns=['VOLUME'])
+
+# NPZ output stores one array per column, readable without pickle
+def test_write_output_npz(tmp_path):
+    data = pd.DataFrame({
+        'DATE_TIME': pd.date_range('2020-01-01', periods=5, freq='h'),
+        'Prediction_h_1': np.arange(5, dtype=np.float32)
+    })
+    path = str(tmp_path / 'out.npz')
+    write_output(path, data, compression='zlib')
+    with np.load(path) as arrays:
+        assert list(arrays.keys()) == ['DATE_TIME', 'Prediction_h_1']
+        np.testing.assert_array_equal(arrays['DATE_TIME'], data['DATE_TIME'].to_numpy())
+        assert arrays['Prediction_h_1'].dtype == np.float32
+
+# Parquet output round-trips with pyarrow and asks for it when it is missing
+def test_write_output_parquet(tmp_path):
+    data = pd.DataFrame({'Prediction_d_1': np.arange(10, dtype=np.float64)})
+    path = str(tmp_path / 'out.parquet')
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError, match='pyarrow'):
+            write_output(path, data)
+        return
+    write_output(path, data, compression='zstd', row_group_size=4)
+    pd.testing.assert_frame_equal(pd.read_parquet(path), data)
+
+# Feather output is uncompressed by default, so readers can memory-map it
+def test_write_output_feather_uncompressed(tmp_path):
+    pytest.importorskip('pyarrow')
+    data = pd.DataFrame({'Prediction_h_1': np.zeros(1000)})
+    default, plain = tmp_path / 'default.feather', tmp_path / 'plain.feather'
+    write_output(str(default), data)
+    write_output(str(plain), data, compression='none')
+    assert default.read_bytes() == plain.read_bytes()
+    write_output(str(tmp_path / 'zstd.feather'), data, compression='zstd')
+    assert (tmp_path / 'zstd.feather').stat().st_size < plain.stat().st_size
+    pd.testing.assert_frame_equal(pd.read_feather(default), data)
+
+# Binary formats can not be appended to
+def test_write_output_append_is_csv_only(tmp_path):
+    with pytest.raises(ValueError):
+        write_output(str(tmp_path / 'out.npz'), pd.DataFrame({'a': [1.0]}), mode='a')
+    assert output_format('out.feather') == 'feather'
+    assert output_format('out.txt') == 'csv'
+
+# Text dates (as loaded without a date format) are stored as a string array
+def test_write_output_npz_text_dates(tmp_path):
+    data = pd.DataFrame({'DATE_TIME': ['2020-01-01 00:00:00', '2020-01-01 01:00:00'], 'Prediction_h_1': [1.0, 2.0]})
+    path = str(tmp_path / 'out.npz')
+    write_output(path, data)
+    with np.load(path) as arrays:
+        assert arrays['DATE_TIME'].tolist() == data['DATE_TIME'].tolist()
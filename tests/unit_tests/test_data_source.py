@@ -0,0 +1,47 @@
+import pandas as pd
+import app.data_handler as data_handler
+from app.config import DEFAULT_VALUES
+from app.data_handler import DataSource
+from app.data_processor import run_processing_pipeline
+from app.plugins.plugin_default import Plugin
+
+# The input is parsed once and shared by every consumer of the source
+def test_data_source_loads_once(tmp_path, monkeypatch):
+    calls = []
+    original_load_csv = data_handler.load_csv
+    def counting_load_csv(*args, **kwargs):
+        calls.append(args[0])
+        return original_load_csv(*args, **kwargs)
+    monkeypatch.setattr(data_handler, 'load_csv', counting_load_csv)
+
+    config = DEFAULT_VALUES.copy()
+    config.update({
+        'input_file': 'tests/data/base_d1.csv',
+        'hourly_output_file': str(tmp_path / 'hourly.csv'),
+        'daily_output_file': str(tmp_path / 'daily.csv'),
+        'quiet_mode': True
+    })
+    source = DataSource(config['input_file'])
+    data = source.load()
+    run_processing_pipeline(config, Plugin(), source)
+    assert source.load() is data
+    assert calls == ['tests/data/base_d1.csv']
+    stats = source.stats()
+    assert stats['load_count'] == 1
+    assert stats['rows'] == len(data)
+
+# An already loaded DataFrame can be passed to the pipeline directly
+def test_pipeline_accepts_frame(tmp_path):
+    config = DEFAULT_VALUES.copy()
+    config.update({
+        'input_file': 'unused.csv',
+        'hourly_output_file': str(tmp_path / 'hourly.csv'),
+        'daily_output_file': str(tmp_path / 'daily.csv'),
+        'quiet_mode': True
+    })
+    data = pd.DataFrame({
+        'DATE_TIME': pd.date_range('2020-01-01', periods=200, freq='h'),
+        'CLOSE': range(200)
+    })
+    result = run_processing_pipeline(config, Plugin(), data)
+    assert result['rows_out'] == len(result['data']) == 200 - 6 * 24
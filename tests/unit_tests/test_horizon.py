@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from app.horizon import HorizonCache, horizon_matrix
+from app.plugins.plugin_default import Plugin
+
+# Unit test for the horizon matrix against per-column shifts
+def test_horizon_matrix_matches_shift():
+    values = np.arange(20, dtype=float)
+    offsets = [1, 2, 3, 5, 10]
+    matrix = horizon_matrix(values, offsets)
+    assert matrix.shape == (10, 5)
+    series = pd.Series(values)
+    for j, offset in enumerate(offsets):
+        np.testing.assert_array_equal(matrix[:, j], series.shift(-offset).to_numpy()[:10])
+
+# Unit test for series shorter than the longest horizon
+def test_horizon_matrix_short_series():
+    matrix = horizon_matrix(np.arange(3, dtype=float), [1, 5])
+    assert matrix.shape == (0, 2)
+
+# Unit test for the shared horizon cache against the direct horizon matrix
+def test_horizon_cache_matches_matrix():
+    values = np.random.default_rng(0).random(50)
+    cache = HorizonCache(values, 'CLOSE')
+    cache.prefetch([1, 2, 3, 10, 20])
+    for offsets in ([1, 2], [3, 10, 20], [20, 1]):
+        np.testing.assert_array_equal(cache.matrix(offsets), horizon_matrix(values, offsets))
+    assert cache.matches('CLOSE', 50)
+    assert not cache.matches('OPEN', 50)
+
+# Unit test for the default plugin prediction columns
+def test_default_plugin_predictions():
+    data = pd.DataFrame({
+        'DATE_TIME': pd.date_range('2020-01-01', periods=60, freq='h'),
+        'CLOSE': np.arange(60, dtype=float)
+    })
+    plugin = Plugin()
+    plugin.set_params(time_horizon=2, ticks_per_day=10, days_horizon=3)
+    processed_data = plugin.process(data)
+    assert list(processed_data.columns) == ['DATE_TIME', 'Prediction_h_1', 'Prediction_h_2',
+                                            'Prediction_d_1', 'Prediction_d_2', 'Prediction_d_3']
+    assert len(processed_data) == 30
+    assert processed_data['Prediction_h_2'].iloc[0] == 2.0
+    assert processed_data['Prediction_d_3'].iloc[-1] == 59.0
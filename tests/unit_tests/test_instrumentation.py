@@ -0,0 +1,41 @@
+import threading
+from app.instrumentation import Tracer, span, start_tracing, stop_tracing, traced
+
+# Spans nest per thread and report their timings, rows and attributes
+def test_tracer_nested_spans():
+    tracer = Tracer()
+
+    def write():
+        with tracer.span('write') as write_span:
+            write_span.set(kind='hourly')
+
+    with tracer.span('pipeline'):
+        with tracer.span('load_input') as load_span:
+            load_span.rows = 10
+        worker = threading.Thread(target=write)
+        worker.start()
+        worker.join()
+    report = {entry['name']: entry for entry in tracer.report()}
+    assert report['load_input']['parent'] == 'pipeline' and report['load_input']['rows'] == 10
+    assert report['write']['parent'] is None and report['write']['kind'] == 'hourly'
+    assert report['pipeline']['wall_seconds'] >= report['load_input']['wall_seconds']
+
+    events = tracer.chrome_trace()['traceEvents']
+    assert [event['name'] for event in events] == ['pipeline', 'load_input', 'write']
+    assert all(event['ph'] == 'X' for event in events)
+
+# Module-level spans are recorded only while tracing is active
+def test_module_spans():
+    @traced()
+    def step():
+        with span('inner', rows=3):
+            pass
+
+    step()
+    tracer = start_tracing()
+    try:
+        step()
+    finally:
+        assert stop_tracing() is tracer
+    assert [(entry['name'], entry['parent']) for entry in tracer.report()] == \
+        [('test_module_spans.<locals>.step', None), ('inner', 'test_module_spans.<locals>.step')]
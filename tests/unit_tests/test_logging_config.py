@@ -0,0 +1,63 @@
+import json
+import logging
+import pandas as pd
+import pytest
+from app.config import DEFAULT_VALUES
+from app.data_processor import run_processing_pipeline
+from app.logging_config import ROOT_LOGGER, JsonFormatter, configure_logging, log_level
+from app.plugins.plugin_default import Plugin
+
+@pytest.fixture(autouse=True)
+def reset_logging():
+    yield
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.setLevel(logging.NOTSET)
+
+# The level follows log_level when set, otherwise quiet_mode
+def test_log_level():
+    assert log_level({}) == logging.INFO
+    assert log_level({'quiet_mode': True}) == logging.WARNING
+    assert log_level({'quiet_mode': True, 'log_level': 'debug'}) == logging.DEBUG
+    with pytest.raises(ValueError):
+        log_level({'log_level': 'VERBOSE'})
+
+# JSON records carry the message and the fields passed with extra=
+def test_json_formatter():
+    record = logging.LogRecord('app.data_processor', logging.INFO, __file__, 1, "Wrote %d rows", (5,), None)
+    record.output_write = {'write_seconds': 0.5}
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry['level'] == 'INFO' and entry['logger'] == 'app.data_processor'
+    assert entry['message'] == 'Wrote 5 rows'
+    assert entry['output_write'] == {'write_seconds': 0.5}
+
+# A JSON log file receives the records of the application modules
+def test_configure_logging_json_file(tmp_path):
+    log_file = tmp_path / 'run.log'
+    configure_logging({'log_format': 'json', 'log_file': str(log_file)})
+    logging.getLogger('app.main').info("Loading plugin: %s", 'default_plugin')
+    logging.getLogger('app.main').debug("not written")
+    entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [entry['message'] for entry in entries] == ['Loading plugin: default_plugin']
+
+# In quiet mode no debug record is created and no DataFrame preview is formatted
+def test_quiet_pipeline_skips_debug_output(tmp_path, monkeypatch, caplog):
+    config = DEFAULT_VALUES.copy()
+    config.update({
+        'input_file': 'tests/data/base_d2.csv',
+        'hourly_output_file': str(tmp_path / 'hourly.csv'),
+        'daily_output_file': str(tmp_path / 'daily.csv'),
+        'quiet_mode': True
+    })
+    configure_logging(config)
+
+    def no_preview(self, *args, **kwargs):
+        raise AssertionError("DataFrame preview built at WARNING level")
+
+    monkeypatch.setattr(pd.DataFrame, 'head', no_preview)
+    plugin = Plugin()
+    plugin.set_params(**config)
+    run_processing_pipeline(config, plugin)
+    assert not [record for record in caplog.records if record.levelno < logging.WARNING]
@@ -0,0 +1,17 @@
+import pytest
+import app.plugin_loader as plugin_loader
+from app.plugin_loader import get_plugin_params, load_plugin
+
+# Plugins are resolved and imported once per process
+def test_load_plugin_is_cached():
+    plugin_class, required_params = load_plugin('trading_signal.plugins', 'default_plugin')
+    assert 'time_horizon' in required_params
+    assert ('trading_signal.plugins', 'default_plugin') in plugin_loader._PLUGIN_CLASSES
+    again, _ = load_plugin('trading_signal.plugins', 'default_plugin')
+    assert again is plugin_class
+    assert get_plugin_params('default_plugin') is plugin_class.plugin_params
+
+# Unknown plugins raise ImportError
+def test_load_plugin_unknown():
+    with pytest.raises(ImportError):
+        load_plugin('trading_signal.plugins', 'missing_plugin')
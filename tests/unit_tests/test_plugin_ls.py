@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+from app.plugins.plugin_ls import Plugin
+from app.targets import daily_aggregate, day_index
+
+# Unit test for the per-day aggregation against groupby().agg()
+def test_daily_aggregate_matches_groupby():
+    dates = pd.Series(pd.date_range('2020-01-01', periods=100, freq='5h'))
+    values = np.random.default_rng(0).random(100)
+    values[[0, 3, 4, 50]] = np.nan
+    row_day = day_index(dates)
+    expected = pd.Series(values).groupby(dates.dt.date.to_numpy())
+    for agg in ('max', 'min', 'first', 'last'):
+        np.testing.assert_array_equal(daily_aggregate(values, row_day, agg), expected.agg(agg).to_numpy())
+
+# Unit test for the daily targets of the LS plugin
+def test_ls_plugin_daily_targets():
+    n = 24 * 20
+    close = np.arange(n, dtype=float)
+    data = pd.DataFrame({
+        'DATE_TIME': pd.date_range('2020-01-01', periods=n, freq='h'),
+        'CLOSE': close, 'HIGH': close + 1, 'LOW': close - 1, 'OPEN': close
+    })
+    plugin = Plugin()
+    plugin.set_params(time_horizon=2, daily_horizon=2, std_dev_horizon=4)
+    processed_data = plugin.process(data)
+    assert 'DATE' not in data.columns
+    # The 12-day rolling window drops the first 287 rows, the 2-day daily horizon the last 2 days
+    assert processed_data.index[0] == 287
+    assert len(processed_data) == n - 287 - 48
+    row = processed_data.loc[300]  # 2020-01-13 12:00, day 12
+    assert row['CLOSE_t+2'] == 302.0
+    assert row['daily_CLOSE_D1'] == 13 * 24 + 23
+    assert row['daily_OPEN_D2'] == 14 * 24
+    assert row['daily_HIGH_D1'] == 13 * 24 + 24
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data_handler import DataSource, load_csv, to_price_series
+from app.data_processor import run_processing_pipeline
+from app.plugins.plugin_default import Plugin
+from app.plugins.plugin_ls import Plugin as LSPlugin
+from app.price_series import PriceSeries, column_values
+
+def make_frame(tz=None):
+    return pd.DataFrame({
+        'DATE_TIME': pd.date_range('2020-01-01', periods=5, freq='h', tz=tz),
+        'CLOSE': np.linspace(1.0, 1.4, 5),
+        'VOLUME': pd.array([1, 2, None, 4, 5], dtype='Int64')
+    })
+
+# The series shares the float columns of the frame and converts the others to float64
+def test_from_frame_shares_columns():
+    data = make_frame()
+    series = PriceSeries.from_frame(data)
+    assert len(series) == 5 and series.columns == ['DATE_TIME', 'CLOSE', 'VOLUME']
+    assert series.timestamps.dtype == np.int64
+    assert np.shares_memory(series['CLOSE'], data['CLOSE'].to_numpy())
+    assert np.isnan(series['VOLUME'][2]) and series['VOLUME'].dtype == np.float64
+    pd.testing.assert_series_equal(series.to_frame()['DATE_TIME'], data['DATE_TIME'], check_dtype=False)
+    with pytest.raises(TypeError):
+        PriceSeries.from_frame(data.assign(DATE_TIME=data['DATE_TIME'].astype(str)))
+
+# Saved series are memory-mapped back with their time zone
+def test_save_and_open(tmp_path):
+    series = PriceSeries.from_frame(make_frame(tz='America/New_York'))
+    series.save(str(tmp_path / 'series'))
+    opened = PriceSeries.open(str(tmp_path / 'series'))
+    assert isinstance(opened['CLOSE'], np.memmap)
+    np.testing.assert_array_equal(opened.timestamps, series.timestamps)
+    assert (pd.DatetimeIndex(opened.date_time) == pd.DatetimeIndex(series.date_time)).all()
+    assert str(opened.date_time.tz) == 'America/New_York'
+
+# Text dates are parsed with the inferred format
+def test_to_price_series_parses_text_dates():
+    data = load_csv('tests/data/base_d2.csv')
+    series = to_price_series(data)
+    assert len(series) == len(data)
+    assert pd.Timestamp(series.date_time[0]) == pd.Timestamp(data['DATE_TIME'].iloc[0])
+    np.testing.assert_array_equal(column_values(series, 'CLOSE'), column_values(data, 'CLOSE'))
+
+# Dates that do not match the format are reported instead of being dropped
+def test_to_price_series_rejects_unparsable_dates():
+    data = load_csv('tests/data/base_d2.csv')
+    data.loc[3, 'DATE_TIME'] = 'not a date'
+    with pytest.raises(ValueError, match="1 DATE_TIME value"):
+        to_price_series(data, '%Y-%m-%d %H:%M:%S')
+
+# Outputs built from a series write DATE_TIME as the input text, midnight included
+def test_daily_bars_output_text(tmp_path, pipeline_config):
+    data = load_csv('tests/data/base_d2.csv')
+    data['DATE_TIME'] = pd.date_range('2015-01-01', periods=len(data), freq='D').strftime('%Y-%m-%d %H:%M:%S')
+    data.to_csv(tmp_path / 'daily.csv', index=False)
+    plugin = Plugin()
+    plugin.set_params(time_horizon=2, ticks_per_day=1, days_horizon=2)
+    config = pipeline_config('daily', tmp_path / 'daily.csv')
+    rows = run_processing_pipeline(config, plugin)['rows_out']
+    for key in ('hourly_output_file', 'daily_output_file'):
+        output = pd.read_csv(config[key], dtype={'DATE_TIME': str})
+        assert output['DATE_TIME'].tolist() == data['DATE_TIME'].iloc[:rows].tolist()
+
+# Later runs memory-map the cached series without parsing the CSV
+def test_load_series_from_cache(tmp_path):
+    first = DataSource('tests/data/base_d2.csv', cache_dir=str(tmp_path))
+    series = first.load_series()
+    second = DataSource('tests/data/base_d2.csv', cache_dir=str(tmp_path))
+    cached = second.load_series()
+    assert isinstance(cached['CLOSE'], np.memmap)
+    assert second.data is None and second.stats()['rows'] == len(series)
+    np.testing.assert_array_equal(cached.timestamps, series.timestamps)
+
+# Plugins produce the same output from a PriceSeries as from a DataFrame
+@pytest.mark.parametrize('plugin_class', [Plugin, LSPlugin])
+def test_plugins_accept_price_series(plugin_class):
+    data = load_csv('tests/data/base_d2.csv')
+    expected = plugin_class().process(data.copy())
+    result = plugin_class().process(to_price_series(data))
+    pd.testing.assert_frame_equal(result.drop(columns='DATE_TIME'), expected.drop(columns='DATE_TIME'))
+    assert (result['DATE_TIME'].to_numpy() == pd.to_datetime(expected['DATE_TIME']).to_numpy()).all()
@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+import pytest
+import requests
+from app.config import DEFAULT_VALUES
+from app.config_handler import remote_load_config, remote_log, remote_save_config
+from app.remote import RemoteClient, close_clients, flush_clients
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so pooled connections can be reused
+
+    def respond(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length).decode()
+        server.requests.append({'path': self.path, 'port': self.client_address[1], 'form': parse_qs(body)})
+        time.sleep(server.delay)
+        status = server.statuses.pop(0) if server.statuses else 200
+        payload = json.dumps({'time_horizon': 3}).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = respond
+    do_POST = respond
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    httpd.requests, httpd.statuses, httpd.delay = [], [], 0.0
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    close_clients()
+    httpd.shutdown()
+    httpd.server_close()
+
+def url(server, path='/log'):
+    return f'http://127.0.0.1:{server.server_port}{path}'
+
+# Transient errors are retried on the same pooled connection, and exhausted retries are reported
+def test_retries_and_connection_reuse(server):
+    server.statuses = [503, 500]
+    client = RemoteClient(retries=3, backoff=0)
+    assert client.request('GET', url(server)).json() == {'time_horizon': 3}
+    assert len(server.requests) == 3
+    assert len({request['port'] for request in server.requests}) == 1
+
+    server.statuses = [502, 502]
+    with pytest.raises(requests.HTTPError):
+        RemoteClient(retries=1, backoff=0).request('GET', url(server))
+    client.close()
+
+# A slow server fails the request after the timeout instead of blocking it
+def test_timeout(server):
+    server.delay = 0.5
+    client = RemoteClient(timeout=0.1, retries=1, backoff=0)
+    with pytest.raises(requests.Timeout):
+        client.request('GET', url(server))
+    assert len(server.requests) == 2
+    client.close()
+
+# POST is not retried once the server may have processed it, only after 429/503 responses
+def test_post_retries(server):
+    client = RemoteClient(timeout=0.1, retries=2, backoff=0)
+    server.statuses = [503, 429]
+    assert client.request('POST', url(server), data={'run': 0}).status_code == 200
+    assert len(server.requests) == 3
+
+    server.requests.clear()
+    server.statuses = [500]
+    with pytest.raises(requests.HTTPError):
+        client.request('POST', url(server), data={'run': 1})
+    assert len(server.requests) == 1
+
+    server.requests.clear()
+    server.delay = 0.5
+    with pytest.raises(requests.Timeout):
+        client.request('POST', url(server), data={'run': 2})
+    assert len(server.requests) == 1
+    client.close()
+
+# Remote logs are queued and posted in the background; config save and load use the shared client
+def test_remote_config_and_background_log(server):
+    config = DEFAULT_VALUES.copy()
+    config.update({'time_horizon': 3, 'remote_backoff': 0})
+    assert remote_save_config(config, url(server, '/save'), 'test', 'pass')
+    assert remote_load_config(url(server, '/load'), 'test', 'pass', config) == {'time_horizon': 3}
+
+    server.delay = 0.2
+    start = time.perf_counter()
+    for i in range(3):
+        assert remote_log(config, {'run': i}, url(server), 'test', 'pass')
+    assert time.perf_counter() - start < 0.2
+    flush_clients()
+    logs = [request for request in server.requests if request['path'] == '/log']
+    assert [json.loads(log['form']['json_result'][0]) for log in logs] == [{'run': 0}, {'run': 1}, {'run': 2}]
+    assert json.loads(logs[0]['form']['json_config'][0])['time_horizon'] == 3
+
+    server.delay = 0
+    server.statuses = [503] * 4
+    assert not remote_save_config(config, url(server, '/save'), 'test', 'pass')
@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+from app.rolling import rolling_stats
+
+# Unit test for every statistic against pandas rolling, with NaN values and partial windows
+@pytest.mark.parametrize('min_periods', [None, 3])
+def test_rolling_stats_match_pandas(min_periods):
+    values = 1.1 + np.cumsum(np.random.default_rng(0).normal(0, 1e-3, 3000))
+    values[[0, 10, 11, 500, 2999]] = np.nan
+    stats = ('count', 'mean', 'var', 'std', 'min', 'max')
+    results = rolling_stats(values, [1, 7, 50, 288], stats, min_periods=min_periods)
+    series = pd.Series(values)
+    for (stat, window), result in results.items():
+        periods = None if min_periods is None else min(min_periods, window)
+        expected = getattr(series.rolling(window, min_periods=periods), stat)().to_numpy()
+        np.testing.assert_allclose(result, expected, rtol=1e-6, atol=1e-12, equal_nan=True,
+                                   err_msg=f"{stat} over {window}")
+
+# Unit test for the accuracy of a short-window std on a long drifting series
+def test_rolling_std_is_stable():
+    values = 1.1 + np.cumsum(np.random.default_rng(1).normal(0, 1e-4, 200000))
+    expected = sliding_window_view(values, 12).std(axis=1, ddof=1)
+    result = rolling_stats(values, [12, 288], ('std',))[('std', 12)]
+    assert np.isnan(result[:11]).all()
+    np.testing.assert_allclose(result[11:], expected, rtol=1e-10)
+
+# Unit test for the bias-corrected rolling skew against a direct computation
+def test_rolling_skew():
+    values = np.random.default_rng(2).random(500)
+    windows = sliding_window_view(values, 20)
+    deviations = windows - windows.mean(axis=1, keepdims=True)
+    m2 = (deviations ** 2).mean(axis=1)
+    m3 = (deviations ** 3).mean(axis=1)
+    expected = np.sqrt(20 * 19) / 18 * m3 / m2 ** 1.5
+    result = rolling_stats(values, [20], ('skew',))[('skew', 20)]
+    np.testing.assert_allclose(result[19:], expected, rtol=1e-9)
+
+# Unit test for unsupported statistics
+def test_rolling_stats_rejects_unknown_stat():
+    with pytest.raises(ValueError):
+        rolling_stats(np.arange(10.0), [3], ('median',))
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.horizon import HorizonCache
+from app.price_series import PriceSeries
+from app.targets import DailyAggregate, Rolling, Shift, TradingDayShift, build_targets
+
+def make_data(rows=100, freq='h'):
+    date_time = pd.date_range('2024-01-01', periods=rows, freq=freq).astype('datetime64[ns]')
+    return pd.DataFrame({'DATE_TIME': date_time, 'CLOSE': np.arange(rows, dtype=float)})
+
+# Names come from the templates, and shifts match Series.shift on the valid range only
+def test_shift_targets_and_names():
+    data = make_data()
+    targets = [Shift('CLOSE', [0], '{column}'), Shift('CLOSE', [1, 24], '{column}_t+{n}'),
+               Shift('CLOSE', [2], 'Prediction_h_{i}')]
+    result = build_targets(data, targets)
+    assert list(result.columns) == ['DATE_TIME', 'CLOSE', 'CLOSE_t+1', 'CLOSE_t+24', 'Prediction_h_1']
+    expected = pd.DataFrame({name: data['CLOSE'].shift(-n) for name, n in
+                             [('CLOSE', 0), ('CLOSE_t+1', 1), ('CLOSE_t+24', 24), ('Prediction_h_1', 2)]})
+    expected.insert(0, 'DATE_TIME', data['DATE_TIME'])
+    pd.testing.assert_frame_equal(result, expected.dropna().reset_index(drop=True))
+    with pytest.raises(ValueError):
+        Shift('CLOSE', [1, 2], ['only_one'])
+
+# Rows missing a target, including targets that are not output, are dropped and the index follows
+def test_missing_values_and_row_index():
+    data = make_data(50)
+    data.loc[[3, 10], 'CLOSE'] = np.nan
+    targets = [Shift('CLOSE', [2], 'next'), Shift('CLOSE', [0], output=False), Rolling('CLOSE', 'mean', [3], ['mean_3'])]
+    result = build_targets(data, targets, index='rows')
+    assert list(result.columns) == ['DATE_TIME', 'next', 'mean_3']
+    expected = pd.DataFrame({'next': data['CLOSE'].shift(-2), 'current': data['CLOSE'],
+                             'mean_3': data['CLOSE'].rolling(3).mean()})
+    expected = expected.dropna()
+    assert list(result.index) == list(expected.index)
+    np.testing.assert_allclose(result['mean_3'], expected['mean_3'])
+    with pytest.raises(ValueError):
+        build_targets(data, targets, index='positions')
+
+# Daily and trading-day targets give the same values for a DataFrame, a PriceSeries and a shared cache
+def test_daily_targets_and_inputs():
+    data = make_data(24 * 10)
+    targets = [DailyAggregate('CLOSE', 'max', [1, 2], 'high_D{n}'), DailyAggregate('CLOSE', 'first', [0], output=False),
+               TradingDayShift('CLOSE', [1], 'next_day'), Shift('CLOSE', [1, 3], 'h_{i}')]
+    result = build_targets(data, targets)
+    first = result.iloc[0]
+    assert first['high_D1'] == 47 and first['high_D2'] == 71 and first['next_day'] == 24
+    assert len(result) == 24 * 8  # The last two days have no second day ahead
+    cache = HorizonCache(data['CLOSE'].to_numpy(), 'CLOSE')
+    pd.testing.assert_frame_equal(build_targets(PriceSeries.from_frame(data), targets, horizon_cache=cache), result)
+    with pytest.raises(ValueError):
+        build_targets(data, [Shift('HIGH', [1])])
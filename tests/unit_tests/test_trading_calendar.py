@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from app.data_handler import DataSource
+from app.plugins.plugin_default import Plugin
+from app.trading_calendar import take_rows, trading_day_index
+
+def weekday_hours(start, weeks):
+    hours = pd.date_range(start, periods=weeks * 7 * 24, freq='h')
+    return hours[hours.dayofweek < 5]
+
+# Weekends are skipped: one trading day after Friday is Monday at the same time
+def test_trading_days_skip_weekends():
+    date_time = weekday_hours('2024-01-01', 2)  # Monday
+    index = trading_day_index(date_time, [1, 5])
+    friday_noon = date_time.get_loc(pd.Timestamp('2024-01-05 12:00'))
+    assert date_time[index[friday_noon, 0]] == pd.Timestamp('2024-01-08 12:00')
+    assert date_time[index[0, 1]] == pd.Timestamp('2024-01-08 00:00')
+    # The last session has no next one
+    assert (index[-24:, 0] == -1).all()
+
+# Sessions follow session_start in session_timezone (FX days start at 17:00 New York)
+def test_session_boundaries():
+    date_time = pd.DatetimeIndex(['2024-01-05 21:00', '2024-01-07 23:00', '2024-01-08 21:00',
+                                  '2024-01-08 23:00', '2024-01-09 21:00'])
+    index = trading_day_index(date_time, [1], session_start='17:00', session_timezone='America/New_York')
+    # Friday 16:00 NY -> Monday 16:00 NY; Sunday 18:00 NY opens Monday's session -> Monday 18:00 NY
+    assert list(index[:, 0]) == [2, 3, 4, -1, -1]
+
+# Rows may come in any order, and a target session without a row by then is unresolved
+def test_unsorted_rows_and_missing_targets():
+    date_time = pd.DatetimeIndex(['2024-01-02 10:00', '2024-01-01 09:00', '2024-01-01 12:00', '2024-01-02 08:00'])
+    index = trading_day_index(date_time, [1])
+    assert list(index[:, 0]) == [-1, 3, 0, -1]
+    values = take_rows(np.array([1.0, 2.0, 3.0, 4.0]), index)
+    np.testing.assert_array_equal(values[:, 0], [np.nan, 4.0, 1.0, np.nan])
+
+# On gapless data calendar targets match the ticks_per_day offsets, across gaps they do not
+def test_plugin_calendar_mode():
+    date_time = pd.date_range('2024-01-01', periods=24 * 20, freq='h')
+    data = pd.DataFrame({'DATE_TIME': date_time, 'CLOSE': np.arange(len(date_time), dtype=float)})
+    ticks = Plugin()
+    ticks.set_params(days_horizon=3)
+    calendar = Plugin()
+    calendar.set_params(days_horizon=3, daily_mode='calendar')
+    expected = ticks.process(data.copy())
+    result = calendar.process(data.copy())
+    pd.testing.assert_frame_equal(result.iloc[:len(expected)], expected)
+    with pytest.raises(ValueError):
+        calendar.lookahead()
+
+    weekdays = data[data['DATE_TIME'].dt.dayofweek < 5].reset_index(drop=True)
+    result = calendar.process(weekdays.copy())
+    friday_noon = result[result['DATE_TIME'] == pd.Timestamp('2024-01-05 12:00')].iloc[0]
+    monday_noon = weekdays.loc[weekdays['DATE_TIME'] == pd.Timestamp('2024-01-08 12:00'), 'CLOSE'].iloc[0]
+    assert friday_noon['Prediction_d_1'] == monday_noon
+
+# A lone Sunday-evening bar does not drop the rows whose targets land on its session
+@pytest.mark.parametrize('session', [{}, {'session_start': '23:00'},
+                                     {'session_start': '17:00', 'session_timezone': 'America/New_York'}])
+def test_calendar_mode_keeps_rows_with_stub_sessions(session):
+    data = DataSource('tests/data/base_d1.csv').load()
+    ticks = Plugin()
+    calendar = Plugin()
+    calendar.set_params(daily_mode='calendar', **session)
+    expected_rows = len(ticks.process(data.copy()))
+    assert len(calendar.process(data.copy())) >= 0.99 * expected_rows